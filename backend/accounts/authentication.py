@@ -0,0 +1,117 @@
+"""
+JWT authentication that resolves the request user from a short-lived cache.
+
+simplejwt's JWTAuthentication loads the user row on every request. Here the
+fields the API and permission classes read (role, position, department,
+is_superuser, ...) are cached per user under a key that carries the user's
+cache version. Saving or deleting the user, or blacklisting one of their
+refresh tokens (logout, rotation), bumps the version so the next request
+reloads the row. JWT_USER_CACHE_TIMEOUT bounds staleness for writes that
+bypass signals, such as ``QuerySet.update()``.
+
+Secrets (password hash, reset code) and the login bookkeeping columns,
+which login writes with targeted updates that send no post_save, are never
+cached. They are deferred on the rebuilt user and load from the database
+if something reads them, and ``save()`` on a cached user only writes the
+fields it holds.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.cache_generation import GenerationKey
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'accounts:jwt_user'
+
+# Never copied into the cache
+UNCACHED_FIELDS = {
+    'password', 'reset_code', 'reset_code_created_at',
+    'last_login', 'failed_login_attempts', 'last_failed_login', 'account_locked_until',
+}
+
+
+def _timeout():
+    return getattr(settings, 'JWT_USER_CACHE_TIMEOUT', 60)
+
+
+def _version(user_id):
+    return GenerationKey(f'{KEY_PREFIX}:{user_id}:version')
+
+
+def _cached_fields():
+    return [
+        field for field in get_user_model()._meta.concrete_fields
+        if field.name not in UNCACHED_FIELDS
+    ]
+
+
+def profile_for(user):
+    """The cacheable field values of ``user``, keyed by attname."""
+    return {field.attname: getattr(user, field.attname) for field in _cached_fields()}
+
+
+def user_from_profile(profile):
+    """Rebuild a saved user instance from a cached profile, deferring uncached fields."""
+    names = [field.attname for field in _cached_fields()]
+    return get_user_model().from_db(DEFAULT_DB_ALIAS, names, [profile[name] for name in names])
+
+
+def get_user(user_id):
+    """
+    Return the user with primary key ``user_id``, from the cache when possible.
+
+    Returns None when no such user exists. Cache errors fall back to the
+    database rather than failing the request.
+    """
+    User = get_user_model()
+    try:
+        key = f'{KEY_PREFIX}:{user_id}:{_version(user_id).get()}'
+        profile = cache.get(key)
+    except Exception as e:
+        logger.warning(f"User cache unavailable for user {user_id}: {e}")
+        return User.objects.filter(pk=user_id).first()
+
+    if profile is not None:
+        return user_from_profile(profile)
+
+    user = User.objects.filter(pk=user_id).first()
+    if user is not None:
+        cache.set(key, profile_for(user), timeout=_timeout())
+    return user
+
+
+def invalidate(user_id):
+    """Drop the cached profile of one user, now and again once the change commits."""
+    _version(user_id).bump_on_commit()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that reads the user through the per-user profile cache."""
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            # Revocation compares the password hash, which is never cached
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
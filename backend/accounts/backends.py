@@ -4,6 +4,7 @@ Custom authentication backend for email-based authentication.
 import logging
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -14,7 +15,7 @@ class EmailBackend(ModelBackend):
     Custom authentication backend that allows users to authenticate using email instead of username.
     """
     
-    def authenticate(self, request, email=None, password=None, **kwargs):
+    def authenticate(self, request, email=None, password=None, user=None, **kwargs):
         """
         Authenticate a user using email and password.
         
@@ -22,47 +23,46 @@ class EmailBackend(ModelBackend):
             request: The HTTP request object
             email: User's email address
             password: User's password
+            user: The user for ``email`` when the caller has already fetched it
             **kwargs: Additional keyword arguments
         
         Returns:
             User object if authentication succeeds, None otherwise
+
+        Raises:
+            PermissionDenied: if the credentials are rejected, so later
+            backends do not look the same email up again
         """
-        logger.debug(f"EmailBackend.authenticate called with email={email}")
-        
         if email is None or password is None:
             logger.debug("EmailBackend: email or password is None")
             return None
         
-        try:
-            user = User.objects.get(email=email)
-            logger.debug(f"EmailBackend: User found - {user.email}, is_active={user.is_active}")
-        except User.DoesNotExist:
-            logger.debug(f"EmailBackend: User with email {email} does not exist")
-            # Run the default password hasher once to reduce the timing
-            # difference between an existing and a non-existing user
-            User().set_password(password)
-            return None
+        if user is None:
+            try:
+                user = User.objects.get(email=email)
+            except User.DoesNotExist:
+                logger.debug(f"EmailBackend: User with email {email} does not exist")
+                # Run the default password hasher once to reduce the timing
+                # difference between an existing and a non-existing user
+                User().set_password(password)
+                raise PermissionDenied
         
         # Check if account is locked
         if user.is_account_locked():
             logger.debug(f"EmailBackend: Account is locked for {email}")
-            return None
+            raise PermissionDenied
         
         # Check if account is active
         if not user.is_active:
             logger.debug(f"EmailBackend: Account is inactive for {email}")
-            return None
-        
-        # Verify password
-        password_valid = user.check_password(password)
-        logger.debug(f"EmailBackend: Password check result for {email}: {password_valid}")
+            raise PermissionDenied
         
-        if password_valid:
+        if user.check_password(password):
             logger.info(f"EmailBackend: Authentication successful for {email}")
             return user
         
         logger.debug(f"EmailBackend: Password invalid for {email}")
-        return None
+        raise PermissionDenied
     
     def get_user(self, user_id):
         """
@@ -19,7 +19,7 @@ class UserFactory(DjangoModelFactory):
     email = factory.Sequence(lambda n: f'user{n}@example.com')
     first_name = factory.Faker('first_name')
     last_name = factory.Faker('last_name')
-    phone_number = factory.Faker('phone_number')
+    phone_number = factory.Sequence(lambda n: f'024{n:07d}')
     password = factory.PostGenerationMethodCall('set_password', 'testpass123')
     
     role = 'EMPLOYEE'
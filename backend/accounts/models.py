@@ -1,7 +1,9 @@
 from django.db import models
+from django.db.models import Case, F, Value, When
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.utils.translation import gettext_lazy as _
 from .managers import UserManager
+from . import notification_feed
 from django.utils import timezone
 from datetime import timedelta
 from django.utils.crypto import get_random_string
@@ -95,24 +97,42 @@ class User(AbstractBaseUser, PermissionsMixin):
         self.reset_code_created_at = None
         self.save()
 
+    def _update_columns(self, **values):
+        """Write only ``values`` to this user's row and mirror them on the instance."""
+        type(self).objects.filter(pk=self.pk).update(**values)
+        for name, value in values.items():
+            setattr(self, name, value)
+
     def record_failed_login(self):
         """Record a failed login attempt and handle account locking."""
-        self.failed_login_attempts += 1
-        self.last_failed_login = timezone.now()
-        
-        # Check if account should be locked
+        now = timezone.now()
+        locked_until = now + timedelta(minutes=settings.ACCOUNT_LOCKOUT_DURATION)
+
+        # Count and lock in one statement so concurrent failures are never lost
+        type(self).objects.filter(pk=self.pk).update(
+            failed_login_attempts=F('failed_login_attempts') + 1,
+            last_failed_login=now,
+            account_locked_until=Case(
+                When(failed_login_attempts__gte=settings.ACCOUNT_LOCKOUT_ATTEMPTS - 1, then=Value(locked_until)),
+                default=F('account_locked_until'),
+            ),
+        )
+        self.refresh_from_db(fields=['failed_login_attempts', 'last_failed_login', 'account_locked_until'])
+
         if self.failed_login_attempts >= settings.ACCOUNT_LOCKOUT_ATTEMPTS:
-            self.account_locked_until = timezone.now() + timedelta(minutes=settings.ACCOUNT_LOCKOUT_DURATION)
             logger.warning(f"Account locked for {self.email} until {self.account_locked_until}")
-        
-        self.save()
 
     def reset_failed_login_attempts(self):
         """Reset failed login attempts after successful login."""
-        self.failed_login_attempts = 0
-        self.last_failed_login = None
-        self.account_locked_until = None
-        self.save()
+        self._update_columns(failed_login_attempts=0, last_failed_login=None, account_locked_until=None)
+
+    def record_successful_login(self, update_last_login=True):
+        """Stamp last_login and clear any failed attempts in a single write."""
+        values = {'last_login': timezone.now()} if update_last_login else {}
+        if self.failed_login_attempts or self.last_failed_login or self.account_locked_until:
+            values.update(failed_login_attempts=0, last_failed_login=None, account_locked_until=None)
+        if values:
+            self._update_columns(**values)
 
     def is_account_locked(self):
         """Check if the account is currently locked."""
@@ -120,10 +140,12 @@ class User(AbstractBaseUser, PermissionsMixin):
             return False
         
         if timezone.now() > self.account_locked_until:
-            # If lock period has expired, reset the lock
+            # The lock has expired: clear it, unless a newer failure has re-locked the row
+            type(self).objects.filter(pk=self.pk, account_locked_until=self.account_locked_until).update(
+                account_locked_until=None, failed_login_attempts=0
+            )
             self.account_locked_until = None
             self.failed_login_attempts = 0
-            self.save()
             return False
         
         return True
@@ -158,6 +180,10 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_user_created_idx'),
+            models.Index(fields=['user', 'is_read', '-created_at'], name='notification_user_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.notification_type} - {self.user.email} - {self.title}"
@@ -167,7 +193,9 @@ class Notification(models.Model):
         if not self.is_read:
             self.is_read = True
             self.read_at = timezone.now()
-            self.save()
+            # Only the first reader to flip the row lowers the unread count
+            if Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True, read_at=self.read_at):
+                notification_feed.notifications_read(self.user_id)
     
     @classmethod
     def create_welcome_notification(cls, user):
@@ -196,24 +224,16 @@ Enjoy using SafeSphere!"""
     @classmethod
     def create_change_request_notification(cls, change_request):
         """Create notification for HSSE Managers when a change request is submitted."""
-        # Find all HSSE Managers
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        hsse_managers = User.objects.filter(position='HSSE MANAGER', is_active=True)
-        
-        notifications = []
-        for manager in hsse_managers:
-            notification = cls.objects.create(
-                user=manager,
-                notification_type='CHANGE_REQUEST',
-                title='New Change Request Submitted',
-                message=f"""A new change request has been submitted for the document "{change_request.document.title}".
+        from .services import notify
+
+        return notify(
+            User.objects.filter(position='HSSE MANAGER', is_active=True),
+            notification_type='CHANGE_REQUEST',
+            title='New Change Request Submitted',
+            message=f"""A new change request has been submitted for the document "{change_request.document.title}".
 
 **Requested by**: {change_request.requested_by.get_full_name if change_request.requested_by else 'Unknown'}
 **Reason**: {change_request.reason}
 
 Please review and take action on this change request."""
-            )
-            notifications.append(notification)
-        
-        return notifications
+        )
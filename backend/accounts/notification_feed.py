@@ -0,0 +1,152 @@
+"""
+Per-user notification feed state kept in the cache.
+
+Two values per user back the notification list:
+
+* an unread counter, adjusted in place when notifications are created,
+  read or deleted, and recounted from the database when it is missing;
+* a feed version, bumped on every change, from which the list builds its
+  ETag so an unchanged feed answers ``304 Not Modified`` without a query.
+
+The counter is adjusted as the change is made rather than on commit, so a
+rolled-back change can leave it off by a few until
+NOTIFICATION_UNREAD_CACHE_TIMEOUT expires it and it is recounted.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from core.cache_generation import GenerationKey
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'accounts:notifications'
+
+# Set while a bulk change is in progress, so per-row signal receivers
+# leave the feed alone and the caller records the change once
+_bulk_change = ContextVar('notification_feed_bulk_change', default=False)
+
+
+def _timeout():
+    return getattr(settings, 'NOTIFICATION_UNREAD_CACHE_TIMEOUT', 300)
+
+
+def _unread_key(user_id):
+    return f'{KEY_PREFIX}:{user_id}:unread'
+
+
+def _version(user_id):
+    return GenerationKey(f'{KEY_PREFIX}:{user_id}:version')
+
+
+def version(user_id):
+    """The user's feed version; changes whenever any of their notifications does."""
+    try:
+        return _version(user_id).get()
+    except Exception as e:
+        logger.warning(f"Notification cache unavailable for user {user_id}: {e}")
+        return None
+
+
+def unread_count(user_id):
+    """The user's unread notification count, recounted only when not cached."""
+    from .models import Notification
+
+    key = _unread_key(user_id)
+    try:
+        count = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Notification cache unavailable for user {user_id}: {e}")
+        count = None
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        try:
+            cache.add(key, count, timeout=_timeout())
+        except Exception:
+            pass
+    return count
+
+
+def _changed(user_id, adjust):
+    try:
+        adjust(_unread_key(user_id))
+    except ValueError:
+        # Not cached: the next read recounts
+        pass
+    except Exception as e:
+        logger.warning(f"Failed to update unread notifications for user {user_id}: {e}")
+    # Bumped again once committed, so a read racing the transaction cannot keep its ETag
+    _version(user_id).bump_on_commit()
+
+
+def _decrement(key, amount):
+    if cache.decr(key, amount) < 0:
+        cache.delete(key)
+
+
+def notifications_created(user_id, unread=1):
+    """Record ``unread`` new unread notifications for a user."""
+    _changed(user_id, lambda key: unread and cache.incr(key, unread))
+
+
+def notifications_read(user_id, count=1):
+    """Record ``count`` of a user's unread notifications being read or deleted."""
+    _changed(user_id, lambda key: count and _decrement(key, count))
+
+
+@contextmanager
+def bulk_change():
+    """Skip per-row feed updates from notification signals inside the block."""
+    token = _bulk_change.set(True)
+    try:
+        yield
+    finally:
+        _bulk_change.reset(token)
+
+
+def in_bulk_change():
+    """Whether per-row feed updates are currently being skipped."""
+    return _bulk_change.get()
+
+
+def notifications_cleared(user_id):
+    """Record that a user has no unread notifications left."""
+    _changed(user_id, lambda key: cache.set(key, 0, timeout=_timeout()))
+
+
+def notifications_created_for(user_ids):
+    """
+    Record a fan-out of new notifications to many users at once.
+
+    Their unread counts are recounted in one grouped query and cached with
+    a single ``set_many``, so the cost does not grow with the audience.
+    Returns the counts as ``{user_id: unread}``.
+    """
+    from .models import Notification
+
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    counts = dict.fromkeys(user_ids, 0)
+    counts.update(
+        Notification.objects.filter(user_id__in=user_ids, is_read=False)
+        .order_by().values_list('user_id').annotate(Count('id'))
+    )
+    try:
+        cache.set_many({_unread_key(user_id): count for user_id, count in counts.items()}, timeout=_timeout())
+    except Exception as e:
+        logger.warning(f"Failed to update unread notifications for {len(user_ids)} users: {e}")
+    versions = [_version(user_id) for user_id in user_ids]
+    GenerationKey.bump_many(versions)
+    transaction.on_commit(lambda: GenerationKey.bump_many(versions))
+    return counts
+
+
+def invalidate(user_id):
+    """Recount a user's unread notifications on the next read."""
+    _changed(user_id, cache.delete)
@@ -5,6 +5,7 @@ from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 import logging
 from core.mask_email import mask_email
 from .models import Notification
@@ -109,10 +110,10 @@ class LoginSerializer(serializers.ModelSerializer):
         
         User = get_user_model()
         
-        # Try to get user first to check account lock status
-        try:
-            user_obj = User.objects.get(email=email)
-            logger.debug(f"User found in database: id={user_obj.id}, email={user_obj.email}, is_active={user_obj.is_active}, is_account_locked={user_obj.is_account_locked()}")
+        # Fetch the user once; the backend and the lockout bookkeeping reuse it
+        user_obj = User.objects.filter(email=email).first()
+        if user_obj is not None:
+            logger.debug(f"User found in database: id={user_obj.id}, is_active={user_obj.is_active}")
             
             # Check if account is locked
             if user_obj.is_account_locked():
@@ -123,30 +124,27 @@ class LoginSerializer(serializers.ModelSerializer):
             if not user_obj.is_active:
                 logger.warning(f"Failed login attempt for email: {mask_email(email)} - Account is inactive")
                 raise AuthenticationFailed("Account is inactive. Please contact support.")
-            
-        except User.DoesNotExist:
-            # User doesn't exist, will be caught by authenticate()
-            logger.debug(f"User with email {email} does not exist in database")
-            pass
         
         # Authenticate user
-        logger.debug(f"Calling authenticate() with email={email}")
-        user = authenticate(request, email=email, password=password)
-        logger.debug(f"authenticate() returned: {user}")
+        if user_obj is None:
+            # Hash anyway so an unknown email takes as long as a wrong password
+            User().set_password(password)
+            user = None
+        else:
+            user = authenticate(request, email=email, password=password, user=user_obj)
         
         if not user:
             # Record failed login attempt if user exists
-            try:
-                user_obj = User.objects.get(email=email)
+            if user_obj is not None:
                 user_obj.record_failed_login()
                 logger.warning(f"Failed login attempt for email: {mask_email(email)} - Invalid credentials (attempt {user_obj.failed_login_attempts})")
-            except User.DoesNotExist:
+            else:
                 logger.warning(f"Failed login attempt for email: {mask_email(email)} - User does not exist")
             
             raise AuthenticationFailed("Invalid email or password. Please try again.")
         
-        # Reset failed login attempts on successful authentication
-        user.reset_failed_login_attempts()
+        # Stamp last_login and reset failed login attempts in one write
+        user.record_successful_login(update_last_login=jwt_settings.UPDATE_LAST_LOGIN)
         logger.info(f"Successful login for email: {mask_email(email)}")
 
         # Generate tokens directly using CustomTokenObtainPairSerializer.get_token
@@ -232,6 +230,20 @@ class EmailVerificationSerializer(serializers.Serializer):
 class ResendVerificationEmailSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
+class NotificationBroadcastSerializer(serializers.Serializer):
+    """Serializer for a notification broadcast to departments and/or positions."""
+    title = serializers.CharField(max_length=255)
+    message = serializers.CharField()
+    departments = serializers.MultipleChoiceField(choices=User.DEPARTMENT_CHOICES, required=False)
+    positions = serializers.MultipleChoiceField(choices=User.POSITION_CHOICES, required=False)
+    send_email = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not attrs.get('departments') and not attrs.get('positions'):
+            raise serializers.ValidationError("Choose at least one department or position.")
+        return attrs
+
+
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
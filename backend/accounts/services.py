@@ -2,12 +2,21 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
+from django.db.models import Q, QuerySet
+from django.dispatch import Signal
 import logging
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT when fanning notifications out
+NOTIFICATION_BATCH_SIZE = 1000
+
+# Sent with ``notifications`` and the recipients' ``unread_counts`` after notify()
+# bulk-creates them; bulk_create sends no post_save
+notifications_created = Signal()
+
 def send_password_reset_email(user, reset_url):
     """Send password reset email with HTML template."""
     try:
@@ -106,4 +115,77 @@ def send_password_reset_notification(user, reset_url):
         f"Click here to reset: {reset_url} "
         f"If you didn't request this, please ignore."
     )
-    send_sms(user.phone_number, sms_message)  # SMS failure won't raise an exception 
\ No newline at end of file
+    send_sms(user.phone_number, sms_message)  # SMS failure won't raise an exception 
+
+
+def notify(recipients, notification_type, title, message, related_object_id=None,
+           related_object_type=None, email_subject=None, email_body=None, requested_by=None):
+    """
+    Create the same in-app notification for every recipient.
+
+    ``recipients`` is a User queryset, resolved in one query, or an
+    iterable of users; duplicates and None are skipped. Rows are written
+    with bulk_create, NOTIFICATION_BATCH_SIZE per INSERT. With
+    ``email_subject``, each recipient is also emailed ``email_body`` (or
+    ``message``) through the mail queue, which delivers on a Celery worker
+    in production. Returns the created notifications.
+    """
+    from .models import Notification
+    from . import notification_feed
+
+    if isinstance(recipients, QuerySet):
+        people = dict(recipients.order_by().values_list('pk', 'email'))
+    else:
+        people = {user.pk: user.email for user in recipients if user is not None}
+    if not people:
+        return []
+
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(
+                user_id=user_id,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                related_object_id=related_object_id,
+                related_object_type=related_object_type,
+            )
+            for user_id in people
+        ],
+        batch_size=NOTIFICATION_BATCH_SIZE,
+    )
+    unread_counts = notification_feed.notifications_created_for(people)
+    notifications_created.send(sender=Notification, notifications=notifications, unread_counts=unread_counts)
+
+    if email_subject:
+        from mailer.services import queue_emails
+
+        queue_emails(
+            notification_type.lower(),
+            [{'subject': email_subject, 'body': email_body or message, 'to': [email]} for email in people.values()],
+            requested_by=requested_by,
+        )
+
+    logger.info(f"Created {len(notifications)} {notification_type} notifications")
+    return notifications
+
+
+def broadcast(notification_type, title, message, departments=(), positions=(), **kwargs):
+    """
+    Notify every active user in any of ``departments`` or ``positions``.
+
+    The audience is selected in the database, so a broadcast to thousands
+    of users costs the same handful of queries as one to a few. Keyword
+    arguments are passed on to notify().
+    """
+    from django.contrib.auth import get_user_model
+
+    audience = Q()
+    if departments:
+        audience |= Q(department__in=departments)
+    if positions:
+        audience |= Q(position__in=positions)
+    if not audience:
+        return []
+    recipients = get_user_model().objects.filter(audience, is_active=True)
+    return notify(recipients, notification_type, title, message, **kwargs)
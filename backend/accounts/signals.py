@@ -0,0 +1,43 @@
+"""
+Keep cached authentication profiles and notification feed state in sync.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from . import authentication, notification_feed
+from .models import Notification
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Reload the user's profile on their next request."""
+    authentication.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def invalidate_on_blacklist(sender, instance, created, **kwargs):
+    """Logging out, or rotating a refresh token, drops the owner's cached profile."""
+    if created and instance.token.user_id is not None:
+        authentication.invalidate(instance.token.user_id)
+
+
+@receiver(post_save, sender=Notification)
+def update_notification_feed(sender, instance, created, **kwargs):
+    """Count new unread notifications; recount after any other save."""
+    if created:
+        notification_feed.notifications_created(instance.user_id, unread=0 if instance.is_read else 1)
+    else:
+        notification_feed.invalidate(instance.user_id)
+
+
+@receiver(post_delete, sender=Notification)
+def update_notification_feed_on_delete(sender, instance, **kwargs):
+    """Deleting an unread notification lowers the unread count."""
+    if notification_feed.in_bulk_change():
+        return
+    notification_feed.notifications_read(instance.user_id, count=0 if instance.is_read else 1)
@@ -4,7 +4,7 @@ from .views import (
     EmailVerificationView, ResendVerificationEmailView, UserListCreateAPIView,
     UserDetailAPIView, CreateUserView, NotificationListView, NotificationDetailView,
     MarkAllNotificationsReadView, DeleteAllNotificationsView, CreateWelcomeNotificationView,
-    FirstTimeLoginNotificationView, CreateTestUserView
+    FirstTimeLoginNotificationView, CreateTestUserView, NotificationBroadcastView
 )
 
 urlpatterns = [
@@ -28,6 +28,7 @@ urlpatterns = [
     path('notifications/<int:pk>/', NotificationDetailView.as_view(), name='notification-detail'),
     path('notifications/mark-all-read/', MarkAllNotificationsReadView.as_view(), name='mark-all-read'),  # Changed from 'mark-all-notifications-read'
     path('notifications/delete-all/', DeleteAllNotificationsView.as_view(), name='delete-all-notifications'),
+    path('notifications/broadcast/', NotificationBroadcastView.as_view(), name='notification-broadcast'),
     path('notifications/create-welcome/', CreateWelcomeNotificationView.as_view(), name='create-welcome-notification'),
     path('notifications/first-time-login/', FirstTimeLoginNotificationView.as_view(), name='first-time-login-notification'),
 ]
\ No newline at end of file
@@ -2,24 +2,30 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers import CustomTokenObtainPairSerializer
-from .serializers import LoginSerializer, PasswordResetRequestSerializer, PasswordResetConfirmSerializer, LogoutUserSerializer, UserMeSerializer, UserSerializer, EmailVerificationSerializer, ResendVerificationEmailSerializer, NotificationSerializer
+from .serializers import LoginSerializer, PasswordResetRequestSerializer, PasswordResetConfirmSerializer, LogoutUserSerializer, UserMeSerializer, UserSerializer, EmailVerificationSerializer, ResendVerificationEmailSerializer, NotificationSerializer, NotificationBroadcastSerializer
 from rest_framework import status
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from urllib.parse import unquote
 import logging
 from .models import User, Notification
+from . import notification_feed
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework import generics
-from .services import send_password_reset_email, send_password_change_notification
+from .services import send_password_reset_email, send_password_change_notification, broadcast
+from api.permissions import IsHSSEManager
 from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth import get_user_model
 from datetime import timedelta
 import traceback
 import os
+import hashlib
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
 from core.mask_email import mask_email
 
 User = get_user_model()
@@ -426,21 +432,74 @@ class CreateTestUserView(generics.CreateAPIView):
 # =============================
 
 class NotificationListView(generics.ListAPIView):
-    """View for listing user notifications."""
+    """
+    View for listing user notifications.
+
+    ``?since=<id|ISO timestamp>`` returns only notifications newer than the
+    given id or creation time, oldest first, for incremental polling. Every
+    response carries an ETag derived from the user's feed version, so
+    polling with If-None-Match costs a 304 and no queries until the feed
+    changes.
+    """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user)
 
+    def get_etag(self, request):
+        feed_version = notification_feed.version(request.user.pk)
+        if feed_version is None:
+            return None
+        key = f'{request.user.pk}:{feed_version}:{request.get_full_path()}'
+        return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
     def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        not_modified = get_conditional_response(request, etag=etag) if etag else None
+        if not_modified is not None:
+            response = not_modified
+        elif 'since' in request.query_params:
+            response = self.list_since(request.query_params['since'])
+        else:
+            queryset = self.get_queryset()
+            page = self.paginate_queryset(queryset)
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+            response.data['notifications'] = response.data.pop('results')
+            response.data['unread_count'] = notification_feed.unread_count(request.user.pk)
+
+        if etag:
+            response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list_since(self, since):
+        """Notifications after ``since``, oldest first, at most one page's worth."""
         queryset = self.get_queryset()
-        unread_count = queryset.filter(is_read=False).count()
-        
-        serializer = self.get_serializer(queryset, many=True)
+        since = since.replace(' ', '+')  # An unescaped UTC offset arrives as a space
+        if since.isdigit():
+            queryset = queryset.filter(pk__gt=int(since))
+        else:
+            moment = parse_datetime(since)
+            if moment is None:
+                return Response(
+                    {'error': 'since must be a notification id or an ISO 8601 timestamp'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            queryset = queryset.filter(created_at__gt=moment)
+
+        limit = self.paginator.max_page_size
+        notifications = list(queryset.order_by('pk')[:limit + 1])
+        has_more = len(notifications) > limit
+        notifications = notifications[:limit]
         return Response({
-            'notifications': serializer.data,
-            'unread_count': unread_count
+            'notifications': self.get_serializer(notifications, many=True).data,
+            'unread_count': notification_feed.unread_count(self.request.user.pk),
+            'latest_id': notifications[-1].pk if notifications else None,
+            'has_more': has_more,
         })
 
 
@@ -474,6 +533,7 @@ class MarkAllNotificationsReadView(generics.GenericAPIView):
             is_read=True, 
             read_at=timezone.now()
         )
+        notification_feed.notifications_cleared(request.user.pk)
         return Response({'message': 'All notifications marked as read'})
 
 
@@ -482,10 +542,37 @@ class DeleteAllNotificationsView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        Notification.objects.filter(user=request.user).delete()
+        # Per-row feed updates are skipped; the feed is updated once for the user
+        with notification_feed.bulk_change():
+            Notification.objects.filter(user=request.user).delete()
+        notification_feed.notifications_cleared(request.user.pk)
         return Response({'message': 'All notifications deleted'})
 
 
+class NotificationBroadcastView(generics.GenericAPIView):
+    """View for HSSE Managers to notify whole departments or positions at once."""
+    serializer_class = NotificationBroadcastSerializer
+    permission_classes = [IsAuthenticated, IsHSSEManager]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        notifications = broadcast(
+            'SYSTEM',
+            data['title'],
+            data['message'],
+            departments=sorted(data.get('departments', [])),
+            positions=sorted(data.get('positions', [])),
+            email_subject=data['title'] if data['send_email'] else None,
+            requested_by=request.user,
+        )
+        return Response(
+            {'message': 'Notification broadcast', 'recipients_count': len(notifications)},
+            status=status.HTTP_201_CREATED
+        )
+
+
 class CreateWelcomeNotificationView(generics.GenericAPIView):
     """View for creating welcome notification (for testing)."""
     permission_classes = [IsAuthenticated]
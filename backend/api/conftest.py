@@ -0,0 +1,134 @@
+"""
+Fixtures for query budget tests.
+
+``query_budget`` fails a test when a block runs more SQL queries than the
+endpoint's entry in ``query_budgets.json``. ``seeded_api_data`` builds a
+dataset with several rows behind every budgeted endpoint, so per-row
+queries push an endpoint over its budget. ``seed_api_data`` can be called
+again to add rows, for checking query counts do not grow with them.
+"""
+import json
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+BUDGET_FILE = Path(__file__).with_name('query_budgets.json')
+
+
+def load_query_budgets():
+    """``{url_name: max_queries}`` from query_budgets.json."""
+    with BUDGET_FILE.open() as budget_file:
+        return json.load(budget_file)
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Context manager asserting a block stays within an endpoint's query budget.
+
+        with query_budget('audit-finding-list'):
+            client.get(reverse('audit-finding-list'))
+    """
+    budgets = load_query_budgets()
+
+    @contextmanager
+    def check(name):
+        with CaptureQueriesContext(connection) as queries:
+            yield queries
+        budget = budgets[name]
+        if len(queries) > budget:
+            statements = '\n'.join(f"  {query['sql']}" for query in queries.captured_queries)
+            pytest.fail(f"{name} ran {len(queries)} queries, budget is {budget}:\n{statements}")
+
+    return check
+
+
+def seed_api_data(manager, rows=5):
+    """Create ``rows`` instances behind each budgeted list endpoint."""
+    from accounts.factories import NotificationFactory
+    from audits.models import AuditType, AuditPlan, AuditFinding, CAPA, ISOClause45001
+    from documents.factories import DocumentFactory, TagFactory
+    from documents.models import Record
+    from legals.models import LawCategory, LawResource
+    from ppes.factories import (
+        PPECategoryFactory, PPEIssueFactory, PPEPurchaseFactory, PPERequestFactory, VendorFactory
+    )
+    from quickreports.models import QuickReport
+    from risks.models import RiskAssessment, RiskMatrixConfig
+
+    tags = TagFactory.create_batch(2)
+    documents = DocumentFactory.create_batch(rows, created_by=manager, tags=tags)
+    for document in documents:
+        Record.objects.create(
+            title=f'Record for {document.title}', form_document=document, source_document=documents[0],
+            submitted_by=manager, submitted_file='record.pdf',
+        )
+    NotificationFactory.create_batch(rows, user=manager)
+
+    categories = PPECategoryFactory.create_batch(2)
+    vendor = VendorFactory(phone_number='+254700000000')
+    for index in range(rows):
+        category = categories[index % len(categories)]
+        PPEIssueFactory(ppe_category=category, employee=manager, issued_by=manager)
+        PPERequestFactory(ppe_category=category, employee=manager)
+        PPEPurchaseFactory(ppe_category=category, vendor=vendor, cost_per_unit=Decimal('25.00'))
+
+    # Shared reference rows, so the dataset can be seeded again to add more rows
+    audit_type, _ = AuditType.objects.get_or_create(code='HSSE', defaults={'name': 'HSSE Audit'})
+    clause, _ = ISOClause45001.objects.get_or_create(
+        clause_number='8.1', defaults={'title': 'Operational planning', 'description': '-'}
+    )
+    ISOClause45001.objects.get_or_create(
+        clause_number='8.1.1',
+        defaults={'title': 'Eliminating hazards', 'description': '-', 'parent_clause': clause},
+    )
+    for index in range(rows):
+        plan = AuditPlan.objects.create(
+            title=f'Audit {index}', audit_type=audit_type, lead_auditor=manager,
+            planned_start_date=date.today(), planned_end_date=date.today() + timedelta(days=1),
+        )
+        plan.iso_clauses.add(clause)
+        finding = AuditFinding.objects.create(
+            audit_plan=plan, iso_clause=clause, finding_type='MINOR_NC', severity='LOW',
+            title=f'Finding {index}', description='-', impact_assessment='SAFETY', department_affected='Ops',
+        )
+        CAPA.objects.create(
+            finding=finding, title='Fix', description='-', root_cause='-', action_plan='-',
+            responsible_person=manager, target_completion_date=date.today(),
+            effectiveness_criteria='-', verification_method='INSPECTION',
+        )
+
+    law_category, _ = LawCategory.objects.get_or_create(name='Safety')
+    RiskMatrixConfig.get_config()
+    for index in range(rows):
+        LawResource.objects.create(
+            title=f'Act {index}', country='GH', category=law_category, jurisdiction='national',
+        )
+        RiskAssessment.objects.create(
+            assessed_by=manager, location='Depot', process_area='Loading',
+            activity_description=f'Activity {index}', risk_category='SAFETY', activity_type='ROUTINE',
+            initial_probability=3, initial_severity=4, residual_probability=2, residual_severity=2,
+        )
+        QuickReport.objects.create(
+            report_type='NEAR_MISS', title=f'Report {index}', description='-', location='Yard',
+            incident_date=timezone.now(), reported_by=manager,
+        )
+
+
+@pytest.fixture
+def seeded_api_data(db):
+    """An HSSE manager and a seeded dataset; returns the manager."""
+    from accounts.factories import HSSEManagerFactory
+
+    manager = HSSEManagerFactory()
+    seed_api_data(manager)
+    # Dashboards must be computed, not served from an earlier test's cache
+    cache.clear()
+    return manager
@@ -0,0 +1,140 @@
+"""
+Shared cache for dashboard payloads.
+
+Each dashboard payload is stored in the Django cache under a key built from
+the dashboard name, a per-dashboard generation number and the caller's scope
+(``'all'`` for unrestricted views, ``'user:<id>'`` for per-user views).
+Saving or deleting any model a dashboard reads bumps that dashboard's
+generation, so every scope is invalidated at once without key scans.
+DASHBOARD_CACHE_TIMEOUT bounds staleness for time-dependent figures such
+as overdue counts.
+"""
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal
+from rest_framework.response import Response
+
+from core.cache_generation import GenerationKey
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'dashboard'
+
+# Sent with ``name`` whenever a dashboard's cached payloads are dropped
+dashboard_invalidated = Signal()
+
+# Models each dashboard reads, as app_label.ModelName
+DASHBOARD_MODELS = {
+    'documents': ['documents.Document', 'documents.ChangeRequest', 'documents.ApprovalWorkflow'],
+    'audits': [
+        'audits.AuditPlan', 'audits.AuditFinding', 'audits.CAPA',
+        'audits.AuditReport', 'audits.ISOClause45001',
+    ],
+    'risks': ['risks.RiskAssessment', 'risks.RiskTreatmentAction', 'risks.RiskMatrixConfig'],
+    'quickreports': ['quickreports.QuickReport'],
+}
+
+
+def _timeout():
+    return getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300)
+
+
+def _generation(name):
+    return GenerationKey(f'{KEY_PREFIX}:{name}:generation')
+
+
+def _counter_key(name, outcome):
+    return f'{KEY_PREFIX}:{name}:{outcome}'
+
+
+def _count(name, outcome):
+    key = _counter_key(name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def scope_for(user, unrestricted):
+    """Cache scope for a request: shared when the view is unrestricted for this user."""
+    return 'all' if unrestricted else f'user:{user.pk}'
+
+
+def get_or_compute(name, scope, compute):
+    """
+    Return ``(payload, hit)`` for a dashboard, computing and storing it on a miss.
+
+    Cache errors never break the dashboard; the payload is computed instead.
+    """
+    try:
+        key = f'{KEY_PREFIX}:{name}:{_generation(name).get()}:{scope}'
+        payload = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Dashboard cache unavailable for {name}: {e}")
+        return compute(), False
+
+    if payload is not None:
+        _count(name, 'hits')
+        return payload, True
+
+    payload = compute()
+    cache.set(key, payload, timeout=_timeout())
+    _count(name, 'misses')
+    return payload, False
+
+
+def cached_response(name, scope, compute):
+    """DRF response for a cached dashboard, flagged with an X-Dashboard-Cache header."""
+    payload, hit = get_or_compute(name, scope, compute)
+    return Response(payload, headers={'X-Dashboard-Cache': 'HIT' if hit else 'MISS'})
+
+
+def invalidate(name):
+    """Drop every cached scope of a dashboard."""
+    _generation(name).bump_on_commit()
+    dashboard_invalidated.send(sender=None, name=name)
+
+
+def stats():
+    """Hit and miss counters for every dashboard."""
+    keys = [_counter_key(name, outcome) for name in DASHBOARD_MODELS for outcome in ('hits', 'misses')]
+    values = cache.get_many(keys)
+    return {
+        name: {
+            'hits': values.get(_counter_key(name, 'hits'), 0),
+            'misses': values.get(_counter_key(name, 'misses'), 0),
+        }
+        for name in DASHBOARD_MODELS
+    }
+
+
+def _invalidate_receiver(names):
+    def receiver(sender, **kwargs):
+        for name in names:
+            invalidate(name)
+    return receiver
+
+
+def connect_invalidation_signals():
+    """Invalidate dashboards whenever a model they read is saved or deleted."""
+    readers = {}
+    for name, labels in DASHBOARD_MODELS.items():
+        for label in labels:
+            readers.setdefault(label, []).append(name)
+
+    for label, names in readers.items():
+        model = apps.get_model(label)
+        receiver = _invalidate_receiver(names)
+        uid = f'dashboard_cache:{label}'
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                receiver, sender=field.remote_field.through, weak=False,
+                dispatch_uid=f'{uid}:{field.name}',
+            )
@@ -0,0 +1,81 @@
+"""
+Default pagination for list endpoints.
+
+Keyset (cursor) pagination: each page filters on the last row seen instead
+of using OFFSET, so deep pages cost the same as the first one and rows
+inserted meanwhile do not shift pages. Totals are opt-in with
+``?count=true`` because COUNT(*) scans every matching row.
+"""
+from collections import OrderedDict
+
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on each view's natural ordering.
+
+    The ordering comes from, in turn, an ``?ordering=`` accepted by the
+    view's OrderingFilter, the view's ``ordering`` attribute, the
+    queryset's ``order_by()`` and the model's ``Meta.ordering``, with the
+    primary key appended as a tie-breaker. Orderings the cursor cannot
+    follow (related fields, expressions) fall back to the primary key.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    count_query_param = 'count'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+
+        if not ordering:
+            ordering = (
+                getattr(view, 'ordering', None)
+                or queryset.query.order_by
+                or queryset.query.get_meta().ordering
+            )
+        if isinstance(ordering, str):
+            ordering = [ordering]
+
+        fields = []
+        for field in ordering:
+            if not isinstance(field, str) or '__' in field or '?' in field:
+                break
+            fields.append(field)
+        if not fields:
+            fields = ['-pk']
+
+        if not {field.lstrip('-') for field in fields} & {'pk', 'id'}:
+            fields.append('-pk' if fields[0].startswith('-') else 'pk')
+        return tuple(fields)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def _get_position_from_instance(self, instance, ordering):
+        field_name = ordering[0].lstrip('-')
+        value = instance[field_name] if isinstance(instance, dict) else getattr(instance, field_name)
+        # NULLs cannot be compared against; such pages continue by offset
+        return None if value is None else str(value)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = OrderedDict([('count', self.count), *response.data.items()])
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {
+            'type': 'integer',
+            'description': f'Total number of results, only present with ?{self.count_query_param}=true',
+        }
+        return response_schema
@@ -136,4 +136,18 @@ class RiskManagementPermission(BasePermission):
             return request.method in SAFE_METHODS
         
         # Deny access to Dashboard and other features
-        return False 
\ No newline at end of file
+        return False 
+
+class ExportJobPermission(BasePermission):
+    """
+    Custom permission for background report/export jobs:
+    - Every available export covers audit or risk data, so only
+      HSSE Managers/Admins may queue or download them
+    """
+    message = "Only HSSE Managers and Admins can generate exports."
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+
+        return request.user.position == 'HSSE MANAGER' or request.user.is_superuser
@@ -0,0 +1,81 @@
+"""
+Tests for audit list endpoints running a constant number of queries.
+"""
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import HSSEManagerFactory
+from audits.models import AuditType, AuditPlan, AuditFinding, CAPA, ISOClause45001
+
+
+class AuditListQueryTests(APITestCase):
+    """Tests for annotated audit plan, finding and CAPA lists."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+        self.audit_type = AuditType.objects.create(name='HSSE Audit', code='HSSE')
+        self.clause = ISOClause45001.objects.create(clause_number='8.1', title='Operational planning', description='-')
+
+    def add_plan(self):
+        plan = AuditPlan.objects.create(
+            title='Audit', audit_type=self.audit_type, lead_auditor=self.manager,
+            planned_start_date=date.today(), planned_end_date=date.today(),
+        )
+        plan.iso_clauses.add(self.clause)
+        finding = AuditFinding.objects.create(
+            audit_plan=plan, iso_clause=self.clause, finding_type='MINOR_NC', severity='LOW',
+            title='Finding', description='-', impact_assessment='SAFETY', department_affected='Ops',
+        )
+        for capa_status in ('CLOSED', 'IN_PROGRESS'):
+            CAPA.objects.create(
+                finding=finding, title='Fix', description='-', root_cause='-', action_plan='-',
+                responsible_person=self.manager, target_completion_date=date.today() - timedelta(days=1),
+                effectiveness_criteria='-', verification_method='INSPECTION', status=capa_status,
+            )
+        return plan
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        assert response.status_code == 200
+        return len(queries), response
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        """Test plan, finding and CAPA lists cost the same for 1 or 4 rows."""
+        self.add_plan()
+        urls = [reverse(name) for name in ('audit-plan-list', 'audit-finding-list', 'capa-list', 'my-capas')]
+        baseline = [self.count_queries(url)[0] for url in urls]
+
+        for _ in range(3):
+            self.add_plan()
+
+        assert [self.count_queries(url)[0] for url in urls] == baseline
+
+    def test_annotations_match_properties(self):
+        """Test annotated counts give the same answers as the model properties."""
+        self.add_plan()
+
+        _, plans = self.count_queries(reverse('audit-plan-list'))
+        _, findings = self.count_queries(reverse('audit-finding-list'))
+
+        assert plans.data['results'][0]['iso_clause_count'] == 1
+        finding = findings.data['results'][0]
+        assert (finding['capa_count'], finding['has_capa'], finding['all_capas_closed']) == (2, True, False)
+        model = AuditFinding.objects.get()
+        assert (model.has_capa, model.all_capas_closed) == (True, False)
+
+    def test_dashboard_overdue_capas(self):
+        """Test the dashboard counts overdue CAPAs in the database."""
+        self.add_plan()
+
+        _, response = self.count_queries(reverse('audit-dashboard'))
+
+        assert response.data['overdue_capas'] == 1
+        assert response.data['findings_by_clause'] == {'8.1': 1}
+        assert response.data['recent_findings'][0]['capa_count'] == 2
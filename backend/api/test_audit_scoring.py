@@ -0,0 +1,182 @@
+"""
+Tests for batch audit scoring.
+"""
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.factories import HSSEManagerFactory
+from audits.models import (
+    AuditType, AuditChecklistTemplate, AuditChecklistCategory, AuditChecklistQuestion,
+    AuditPlan, AuditFinding, AuditFindingScore, AuditQuestionResponse, ISOClause45001
+)
+from audits import scoring
+from audits.scoring import (
+    get_finding_score, get_finding_scores, refresh_template_scores, score_finding, score_findings
+)
+
+
+class AuditScoringTests(TestCase):
+    """Tests for the batch scoring engine."""
+
+    def setUp(self):
+        """Set up test data."""
+        # Committed like the admin and checklist submits that saved them, storing each score
+        with self.captureOnCommitCallbacks(execute=True):
+            self.audit_type = AuditType.objects.create(name='HSSE Audit', code='HSSE')
+            template = AuditChecklistTemplate.objects.create(audit_type=self.audit_type, name='Checklist')
+            self.questions = []
+            for section, weight in ((1, Decimal('60')), (2, Decimal('40'))):
+                category = AuditChecklistCategory.objects.create(
+                    template=template, section_number=section, category_name=f'Section {section}', weight=weight
+                )
+                for letter in 'abc':
+                    self.questions.append(AuditChecklistQuestion.objects.create(
+                        category=category, reference_number=f'{section}.1', question_letter=letter,
+                        question_text='Is it compliant?', weight=Decimal('25') if letter != 'c' else Decimal('50'),
+                    ))
+
+            self.plan = AuditPlan.objects.create(
+                title='Annual audit', audit_type=self.audit_type,
+                planned_start_date=date.today(), planned_end_date=date.today(),
+            )
+            clause = ISOClause45001.objects.create(clause_number='8.1', title='Operational planning', description='-')
+            self.findings = [
+                AuditFinding.objects.create(
+                    audit_plan=self.plan, iso_clause=clause, finding_type='OBSERVATION', severity='LOW',
+                    title=f'Finding {index}', description='-', impact_assessment='SAFETY', department_affected='Ops',
+                )
+                for index in range(3)
+            ]
+            statuses = ['COMPLIANT', 'NON_COMPLIANT', 'OBSERVATION', 'COMPLIANT', 'COMPLIANT', 'NON_COMPLIANT']
+            for finding in self.findings:
+                for question, compliance_status in zip(self.questions, statuses):
+                    AuditQuestionResponse.objects.create(
+                        finding=finding, question=question, compliance_status=compliance_status
+                    )
+
+    def test_score_matches_category_scores(self):
+        """Test the overall score combines weighted category scores."""
+        score = score_finding(self.findings[0])
+
+        # Section 1: 25% compliant + 50% observation (90) = 70; section 2: 50%
+        assert [c['score'] for c in score['category_scores'].values()] == [70.0, 50.0]
+        assert score['overall_score'] == 62.0
+        assert score['grade'] == 'PASS'
+        assert score['total_questions_answered'] == 6
+        category = AuditChecklistCategory.objects.get(section_number=1)
+        assert category.calculate_score(self.findings[0]) == Decimal('70')
+
+    def test_score_findings_uses_constant_queries(self):
+        """Test scoring many findings does not query per question or finding."""
+        # Audit types, template tree, question weights, responses
+        with self.assertNumQueries(4):
+            scores = score_findings(self.findings)
+
+        assert len(scores) == 3
+        assert all(score['overall_score'] == 62.0 for score in scores.values())
+
+    def test_finding_without_template_has_no_score(self):
+        """Test findings whose audit type has no active template are not scored."""
+        AuditChecklistTemplate.objects.update(is_active=False)
+
+        assert score_finding(self.findings[0]) is None
+
+    def test_audit_plan_scores_endpoint(self):
+        """Test the plan endpoint returns a score per finding."""
+        client = APIClient()
+        client.force_authenticate(user=HSSEManagerFactory())
+
+        response = client.get(reverse('audit-plan-scores', kwargs={'pk': self.plan.pk}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['findings']) == 3
+        assert response.data['findings'][0]['score']['overall_score'] == 62.0
+
+    def test_snapshots_are_read_without_rescoring(self):
+        """Test stored scores are served in a single query once computed."""
+        computed = get_finding_scores(self.findings)
+
+        with self.assertNumQueries(1):
+            stored = get_finding_scores(self.findings)
+
+        assert stored == computed
+        assert AuditFindingScore.objects.filter(grade='PASS').count() == 3
+
+    def test_response_change_refreshes_snapshot(self):
+        """Test editing a response rescores its finding after commit."""
+        finding = self.findings[0]
+        untouched = AuditFindingScore.objects.get(finding=self.findings[1]).computed_at
+        response = finding.question_responses.get(question=self.questions[1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response.compliance_status = 'COMPLIANT'
+            response.save()
+
+        # Section 1 is now fully compliant except the observation: 25 + 25 + 45 = 95
+        assert AuditFindingScore.objects.get(finding=finding).overall_score == 77.0
+        assert AuditFindingScore.objects.get(finding=self.findings[1]).computed_at == untouched
+
+    def test_checklist_submit_rescores_each_finding_once(self):
+        """Test saving many responses in one transaction rescores their finding once."""
+        finding = self.findings[0]
+
+        with mock.patch.object(scoring, 'score_finding_ids', wraps=scoring.score_finding_ids) as score:
+            with self.captureOnCommitCallbacks(execute=True):
+                for response in finding.question_responses.all():
+                    response.compliance_status = 'COMPLIANT'
+                    response.save()
+
+        score.assert_called_once_with([finding.pk])
+        assert AuditFindingScore.objects.get(finding=finding).overall_score == 100.0
+
+    def test_weight_edit_refreshes_stored_scores(self):
+        """Test editing category and question weights rescores stored snapshots once committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for category in AuditChecklistCategory.objects.all():
+                category.weight = Decimal('40') if category.section_number == 1 else Decimal('60')
+                category.save()
+
+        assert set(AuditFindingScore.objects.values_list('overall_score', flat=True)) == {58.0}
+
+        question = self.questions[2]
+        with self.captureOnCommitCallbacks(execute=True):
+            question.weight = Decimal('25')
+            question.save()
+
+        # Section 1 questions now weigh 25/25/25: (100 + 0 + 90) / 3 of 40%, plus 50% of 60%
+        assert round(AuditFindingScore.objects.get(finding=self.findings[0]).overall_score, 2) == 55.33
+
+    def test_template_and_plan_changes_refresh_stored_scores(self):
+        """Test deactivating the template or moving a finding to another audit type rescores it."""
+        other_type = AuditType.objects.create(name='Fire Audit', code='FIRE')
+        other_plan = AuditPlan.objects.create(
+            title='Fire audit', audit_type=other_type,
+            planned_start_date=date.today(), planned_end_date=date.today(),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            moved = self.findings[0]
+            moved.audit_plan = other_plan
+            moved.save()
+        assert not AuditFindingScore.objects.filter(finding=moved).exists()
+        assert AuditFindingScore.objects.count() == 2
+
+        with self.captureOnCommitCallbacks(execute=True):
+            template = AuditChecklistTemplate.objects.get()
+            template.is_active = False
+            template.save()
+        assert not AuditFindingScore.objects.exists()
+
+    def test_weight_change_refreshes_template_scores(self):
+        """Test rescoring a template updates every stored snapshot."""
+        get_finding_scores(self.findings)
+        AuditChecklistCategory.objects.filter(section_number=1).update(weight=Decimal('40'))
+        AuditChecklistCategory.objects.filter(section_number=2).update(weight=Decimal('60'))
+
+        assert refresh_template_scores(AuditChecklistTemplate.objects.get()) == 3
+        assert set(AuditFindingScore.objects.values_list('overall_score', flat=True)) == {58.0}
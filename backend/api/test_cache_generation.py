@@ -0,0 +1,50 @@
+"""
+Tests for cache generation numbers.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from core.cache_generation import GenerationKey
+
+
+class GenerationKeyTests(SimpleTestCase):
+    """Tests for seeding, bumping and surviving eviction and outages."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.generation = GenerationKey('tests:generation')
+
+    def test_bump_moves_to_a_new_generation(self):
+        """Test the generation is stable until bumped."""
+        first = self.generation.get()
+        assert self.generation.get() == first
+
+        self.generation.bump()
+
+        assert self.generation.get() != first
+
+    def test_evicted_generation_does_not_revive(self):
+        """Test a generation lost from the cache comes back at a new value."""
+        seen = {self.generation.get()}
+        self.generation.bump()
+        seen.add(self.generation.get())
+        cache.delete(self.generation.key)
+
+        assert self.generation.get() not in seen
+
+    def test_bump_many(self):
+        """Test several generations move in one write."""
+        other = GenerationKey('tests:other')
+        before = (self.generation.get(), other.get())
+
+        GenerationKey.bump_many([self.generation, other])
+
+        assert self.generation.get() != before[0] and other.get() != before[1]
+
+    def test_cache_outage_does_not_fail_bump(self):
+        """Test bumping logs instead of raising when the cache is down."""
+        with mock.patch.object(cache, 'incr', side_effect=ConnectionError('down')):
+            with self.assertLogs('core.cache_generation', level='WARNING'):
+                self.generation.bump()
@@ -0,0 +1,116 @@
+"""
+Tests for batched CAPA reminder digests and weekly summaries.
+"""
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from accounts.factories import HSSEManagerFactory, UserFactory
+from audits.models import AuditType, AuditPlan, AuditFinding, CAPA, ISOClause45001
+from audits.services import send_capa_reminder_digests, send_weekly_capa_summaries
+from mailer.models import EmailBatch
+
+
+class CAPAReminderDigestTests(APITestCase):
+    """Tests for one digest per person, escalations and the reminded marker."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.manager = HSSEManagerFactory()
+        self.owner = UserFactory()
+        self.other = UserFactory()
+        audit_type = AuditType.objects.create(name='Reminder Audit', code='REM')
+        clause = ISOClause45001.objects.create(clause_number='10.2', title='Corrective action', description='-')
+        plan = AuditPlan.objects.create(
+            title='Audit', audit_type=audit_type, lead_auditor=self.manager,
+            planned_start_date=date.today(), planned_end_date=date.today(),
+        )
+        self.finding = AuditFinding.objects.create(
+            audit_plan=plan, iso_clause=clause, finding_type='MINOR_NC', severity='LOW',
+            title='Finding', description='-', impact_assessment='SAFETY', department_affected='Ops',
+        )
+
+    def add_capa(self, person, days, priority='MEDIUM', status='IN_PROGRESS'):
+        return CAPA.objects.create(
+            finding=self.finding, title='Fix', description='-', root_cause='-', action_plan='-',
+            responsible_person=person, assigned_by=self.manager, priority=priority, status=status,
+            target_completion_date=date.today() + timedelta(days=days),
+            effectiveness_criteria='-', verification_method='INSPECTION',
+        )
+
+    def test_one_digest_per_person(self):
+        """Test each person gets one digest however many CAPAs they own."""
+        for days in (-3, -1, 2, 5):
+            self.add_capa(self.owner, days)
+        self.add_capa(self.owner, 30)
+        self.add_capa(self.owner, -2, status='CLOSED')
+        self.add_capa(self.other, 1)
+
+        summary = send_capa_reminder_digests()
+
+        owner_mail = [message for message in mail.outbox if message.to == [self.owner.email]]
+        assert len(owner_mail) == 1
+        assert owner_mail[0].subject == '⚠️ CAPA Reminder - 2 Overdue, 2 Due Soon'
+        assert (summary['overdue'], summary['due_soon']) == (2, 3)
+        # The assigner hears about the overdue CAPAs only
+        escalation = next(message for message in mail.outbox if message.to == [self.manager.email])
+        assert escalation.subject == 'CAPA Escalation - 2 Overdue, 0 Due Soon'
+        assert summary['digests'] == len(mail.outbox) == 3
+        assert EmailBatch.objects.get().messages.count() == 3
+
+    def test_digest_header_shows_reminder_window(self):
+        """Test the due-soon header names the window the CAPAs were selected with."""
+        self.add_capa(self.owner, 10)
+
+        send_capa_reminder_digests(due_within=14)
+
+        assert 'DUE WITHIN 14 DAYS (1)' in mail.outbox[0].body
+        assert 'DUE WITHIN 7 DAYS' not in mail.outbox[0].body
+
+    def test_queries_do_not_grow_with_capas(self):
+        """Test selecting CAPAs costs the same for 2 or 10 CAPAs."""
+        self.add_capa(self.owner, -1)
+        self.add_capa(self.other, 3)
+        with CaptureQueriesContext(connection) as baseline:
+            send_capa_reminder_digests()
+
+        CAPA.objects.update(last_reminded_at=None)
+        for days in range(8):
+            self.add_capa(self.owner if days % 2 else self.other, days - 4)
+        with CaptureQueriesContext(connection) as queries:
+            send_capa_reminder_digests()
+
+        assert len(queries) == len(baseline)
+
+    def test_rerun_same_day_is_idempotent(self):
+        """Test CAPAs reminded today are skipped by a rerun."""
+        capa = self.add_capa(self.owner, -1)
+        send_capa_reminder_digests()
+        capa.refresh_from_db()
+        assert capa.last_reminded_at is not None
+
+        out = StringIO()
+        call_command('send_capa_reminders', stdout=out)
+
+        assert len(mail.outbox) == 2
+        assert 'already reminded today' in out.getvalue()
+
+        CAPA.objects.update(last_reminded_at=capa.last_reminded_at - timedelta(days=1))
+        assert send_capa_reminder_digests()['digests'] == 2
+
+    def test_weekly_summaries(self):
+        """Test weekly summaries cover every owner in one batch."""
+        self.add_capa(self.owner, -1)
+        self.add_capa(self.owner, 20)
+        self.add_capa(self.other, 3, status='ASSIGNED')
+
+        batch = send_weekly_capa_summaries()
+
+        assert batch.messages.count() == 2
+        owner_mail = next(message for message in mail.outbox if message.to == [self.owner.email])
+        assert owner_mail.subject == 'Weekly CAPA Summary - 1 Overdue, 0 Due Soon'
+        assert 'Total Active CAPAs: 2' in owner_mail.body
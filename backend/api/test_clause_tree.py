@@ -0,0 +1,104 @@
+"""
+Tests for the cached ISO 45001 clause tree.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import HSSEManagerFactory
+from audits import clause_tree
+from audits.models import ISOClause45001
+
+
+class ClauseTreeTests(APITestCase):
+    """Tests for clause paths, nested sub-clauses and invalidation."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.client.force_authenticate(user=HSSEManagerFactory())
+        self.root = self.add_clause('8')
+        self.child = self.add_clause('8.1', self.root)
+        self.grandchild = self.add_clause('8.1.1', self.child)
+
+    def add_clause(self, number, parent=None):
+        return ISOClause45001.objects.create(
+            clause_number=number, title=f'Clause {number}', description='-', parent_clause=parent,
+        )
+
+    def get(self, name, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name, **kwargs))
+        assert response.status_code == 200
+        return len(queries), response
+
+    def test_nested_sub_clauses_and_paths(self):
+        """Test the detail view nests the whole subtree with materialized paths."""
+        _, response = self.get('iso-clause-45001-detail', kwargs={'pk': self.root.pk})
+
+        child = response.data['sub_clauses'][0]
+        assert response.data['full_path'] == '8'
+        assert child['full_path'] == '8 > 8.1'
+        assert child['parent_clause'] == self.root.pk
+        assert child['sub_clauses'][0]['full_path'] == '8 > 8.1 > 8.1.1'
+        assert child['sub_clauses'][0]['sub_clauses'] == []
+        assert self.grandchild.get_full_path() == '8 > 8.1 > 8.1.1'
+
+    def test_list_queries_do_not_grow_with_depth(self):
+        """Test deeper and wider trees cost the same number of queries."""
+        self.get('iso-clause-45001-list')
+        baseline, _ = self.get('iso-clause-45001-list')
+
+        parent = self.grandchild
+        for depth in range(4):
+            parent = self.add_clause(f'8.1.1.{depth}', parent)
+            self.add_clause(f'9.{depth}', self.root)
+        self.get('iso-clause-45001-list')
+
+        count, _ = self.get('iso-clause-45001-list')
+        assert count == baseline
+
+    def test_flattened_tree(self):
+        """Test the tree endpoint lists clauses depth first with depths and children."""
+        sibling = self.add_clause('8.2', self.root)
+
+        _, response = self.get('iso-clause-45001-tree')
+
+        clauses = response.data['clauses']
+        assert [clause['clause_number'] for clause in clauses] == ['8', '8.1', '8.1.1', '8.2']
+        assert [clause['depth'] for clause in clauses] == [0, 1, 2, 1]
+        assert clauses[0]['children'] == [self.child.pk, sibling.pk]
+        assert clauses[3]['full_path'] == '8 > 8.2'
+
+    def test_clause_changes_invalidate_tree(self):
+        """Test saving and deleting clauses rebuilds the cached tree."""
+        self.get('iso-clause-45001-tree')
+
+        self.child.clause_number = '8.5'
+        self.child.save()
+        assert clause_tree.get_clause_tree().path(self.grandchild.pk) == '8 > 8.5 > 8.1.1'
+
+        self.grandchild.delete()
+        _, response = self.get('iso-clause-45001-detail', kwargs={'pk': self.child.pk})
+        assert response.data['sub_clauses'] == []
+
+    def test_tree_built_during_save_is_rebuilt_on_commit(self):
+        """Test a tree built before the clause change commits is not reused afterwards."""
+        stale = clause_tree.get_clause_tree()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.child.clause_number = '8.5'
+            self.child.save()
+            # Stands in for a concurrent request building the tree before the commit
+            stale = clause_tree.get_clause_tree()
+
+        assert clause_tree.get_clause_tree() is not stale
+
+    def test_rebuilds_for_unknown_clause(self):
+        """Test a clause missing from a stale tree triggers a rebuild."""
+        clause_tree.get_clause_tree()
+        clause = ISOClause45001.objects.bulk_create([
+            ISOClause45001(clause_number='8.3', title='Bulk', description='-', parent_clause=self.root),
+        ])[0]
+
+        assert clause_tree.get_clause_tree(clause.pk).path(clause.pk) == '8 > 8.3'
@@ -0,0 +1,83 @@
+"""
+Tests for the shared dashboard cache.
+"""
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from rest_framework import status
+from accounts.factories import HSSEManagerFactory
+from documents.factories import DocumentFactory
+from api import dashboard_cache
+from risks.models import RiskMatrixConfig
+
+
+class DashboardCacheTests(APITestCase):
+    """Tests for cached dashboard payloads and their invalidation."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+        self.url = reverse('document-dashboard')
+
+    def test_second_request_is_served_from_cache(self):
+        """Test the dashboard is computed once and then read from cache."""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first['X-Dashboard-Cache'] == 'MISS'
+        assert second['X-Dashboard-Cache'] == 'HIT'
+        assert second.data == first.data
+        assert dashboard_cache.stats()['documents'] == {'hits': 1, 'misses': 1}
+
+    def test_model_change_invalidates_dashboard(self):
+        """Test saving a document invalidates the cached payload."""
+        before = self.client.get(self.url)
+
+        DocumentFactory(created_by=self.manager)
+        after = self.client.get(self.url)
+
+        assert after['X-Dashboard-Cache'] == 'MISS'
+        assert after.data['metrics']['total_documents'] == before.data['metrics']['total_documents'] + 1
+
+    def test_payload_cached_during_write_is_dropped_on_commit(self):
+        """Test a payload cached before the write commits is not served afterwards."""
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DocumentFactory(created_by=self.manager)
+            # Stands in for a concurrent reader caching before the commit
+            assert self.client.get(self.url)['X-Dashboard-Cache'] == 'MISS'
+            assert self.client.get(self.url)['X-Dashboard-Cache'] == 'HIT'
+
+        assert self.client.get(self.url)['X-Dashboard-Cache'] == 'MISS'
+
+    def test_risk_matrix_change_invalidates_risk_dashboard(self):
+        """Test changing the matrix thresholds re-buckets the cached risk dashboard."""
+        url = reverse('risk-dashboard')
+        config = RiskMatrixConfig.get_config()
+        self.client.get(url)
+        assert self.client.get(url)['X-Dashboard-Cache'] == 'HIT'
+
+        config.low_threshold = 3
+        config.save()
+
+        assert self.client.get(url)['X-Dashboard-Cache'] == 'MISS'
+
+    def test_scopes_are_cached_separately(self):
+        """Test restricted scopes do not share payloads."""
+        computed = []
+
+        def compute():
+            computed.append(1)
+            return {'value': len(computed)}
+
+        dashboard_cache.get_or_compute('quickreports', 'user:1', compute)
+        payload, hit = dashboard_cache.get_or_compute('quickreports', 'user:2', compute)
+
+        assert hit is False
+        assert payload == {'value': 2}
@@ -0,0 +1,70 @@
+"""
+Tests for annotated document counts on folder and template listings.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.factories import HSSEManagerFactory
+from documents.factories import DocumentFactory
+from documents.models import DocumentFolder, DocumentTemplate
+
+
+class DocumentFolderCountTests(APITestCase):
+    """Tests for folder and template document counts."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'page_size': 100})
+        assert response.status_code == 200
+        return len(queries), response
+
+    def test_folder_counts(self):
+        """Test folder counts include only active documents of the folder's type."""
+        DocumentFactory.create_batch(2, document_type='POLICY', created_by=self.manager)
+        DocumentFactory(document_type='POLICY', is_active=False, created_by=self.manager)
+        DocumentFactory(document_type='FORM', created_by=self.manager)
+
+        _, response = self.get(reverse('document-folder-list-create'))
+
+        folders = {folder['value']: folder for folder in response.data['results']}
+        assert folders['POLICY']['document_count'] == 2
+        assert folders['FORM']['document_count'] == 1
+        assert (folders['SSOW']['document_count'], folders['SSOW']['is_empty']) == (0, True)
+        assert folders['POLICY']['can_be_deleted'] is False
+
+    def test_folder_sidebar_costs_two_queries(self):
+        """Test the folder list is one query plus authenticating the user."""
+        DocumentFactory.create_batch(3, document_type='PROCEDURE', created_by=self.manager)
+        DocumentFolder.objects.update(created_by=self.manager)
+        self.client.force_authenticate(user=None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.manager).access_token}')
+
+        count, _ = self.get(reverse('document-folder-list-create'))
+
+        assert count <= 2
+
+    def test_template_counts(self):
+        """Test template counts come from the annotated listing."""
+        template = DocumentTemplate.objects.create(
+            name='Permit', document_type='FORM', department='OPERATIONS', created_by=self.manager,
+        )
+        DocumentFactory.create_batch(3, template=template, created_by=self.manager)
+        DocumentTemplate.objects.create(name='Spare', document_type='FORM', department='OPERATIONS')
+        baseline, _ = self.get(reverse('template-list-create'))
+
+        DocumentTemplate.objects.create(
+            name='Audit', document_type='FORM', department='OPERATIONS', approved_by=self.manager,
+        )
+        count, response = self.get(reverse('template-list-create'))
+
+        assert count == baseline
+        counts = {item['name']: item['document_count'] for item in response.data['results']}
+        assert counts == {'Permit': 3, 'Spare': 0, 'Audit': 0}
@@ -0,0 +1,139 @@
+"""
+Tests for background export jobs.
+"""
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework import status
+from accounts.factories import HSSEManagerFactory
+from exports.models import ExportJob
+from exports.services import delete_expired_exports, fail_stale_export_jobs, run_export_job
+from risks.models import RiskAssessment
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, EXPORT_JOBS_EAGER=True)
+class ExportJobAPITests(APITestCase):
+    """Tests for queueing, polling and downloading export jobs."""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+        self.url = reverse('export-job-list')
+        RiskAssessment.objects.create(
+            assessed_by=self.manager,
+            location='Depot',
+            process_area='Loading',
+            activity_description='Tanker loading',
+            risk_category='SAFETY',
+            activity_type='ROUTINE',
+            initial_probability=4,
+            initial_severity=5,
+            residual_probability=2,
+            residual_severity=2,
+        )
+
+    def test_risk_register_export_job(self):
+        """Test a queued export completes and can be downloaded."""
+        response = self.client.post(self.url, {'export_type': 'RISK_REGISTER_CSV'}, format='json')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == 'COMPLETED'
+        assert response.data['progress'] == 100
+
+        poll = self.client.get(reverse('export-job-detail', kwargs={'pk': response.data['id']}))
+        assert poll.data['download_url'].endswith(f"/exports/{response.data['id']}/download/")
+
+        download = self.client.get(reverse('export-job-download', kwargs={'pk': response.data['id']}))
+        assert download.status_code == status.HTTP_200_OK
+        content = b''.join(download.streaming_content).decode()
+        assert content.startswith('Event Number,')
+        assert 'Depot' in content
+
+    def test_invalid_parameters_are_rejected(self):
+        """Test parameters are validated before a job is created."""
+        response = self.client.post(self.url, {
+            'export_type': 'AUDIT_FINDING_PDF',
+            'parameters': {'finding_id': str(uuid.uuid4())},
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not ExportJob.objects.exists()
+
+    def test_jobs_are_private_to_requester(self):
+        """Test another manager cannot see or download a job."""
+        response = self.client.post(self.url, {'export_type': 'RISK_REGISTER_XLSX'}, format='json')
+
+        self.client.force_authenticate(user=HSSEManagerFactory())
+        detail = self.client.get(reverse('export-job-detail', kwargs={'pk': response.data['id']}))
+
+        assert detail.status_code == status.HTTP_404_NOT_FOUND
+        assert self.client.get(self.url).data['results'] == []
+
+    def test_expired_exports_are_gone(self):
+        """Test expired jobs cannot be downloaded and are cleaned up."""
+        response = self.client.post(self.url, {'export_type': 'RISK_REGISTER_CSV'}, format='json')
+        job = ExportJob.objects.get(pk=response.data['id'])
+        ExportJob.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        download = self.client.get(reverse('export-job-download', kwargs={'pk': job.pk}))
+
+        assert download.status_code == status.HTTP_410_GONE
+        assert delete_expired_exports() == 1
+        assert not job.result_file.storage.exists(job.result_file.name)
+
+    @override_settings(EXPORT_JOBS_EAGER=False)
+    def test_job_is_queued_for_the_worker(self):
+        """Test a request queues the job on the Celery app once committed."""
+        with mock.patch('exports.tasks.generate_export.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.url, {'export_type': 'RISK_REGISTER_CSV'}, format='json')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == 'PENDING'
+        delay.assert_called_once_with(response.data['id'])
+
+    def running_job(self, minutes_ago):
+        return ExportJob.objects.create(
+            export_type='RISK_REGISTER_CSV', requested_by=self.manager, status='RUNNING',
+            started_at=timezone.now() - timedelta(minutes=minutes_ago),
+        )
+
+    @override_settings(EXPORT_JOB_TIME_LIMIT=600)
+    def test_redelivered_task_takes_over_stale_job(self):
+        """Test a job whose worker died is rerun by the redelivered task, a live one is left alone."""
+        stale, live = self.running_job(minutes_ago=11), self.running_job(minutes_ago=1)
+
+        run_export_job(stale.pk)
+        run_export_job(live.pk)
+
+        stale.refresh_from_db()
+        live.refresh_from_db()
+        assert (stale.status, stale.progress) == ('COMPLETED', 100)
+        assert live.status == 'RUNNING'
+
+    @override_settings(EXPORT_JOB_TIME_LIMIT=600)
+    def test_stale_jobs_are_failed(self):
+        """Test the cleanup reaper fails jobs whose claim outlived the time limit."""
+        stale, live = self.running_job(minutes_ago=11), self.running_job(minutes_ago=1)
+
+        assert fail_stale_export_jobs() == 1
+
+        stale.refresh_from_db()
+        assert stale.status == 'FAILED' and stale.error_message
+        assert ExportJob.objects.get(pk=live.pk).status == 'RUNNING'
@@ -0,0 +1,96 @@
+"""
+Tests for resolving JWT-authenticated users from the profile cache.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.factories import HSSEManagerFactory
+from accounts.models import User
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    """Tests for cache hits and invalidation on user changes and logout."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.refresh = RefreshToken.for_user(self.manager)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+        self.url = reverse('user-me')
+
+    def get(self, url=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url or self.url)
+        user_queries = [query for query in queries if 'FROM "accounts_user"' in query['sql']]
+        return len(user_queries), response
+
+    def test_second_request_skips_user_query(self):
+        """Test the user is loaded once and then served from cache."""
+        assert self.get()[0] == 1
+
+        count, response = self.get()
+
+        assert count == 0
+        assert (response.data['id'], response.data['position']) == (self.manager.id, 'HSSE MANAGER')
+
+    def test_user_change_invalidates(self):
+        """Test saving the user is seen by permission checks on the next request."""
+        manager_only = reverse('email-batch-detail', kwargs={'pk': uuid.uuid4()})
+        assert self.get(manager_only)[1].status_code == 404
+        self.manager.position = 'TECHNICIAN'
+        self.manager.save()
+
+        count, response = self.get(manager_only)
+
+        assert count == 1
+        assert response.status_code == 403
+
+    def test_inactive_user_rejected_after_save(self):
+        """Test deactivating a user takes effect immediately."""
+        self.get()
+        self.manager.is_active = False
+        self.manager.save()
+
+        assert self.get()[1].status_code == 401
+
+    def test_profile_cached_during_save_is_dropped_on_commit(self):
+        """Test a profile cached before the user change commits is not served afterwards."""
+        self.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.manager.position = 'TECHNICIAN'
+            self.manager.save()
+            # Stands in for a concurrent request caching before the commit
+            self.get()
+
+        count, response = self.get()
+
+        assert count == 1
+        assert response.data['position'] == 'TECHNICIAN'
+
+    def test_logout_invalidates(self):
+        """Test blacklisting a refresh token drops the owner's cached profile."""
+        self.get()
+
+        response = self.client.post(reverse('logout'), {'refresh': str(self.refresh)})
+
+        assert response.status_code == 200
+        assert self.get()[0] == 1
+
+    def test_cached_user_keeps_secrets_on_save(self):
+        """Test updating a cached user never overwrites the uncached password."""
+        self.get()
+
+        response = self.client.patch(self.url, {'first_name': 'Renamed'})
+
+        assert response.status_code == 200
+        user = User.objects.get(pk=self.manager.pk)
+        assert user.first_name == 'Renamed'
+        assert user.check_password('testpass123')
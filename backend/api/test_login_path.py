@@ -0,0 +1,80 @@
+"""
+Tests for the login path's user fetches and lockout writes.
+"""
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import UserFactory
+
+
+class LoginPathTests(APITestCase):
+    """Tests for one user fetch per login and column-scoped lockout writes."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.url = reverse('login')
+
+    def login(self, password='testpass123', email=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'email': email or self.user.email, 'password': password})
+        user_sql = [query['sql'] for query in queries if '"accounts_user"' in query['sql']]
+        selects = [sql for sql in user_sql if sql.startswith('SELECT')]
+        updates = [sql for sql in user_sql if sql.startswith('UPDATE')]
+        return response, selects, updates
+
+    def test_successful_login_fetches_and_writes_once(self):
+        """Test a login reads the user once and writes last_login without a full-row save."""
+        response, selects, updates = self.login()
+
+        assert response.status_code == 200
+        assert len(selects) == 1
+        assert len(updates) == 1
+        assert '"last_login"' in updates[0] and '"password"' not in updates[0]
+        self.user.refresh_from_db()
+        assert self.user.last_login is not None
+
+    def test_failed_login_counts_atomically(self):
+        """Test a wrong password increments the counter in SQL, touching only lockout columns."""
+        response, selects, updates = self.login(password='wrong')
+
+        assert response.status_code == 401
+        assert len(selects) == 2  # the user, then the counters after incrementing
+        assert len(updates) == 1
+        assert '"failed_login_attempts" + 1' in updates[0] and '"password"' not in updates[0]
+        self.user.refresh_from_db()
+        assert self.user.failed_login_attempts == 1
+
+    def test_unknown_email_fetches_once(self):
+        """Test an unknown email is looked up once and writes nothing."""
+        response, selects, updates = self.login(email='nobody@example.com')
+
+        assert response.status_code == 401
+        assert (len(selects), len(updates)) == (1, 0)
+
+    def test_lockout_after_max_attempts(self):
+        """Test repeated failures lock the account, even for the right password."""
+        for _ in range(settings.ACCOUNT_LOCKOUT_ATTEMPTS):
+            self.login(password='wrong')
+
+        response, _, updates = self.login()
+
+        assert response.status_code == 401
+        assert 'locked' in response.data['error']
+        assert updates == []
+        self.user.refresh_from_db()
+        assert self.user.account_locked_until is not None
+
+    def test_success_clears_failed_attempts(self):
+        """Test a successful login resets earlier failures in the same write as last_login."""
+        self.login(password='wrong')
+
+        response, _, updates = self.login()
+
+        assert response.status_code == 200
+        assert len(updates) == 1
+        self.user.refresh_from_db()
+        assert (self.user.failed_login_attempts, self.user.last_failed_login) == (0, None)
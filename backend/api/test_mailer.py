@@ -0,0 +1,149 @@
+"""
+Tests for queued notification email and batched delivery.
+"""
+from datetime import date, timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import HSSEManagerFactory, UserFactory
+from audits.models import AuditType, AuditFinding, CAPA, ISOClause45001, AuditPlan
+from mailer.models import EmailBatch
+from mailer.services import deliver_batch, queue_emails, requeue_stale_batches, retry_delay
+
+LOCMEM_SEND = 'django.core.mail.backends.locmem.EmailBackend.send_messages'
+
+
+class MailerTests(APITestCase):
+    """Tests for the mail queue, delivery status and retries."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+
+    def messages(self, count):
+        return [
+            {'subject': f'Notice {index}', 'body': 'Body', 'to': [f'user{index}@example.com']}
+            for index in range(count)
+        ]
+
+    def test_batch_shares_one_connection(self):
+        """Test every message of a batch goes out over a single connection."""
+        with mock.patch('mailer.services.get_connection', wraps=mail.get_connection) as get_connection:
+            batch = queue_emails('test', self.messages(3) + [{'subject': 'Nobody', 'body': '-', 'to': []}])
+
+        assert get_connection.call_count == 1
+        assert len(mail.outbox) == 3
+        assert batch.status == 'SENT'
+        assert set(batch.messages.values_list('status', flat=True)) == {'SENT'}
+
+    @override_settings(EMAIL_MAX_ATTEMPTS=2)
+    def test_failed_messages_retry_then_fail(self):
+        """Test failures stay queued for retry until attempts run out."""
+        # Leave the batch queued, as if waiting for a worker
+        with mock.patch('mailer.services.enqueue_batch'):
+            batch = queue_emails('test', self.messages(2))
+
+        real_send = mail.backends.locmem.EmailBackend.send_messages
+
+        def flaky_send(backend, messages):
+            if messages[0].to == ['user1@example.com']:
+                raise SMTPException('mailbox unavailable')
+            return real_send(backend, messages)
+
+        with mock.patch(LOCMEM_SEND, autospec=True, side_effect=flaky_send):
+            assert deliver_batch(batch.pk) == 1
+            batch.refresh_from_db()
+            assert batch.status == 'QUEUED'
+
+            assert deliver_batch(batch.pk) == 0
+
+        batch.refresh_from_db()
+        failed = batch.messages.get(status='FAILED')
+        assert (batch.status, batch.attempts) == ('PARTIAL', 2)
+        assert (failed.attempts, failed.last_error) == (2, 'mailbox unavailable')
+        assert len(mail.outbox) == 1
+
+    def sending_batch(self, minutes_ago):
+        """A batch left SENDING by a worker that claimed it ``minutes_ago``."""
+        with mock.patch('mailer.services.enqueue_batch'):
+            batch = queue_emails('test', self.messages(1))
+        EmailBatch.objects.filter(pk=batch.pk).update(
+            status='SENDING', attempts=1, claimed_at=timezone.now() - timedelta(minutes=minutes_ago)
+        )
+        return batch
+
+    @override_settings(EMAIL_BATCH_TIME_LIMIT=600)
+    def test_redelivered_task_takes_over_stale_batch(self):
+        """Test a batch whose worker died is sent by the redelivered task, a live one is left alone."""
+        stale, live = self.sending_batch(minutes_ago=11), self.sending_batch(minutes_ago=1)
+
+        assert deliver_batch(stale.pk) == 0
+        assert deliver_batch(live.pk) == 0
+
+        stale.refresh_from_db()
+        assert (stale.status, stale.attempts) == ('SENT', 2)
+        assert EmailBatch.objects.get(pk=live.pk).status == 'SENDING'
+        assert len(mail.outbox) == 1
+
+    @override_settings(EMAIL_BATCH_TIME_LIMIT=600, EMAIL_QUEUE_EAGER=True)
+    def test_stale_batches_are_requeued(self):
+        """Test the reaper queues another attempt for batches whose claim outlived the time limit."""
+        stale, live = self.sending_batch(minutes_ago=11), self.sending_batch(minutes_ago=1)
+
+        assert requeue_stale_batches() == 1
+
+        assert EmailBatch.objects.get(pk=stale.pk).status == 'SENT'
+        assert EmailBatch.objects.get(pk=live.pk).status == 'SENDING'
+
+    @override_settings(EMAIL_QUEUE_EAGER=False)
+    def test_batch_is_queued_for_the_worker(self):
+        """Test a batch is handed to the mail queue once committed, and a broker outage is only logged."""
+        with mock.patch('mailer.tasks.deliver_email_batch.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                batch = queue_emails('test', self.messages(1))
+        delay.assert_called_once_with(str(batch.pk))
+
+        with mock.patch('mailer.tasks.deliver_email_batch.delay', side_effect=ConnectionError('broker down')):
+            with self.assertLogs('mailer.services', level='ERROR'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    batch = queue_emails('test', self.messages(1))
+        assert EmailBatch.objects.get(pk=batch.pk).status == 'QUEUED'
+
+    def test_retry_backoff(self):
+        """Test retry delays double and are capped."""
+        assert [retry_delay(retries) for retries in range(3)] == [60, 120, 240]
+        assert retry_delay(20) == 3600
+
+    def test_notification_view_returns_job(self):
+        """Test notification endpoints answer 202 with a job id to poll."""
+        audit_type = AuditType.objects.create(name='Mail Audit', code='MAIL')
+        clause = ISOClause45001.objects.create(clause_number='9.1', title='Monitoring', description='-')
+        plan = AuditPlan.objects.create(
+            title='Audit', audit_type=audit_type, lead_auditor=self.manager,
+            planned_start_date=date.today(), planned_end_date=date.today(),
+        )
+        finding = AuditFinding.objects.create(
+            audit_plan=plan, iso_clause=clause, finding_type='MINOR_NC', severity='LOW',
+            title='Finding', description='-', impact_assessment='SAFETY', department_affected='Ops',
+        )
+        capa = CAPA.objects.create(
+            finding=finding, title='Fix', description='-', root_cause='-', action_plan='-',
+            responsible_person=UserFactory(), assigned_by=self.manager, target_completion_date=date.today(),
+            effectiveness_criteria='-', verification_method='INSPECTION',
+        )
+
+        response = self.client.post(reverse('send-capa-notification', kwargs={'pk': capa.pk}))
+
+        assert response.status_code == 202
+        assert response.data['recipients_count'] == 1
+        status_response = self.client.get(reverse('email-batch-detail', kwargs={'pk': response.data['job_id']}))
+        assert status_response.data['status'] == 'SENT'
+        assert status_response.data['messages'][0]['to'] == [capa.responsible_person.email]
+        assert EmailBatch.objects.get().purpose == 'capa_assignment'
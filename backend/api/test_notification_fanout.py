@@ -0,0 +1,86 @@
+"""
+Tests for bulk notification fan-out and department/position broadcasts.
+"""
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import HSSEManagerFactory, UserFactory
+from accounts.models import Notification, User
+from accounts.services import notify
+
+
+class NotificationFanOutTests(APITestCase):
+    """Tests for constant-query fan-out, counters and broadcast email."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.url = reverse('notification-broadcast')
+
+    def fan_out(self):
+        with CaptureQueriesContext(connection) as queries:
+            notifications = notify(
+                User.objects.filter(department='FINANCE'), 'SYSTEM', 'Audit week', 'Prepare your records.',
+            )
+        return len(queries), notifications
+
+    def test_queries_do_not_grow_with_recipients(self):
+        """Test notifying 2 or 20 users costs the same queries."""
+        UserFactory.create_batch(2, department='FINANCE')
+        baseline, notifications = self.fan_out()
+        assert len(notifications) == 2
+
+        UserFactory.create_batch(18, department='FINANCE')
+        count, notifications = self.fan_out()
+
+        assert len(notifications) == 20
+        assert count == baseline
+        assert Notification.objects.filter(title='Audit week').count() == 22
+
+    def test_fan_out_updates_unread_counters(self):
+        """Test recipients' cached unread counts include fanned-out notifications."""
+        user = UserFactory(department='FINANCE')
+        self.client.force_authenticate(user=user)
+        assert self.client.get(reverse('notification-list')).data['unread_count'] == 0
+
+        self.fan_out()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('notification-list'))
+        assert response.data['unread_count'] == 1
+        assert len(queries) == 1
+
+    def test_broadcast_to_departments_and_positions(self):
+        """Test a broadcast reaches active users matching any department or position, once each."""
+        finance = UserFactory(department='FINANCE', position='TECHNICIAN')
+        technician = UserFactory(department='OPERATIONS', position='TECHNICIAN')
+        UserFactory(department='FINANCE', is_active=False)
+        UserFactory(department='OPERATIONS', position='MD')
+        self.client.force_authenticate(user=self.manager)
+
+        response = self.client.post(self.url, {
+            'title': 'Drill at 10:00', 'message': 'Assemble at point B.',
+            'departments': ['FINANCE'], 'positions': ['TECHNICIAN'], 'send_email': True,
+        }, format='json')
+
+        assert response.status_code == 201
+        assert response.data['recipients_count'] == 2
+        assert set(Notification.objects.filter(title='Drill at 10:00').values_list('user', flat=True)) == {
+            finance.pk, technician.pk,
+        }
+        assert sorted(message.to[0] for message in mail.outbox) == sorted([finance.email, technician.email])
+
+    def test_broadcast_requires_manager_and_audience(self):
+        """Test only HSSE Managers may broadcast, and only to a named audience."""
+        self.client.force_authenticate(user=UserFactory())
+        payload = {'title': 'Hi', 'message': '-', 'departments': ['HSSE']}
+        assert self.client.post(self.url, payload, format='json').status_code == 403
+
+        self.client.force_authenticate(user=self.manager)
+        response = self.client.post(self.url, {'title': 'Hi', 'message': '-'}, format='json')
+        assert response.status_code == 400
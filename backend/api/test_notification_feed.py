@@ -0,0 +1,106 @@
+"""
+Tests for the notification unread counter, ?since= polling and ETags.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import NotificationFactory, UserFactory
+from accounts.models import Notification
+
+
+class NotificationFeedTests(APITestCase):
+    """Tests for the cached unread counter and cheap polling."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('notification-list')
+        self.notifications = NotificationFactory.create_batch(3, user=self.user)
+
+    def get(self, params=None, **headers):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params, **headers)
+        return len(queries), response
+
+    def unread(self):
+        return self.get()[1].data['unread_count']
+
+    def test_unread_counter_is_maintained(self):
+        """Test the counter follows creates, reads and deletes without recounting."""
+        assert self.unread() == 3
+        NotificationFactory(user=self.user)
+        NotificationFactory(user=self.user, is_read=True)
+        NotificationFactory(user=UserFactory())
+
+        count, response = self.get()
+        assert (count, response.data['unread_count']) == (1, 4)
+
+        self.client.get(reverse('notification-detail', kwargs={'pk': self.notifications[0].pk}))
+        self.client.get(reverse('notification-detail', kwargs={'pk': self.notifications[0].pk}))
+        assert self.unread() == 3
+
+        self.client.delete(reverse('notification-detail', kwargs={'pk': self.notifications[1].pk}))
+        assert self.unread() == 2
+
+        self.client.post(reverse('mark-all-read'))
+        assert self.unread() == 0 == Notification.objects.filter(user=self.user, is_read=False).count()
+
+    def test_since_returns_only_new_notifications(self):
+        """Test ?since= by id and by timestamp returns newer items, oldest first."""
+        newer = NotificationFactory.create_batch(2, user=self.user)
+
+        response = self.get({'since': self.notifications[-1].pk})[1]
+
+        assert [item['id'] for item in response.data['notifications']] == [item.pk for item in newer]
+        assert (response.data['latest_id'], response.data['has_more']) == (newer[-1].pk, False)
+
+        Notification.objects.filter(pk__in=[item.pk for item in self.notifications]).update(
+            created_at=newer[0].created_at - timedelta(hours=1)
+        )
+        since = (newer[0].created_at - timedelta(minutes=1)).isoformat()
+        response = self.get({'since': since})[1]
+        assert len(response.data['notifications']) == 2
+
+        assert self.get({'since': 'yesterday'})[1].status_code == 400
+
+    def test_unchanged_feed_answers_not_modified(self):
+        """Test polling with the ETag gets a query-free 304 until the feed changes."""
+        _, response = self.get()
+        etag = response['ETag']
+
+        count, response = self.get(HTTP_IF_NONE_MATCH=etag)
+        assert (response.status_code, count) == (304, 0)
+
+        # A different query is a different representation
+        assert self.get({'since': 0}, HTTP_IF_NONE_MATCH=etag)[1].status_code == 200
+
+        self.notifications[0].mark_as_read()
+        _, response = self.get(HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_delete_all_updates_feed_once(self):
+        """Test deleting every notification runs one DELETE and clears the counter once."""
+        NotificationFactory.create_batch(5, user=self.user)
+        other = NotificationFactory(user=UserFactory())
+        assert self.unread() == 8
+
+        with mock.patch('accounts.notification_feed.notifications_read') as read, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('delete-all-notifications'))
+
+        assert response.status_code == 200
+        read.assert_not_called()
+        deletes = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('DELETE')]
+        assert len(deletes) == 1
+        assert self.unread() == 0
+        assert list(Notification.objects.all()) == [other]
+
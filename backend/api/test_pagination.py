@@ -0,0 +1,65 @@
+"""
+Tests for keyset pagination of list endpoints.
+"""
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import HSSEManagerFactory, NotificationFactory
+from quickreports.models import QuickReport
+
+
+class KeysetPaginationTests(APITestCase):
+    """Tests for cursor pages, opt-in counts and ordering."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+        self.url = reverse('quickreport-list')
+        severities = ['LOW', 'HIGH', 'MEDIUM', 'LOW', 'HIGH']
+        self.reports = [
+            QuickReport.objects.create(
+                report_type='NEAR_MISS', title=f'Report {index}', description='-', location='Yard',
+                incident_date=timezone.now(), severity=severity, reported_by=self.manager,
+            )
+            for index, severity in enumerate(severities)
+        ]
+
+    def collect(self, params):
+        ids = []
+        response = self.client.get(self.url, params)
+        while True:
+            ids.extend(report['id'] for report in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_pages_follow_natural_ordering(self):
+        """Test cursor pages cover every row once, newest first."""
+        ids = self.collect({'page_size': 2})
+
+        assert ids == [str(report.id) for report in reversed(self.reports)]
+
+    def test_count_is_opt_in(self):
+        """Test totals are only computed when requested."""
+        assert 'count' not in self.client.get(self.url).data
+        assert self.client.get(self.url, {'count': 'true', 'page_size': 2}).data['count'] == 5
+
+    def test_ordering_parameter_with_ties(self):
+        """Test a non-unique ordering field still pages without gaps or repeats."""
+        ids = self.collect({'page_size': 2, 'ordering': 'severity'})
+
+        assert sorted(ids) == sorted(str(report.id) for report in self.reports)
+        severities = [QuickReport.objects.get(pk=pk).severity for pk in ids]
+        assert severities == sorted(severities)
+
+    def test_notifications_are_paginated(self):
+        """Test the notification list keeps its keys and pages results."""
+        NotificationFactory.create_batch(3, user=self.manager)
+
+        response = self.client.get(reverse('notification-list'), {'page_size': 2})
+
+        assert len(response.data['notifications']) == 2
+        assert response.data['unread_count'] == 3
+        assert response.data['next'] is not None
@@ -0,0 +1,168 @@
+"""
+Tests for the WebSocket push channel.
+"""
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.factories import NotificationFactory, UserFactory
+from accounts.services import notify
+from api import dashboard_cache
+from core.asgi import application
+
+ORIGIN = (b'origin', b'http://localhost:5173')
+
+
+class PushChannelTests(APITestCase):
+    """Tests for authenticating connections and streaming events."""
+
+    def setUp(self):
+        """Set up test data."""
+        # Consumers close "old" connections around each query, which would
+        # close the connection holding this test's transaction
+        patcher = mock.patch('channels.db.close_old_connections')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+        # Run setup's on-commit work now, so later batches start empty
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = UserFactory()
+            NotificationFactory(user=self.user)
+
+    def communicator(self, token=None):
+        token = token or AccessToken.for_user(self.user)
+        return WebsocketCommunicator(application, f'/ws/notifications/?token={token}', headers=[ORIGIN])
+
+    def committed(self, action):
+        """Run ``action`` and its on-commit hooks from inside the test's event loop."""
+        def run():
+            with self.captureOnCommitCallbacks(execute=True):
+                return action()
+        return database_sync_to_async(run)()
+
+    def test_streams_new_notifications_to_their_recipient(self):
+        """Test a connected user receives their unread count and then new notifications only."""
+        other = UserFactory()
+
+        async def scenario():
+            communicator = self.communicator()
+            connected, _ = await communicator.connect()
+            assert connected
+            assert await communicator.receive_json_from() == {'type': 'unread_count', 'unread_count': 1}
+
+            await self.committed(lambda: NotificationFactory(user=other))
+            notification = await self.committed(lambda: NotificationFactory(user=self.user, title='Change request'))
+
+            message = await communicator.receive_json_from()
+            assert message['notification']['id'] == notification.pk
+            assert (message['type'], message['unread_count']) == ('notification', 2)
+            assert await communicator.receive_nothing()
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_streams_bulk_fan_out(self):
+        """Test notifications created in bulk are pushed like single ones."""
+        async def scenario():
+            communicator = self.communicator()
+            await communicator.connect()
+            await communicator.receive_json_from()
+
+            await self.committed(lambda: notify([self.user], 'SYSTEM', 'Drill', 'Assemble at point B.'))
+
+            message = await communicator.receive_json_from()
+            assert (message['notification']['title'], message['unread_count']) == ('Drill', 2)
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    @override_settings(PUSH_FAN_OUT_EAGER=True)
+    def test_fan_out_reuses_counts_and_loads_once(self):
+        """Test a fan-out sends nothing before commit, then loads its rows once and reads no counts."""
+        users = UserFactory.create_batch(5)
+        with mock.patch('push.events._send') as send, \
+                mock.patch('accounts.notification_feed.unread_count') as unread_count:
+            with self.captureOnCommitCallbacks() as callbacks:
+                notify(users + [self.user], 'SYSTEM', 'Drill', 'Assemble at point B.')
+            assert not send.called
+
+            with CaptureQueriesContext(connection) as queries:
+                for callback in callbacks:
+                    callback()
+
+        assert len(queries) == 1
+        unread_count.assert_not_called()
+        sent = {group: message['unread_count'] for (group, message), _ in send.call_args_list}
+        assert sent == {**{f'user.{user.pk}': 1 for user in users}, f'user.{self.user.pk}': 2}
+
+    @override_settings(PUSH_FAN_OUT_EAGER=False)
+    def test_fan_out_is_queued_after_commit(self):
+        """Test a fan-out is handed to the worker once committed, and a queue outage is only logged."""
+        other = UserFactory()
+        with mock.patch('push.tasks.push_notifications.delay') as delay:
+            with self.captureOnCommitCallbacks() as callbacks:
+                notifications = notify([other], 'SYSTEM', 'Drill', 'Assemble at point B.')
+            assert not delay.called
+            for callback in callbacks:
+                callback()
+        delay.assert_called_once_with([notifications[0].pk], {str(other.pk): 1})
+
+        with mock.patch('push.tasks.push_notifications.delay', side_effect=ConnectionError('broker down')):
+            with self.assertLogs('push.events', level='WARNING'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    notify([other], 'SYSTEM', 'Drill', 'Assemble at point C.')
+
+    def test_streams_dashboard_invalidations(self):
+        """Test invalidating a dashboard is announced to connected clients."""
+        async def scenario():
+            communicator = self.communicator()
+            await communicator.connect()
+            await communicator.receive_json_from()
+
+            await self.committed(lambda: dashboard_cache.invalidate('audits'))
+
+            assert await communicator.receive_json_from() == {
+                'type': 'dashboard_invalidated', 'dashboard': 'audits',
+            }
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_dashboard_invalidations_are_coalesced(self):
+        """Test a transaction invalidating a dashboard many times announces it once."""
+        def invalidate_many():
+            for name in ('audits', 'risks', 'audits', 'audits'):
+                dashboard_cache.invalidate(name)
+
+        async def scenario():
+            communicator = self.communicator()
+            await communicator.connect()
+            await communicator.receive_json_from()
+
+            await self.committed(invalidate_many)
+
+            received = [await communicator.receive_json_from() for _ in range(2)]
+            assert [message['dashboard'] for message in received] == ['audits', 'risks']
+            assert await communicator.receive_nothing()
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_rejects_missing_or_invalid_tokens(self):
+        """Test connections without a valid access token are refused."""
+        async def scenario():
+            for token in ('', 'not-a-token'):
+                communicator = WebsocketCommunicator(
+                    application, f'/ws/notifications/?token={token}', headers=[ORIGIN]
+                )
+                connected, _ = await communicator.connect()
+                assert not connected
+
+        async_to_sync(scenario)()
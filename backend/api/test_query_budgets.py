@@ -0,0 +1,81 @@
+"""
+Query budgets for api endpoints, and the request profiling middleware.
+
+Budgets live in query_budgets.json and are measured against
+``seeded_api_data``. When an endpoint legitimately needs more queries,
+raise its budget in the same change and say why in the commit. Budgets
+only catch per-row queries while they stay below the seeded row count, so
+endpoints must also run the same number of queries for more rows.
+"""
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from . import profiling
+from .conftest import load_query_budgets, seed_api_data
+
+
+@pytest.fixture
+def api_client(seeded_api_data):
+    client = APIClient()
+    client.force_authenticate(user=seeded_api_data)
+    return client
+
+
+def test_endpoints_within_query_budgets(api_client, query_budget):
+    """Test every budgeted endpoint stays within its query budget."""
+    for name in sorted(load_query_budgets()):
+        with query_budget(name):
+            response = api_client.get(reverse(name))
+
+        assert response.status_code == 200, name
+
+
+def count_queries(client):
+    """``{url_name: query_count}`` for every budgeted endpoint, with dashboards recomputed."""
+    counts = {}
+    for name in sorted(load_query_budgets()):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse(name))
+        counts[name] = len(queries)
+    return counts
+
+
+def test_query_counts_do_not_grow_with_rows(api_client, seeded_api_data):
+    """Test no budgeted endpoint runs more queries once the seeded rows double."""
+    before = count_queries(api_client)
+    seed_api_data(seeded_api_data)
+    after = count_queries(api_client)
+
+    grown = {name: (before[name], after[name]) for name in before if after[name] != before[name]}
+    assert grown == {}
+
+
+@override_settings(API_PROFILING=True)
+def test_server_timing_header(api_client):
+    """Test profiled requests report query count and timings."""
+    response = api_client.get(reverse('audit-finding-list'))
+
+    timing = dict(
+        metric.strip().split(';', 1) for metric in response['Server-Timing'].split(',')
+    )
+    assert set(timing) == {'db', 'serializer', 'python', 'total'}
+    assert timing['db'].endswith('desc="1 queries"')
+    assert response.wsgi_request.profile.serializer_time > 0
+
+
+@override_settings(API_PROFILING=False)
+def test_profiling_off_by_flag(api_client):
+    """Test no header is added and serializers are not wrapped when profiling is off."""
+    with mock.patch.object(profiling, 'install_serializer_timing') as install:
+        response = api_client.get(reverse('audit-finding-list'))
+
+    assert not response.has_header('Server-Timing')
+    install.assert_not_called()
@@ -0,0 +1,70 @@
+"""
+Tests for compact nested documents and ?expand= on the record list.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import HSSEManagerFactory
+from documents.factories import DocumentFactory, TagFactory
+from documents.models import Record
+
+
+class RecordExpandTests(APITestCase):
+    """Tests for record list payloads and their query cost."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+        self.url = reverse('record-list')
+
+    def add_records(self, count):
+        for _ in range(count):
+            form = DocumentFactory(document_type='FORM', created_by=self.manager, tags=[TagFactory()])
+            form.distribution_list.add(self.manager)
+            source = DocumentFactory(created_by=self.manager, approved_by=self.manager)
+            parent = Record.objects.create(
+                title='Original', form_document=form, submitted_by=self.manager, submitted_file='original.pdf',
+            )
+            Record.objects.create(
+                title='Correction', form_document=form, source_document=source, parent_record=parent,
+                submitted_by=self.manager, reviewed_by=self.manager, submitted_file='correction.pdf',
+            )
+
+    def get(self, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        assert response.status_code == 200
+        return len(queries), response
+
+    def test_nested_documents_are_compact(self):
+        """Test nested documents default to the summary representation."""
+        self.add_records(1)
+
+        _, response = self.get()
+
+        record = response.data['results'][0]
+        assert set(record['form_document']) == {'id', 'title', 'document_type', 'version', 'status', 'file_url'}
+        assert record['parent_record']['title'] == 'Original'
+        assert record['reviewed_by']['id'] == self.manager.id
+
+    def test_expand_renders_full_documents(self):
+        """Test ?expand= swaps in the full document serializer."""
+        self.add_records(1)
+
+        _, response = self.get({'expand': 'form_document,unknown'})
+
+        record = response.data['results'][0]
+        assert record['form_document']['distribution_list'][0]['id'] == self.manager.id
+        assert 'distribution_list' not in record['source_document']
+
+    def test_queries_do_not_grow_with_records(self):
+        """Test list cost is independent of the record count, expanded or not."""
+        self.add_records(1)
+        baseline = [self.get()[0], self.get({'expand': 'form_document,source_document'})[0]]
+
+        self.add_records(4)
+
+        assert [self.get()[0], self.get({'expand': 'form_document,source_document'})[0]] == baseline
@@ -0,0 +1,89 @@
+"""
+Tests for the Risk Register Excel and CSV exports.
+"""
+import csv
+import io
+
+from django.urls import reverse
+from openpyxl import load_workbook
+from rest_framework.test import APIClient, APITestCase
+from rest_framework import status
+from accounts.factories import HSSEManagerFactory
+from risks.models import RiskAssessment, RiskHazard, ControlBarrier
+from risks.register_export import HEADERS, iter_rows, risk_register_queryset
+
+
+class RiskRegisterExportTests(APITestCase):
+    """Tests for the streaming risk register exports."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+
+        for index in range(3):
+            ra = RiskAssessment.objects.create(
+                assessed_by=self.manager,
+                risk_owner=self.manager,
+                location=f'Depot {index}',
+                process_area='Loading',
+                activity_description='Tanker loading',
+                risk_category='SAFETY',
+                activity_type='ROUTINE',
+                initial_probability=4,
+                initial_severity=5,
+                residual_probability=1,
+                residual_severity=index + 1,
+                status='ACTIVE',
+            )
+            RiskHazard.objects.create(
+                risk_assessment=ra,
+                hazard_type='PROCESS',
+                hazard_description='Fuel vapour',
+                event_description='Ignition',
+                causes='Static discharge',
+                consequences='Fire',
+                impact_type='INJURY',
+            )
+            for barrier_type in ('PREVENTIVE', 'PROTECTIVE'):
+                ControlBarrier.objects.create(
+                    risk_assessment=ra,
+                    barrier_type=barrier_type,
+                    description=f'{barrier_type.title()} barrier',
+                    hierarchy_level=3,
+                    effectiveness_rating=4,
+                )
+
+    def test_rows_use_prefetched_relations(self):
+        """Test query count does not grow with the number of assessments."""
+        # Assessments plus one query each for hazards, barriers and actions
+        with self.assertNumQueries(4):
+            rows = [row for _, row in iter_rows(risk_register_queryset())]
+
+        assert len(rows) == 3
+        assert rows[0][HEADERS.index('Preventive Barriers')] == 'Preventive barrier'
+        assert rows[0][HEADERS.index('Protective Barriers')] == 'Protective barrier'
+        assert rows[0][HEADERS.index('Assessed By')] == self.manager.get_full_name
+
+    def test_excel_export(self):
+        """Test the workbook has a header row and one row per assessment."""
+        response = self.client.get(reverse('risk-export-excel'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        rows = list(workbook['Risk Register'].values)
+        assert list(rows[0]) == HEADERS
+        assert len(rows) == 4
+
+    def test_csv_export_filters_by_risk_level(self):
+        """Test the CSV export streams only the requested rating."""
+        response = self.client.get(reverse('risk-export-csv'), {'risk_level': 'LOW'})
+
+        assert response.status_code == status.HTTP_200_OK
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0] == HEADERS
+        assert len(rows) == 4
+        assert {row[HEADERS.index('Residual Rating')] for row in rows[1:]} == {'LOW'}
@@ -0,0 +1,133 @@
+"""
+Tests for risk levels rated in the database against the risk matrix thresholds.
+"""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import HSSEManagerFactory
+from risks.models import RiskAssessment, RiskMatrixConfig
+
+# Residual (probability, severity) pairs either side of the default 5 / 12 thresholds
+LEVELS = {5: (1, 5), 6: (2, 3), 12: (3, 4), 15: (3, 5)}
+
+
+class RiskLevelQuerySetTests(APITestCase):
+    """Tests for rating boundaries, custom matrices, the list filter and the dashboard."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.manager = HSSEManagerFactory()
+        self.client.force_authenticate(user=self.manager)
+        self.config = RiskMatrixConfig.get_config()
+        self.assessments = {level: self.assess(level) for level in LEVELS}
+
+    def assess(self, level, **kwargs):
+        probability, severity = LEVELS[level]
+        return RiskAssessment.objects.create(
+            assessed_by=self.manager,
+            risk_owner=self.manager,
+            location='Depot',
+            process_area='Loading',
+            activity_description='Tanker loading',
+            risk_category='SAFETY',
+            activity_type='ROUTINE',
+            initial_probability=5,
+            initial_severity=5,
+            residual_probability=probability,
+            residual_severity=severity,
+            status=kwargs.pop('status', 'ACTIVE'),
+            **kwargs,
+        )
+
+    def rated(self, rating, config=None):
+        return sorted(
+            assessment.residual_risk_level
+            for assessment in RiskAssessment.objects.by_rating(rating, config)
+        )
+
+    def test_with_risk_levels_annotates_scores(self):
+        """Test the annotated scores match the model's P × S properties."""
+        for assessment in RiskAssessment.objects.with_risk_levels():
+            assert assessment.residual_risk_score == assessment.residual_risk_level
+            assert assessment.initial_risk_score == assessment.initial_risk_level == 25
+
+    def test_default_threshold_boundaries(self):
+        """Test each threshold is inclusive of its upper bound."""
+        assert self.rated('LOW') == [5]
+        assert self.rated('MEDIUM') == [6, 12]
+        assert self.rated('HIGH') == [15]
+        assert RiskAssessment.objects.rating_distribution() == {'low': 1, 'medium': 2, 'high': 1}
+
+    def test_initial_levels_are_rated_separately(self):
+        """Test rating the initial level instead of the residual one."""
+        assert RiskAssessment.objects.rating_distribution(field='initial') == {'low': 0, 'medium': 0, 'high': 4}
+
+    def test_custom_matrix_thresholds(self):
+        """Test ratings follow the configured thresholds rather than fixed ones."""
+        self.config.low_threshold = 6
+        self.config.medium_threshold = 14
+        self.config.save()
+
+        assert self.rated('LOW') == [5, 6]
+        assert self.rated('MEDIUM') == [12]
+        assert self.rated('HIGH', config=RiskMatrixConfig(low_threshold=4, medium_threshold=5)) == [6, 12, 15]
+        assert RiskAssessment.objects.rating_distribution() == {'low': 2, 'medium': 1, 'high': 1}
+
+    def test_unknown_rating_is_rejected(self):
+        """Test an unknown rating raises rather than matching nothing."""
+        with self.assertRaises(ValueError):
+            RiskAssessment.objects.by_rating('EXTREME')
+
+    def test_overdue_for_review(self):
+        """Test only active assessments past their review date are overdue."""
+        yesterday = date.today() - timedelta(days=1)
+        overdue = self.assess(5, next_review_date=yesterday)
+        self.assess(5, next_review_date=yesterday, status='DRAFT')
+        self.assess(5, next_review_date=date.today())
+
+        assert list(RiskAssessment.objects.overdue_for_review()) == [overdue]
+
+    def list_medium(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('risk-assessment-list'), {'risk_level': 'MEDIUM'})
+        return len(queries), response
+
+    def dashboard(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('risk-dashboard'))
+        return len(queries), response
+
+    def test_list_filter_queries_do_not_grow(self):
+        """Test filtering the list by rating costs the same queries for 2 or 12 matches."""
+        baseline, response = self.list_medium()
+        assert sorted(item['id'] for item in response.data['results']) == sorted(
+            str(self.assessments[level].pk) for level in (6, 12)
+        )
+
+        for _ in range(5):
+            self.assess(6)
+            self.assess(12)
+        count, response = self.list_medium()
+
+        assert len(response.data['results']) == 12
+        assert count == baseline
+
+    def test_dashboard_distribution_queries_do_not_grow(self):
+        """Test the dashboard distribution costs the same queries for 4 or 24 assessments."""
+        baseline, response = self.dashboard()
+        assert response.data['risk_distribution'] == {'low': 1, 'medium': 2, 'high': 1}
+
+        for level in LEVELS:
+            for _ in range(5):
+                self.assess(level)
+        count, response = self.dashboard()
+
+        assert response.data['risk_distribution'] == {'low': 6, 'medium': 12, 'high': 6}
+        assert count == baseline
@@ -0,0 +1,133 @@
+"""
+Tests for full-text search.
+"""
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework import status
+from accounts.factories import HSSEManagerFactory, UserFactory
+from documents.factories import DocumentFactory, RecordFactory
+from documents.models import Document
+from legals.models import LawCategory, LawResource
+from quickreports.models import QuickReport
+
+
+class SearchTests(APITestCase):
+    """Tests for the document list search and the unified search endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.extinguisher = DocumentFactory(
+            title='Fire extinguisher inspection procedure',
+            description='Monthly checks',
+            content='Inspect every extinguisher pressure gauge.',
+        )
+        self.mention = DocumentFactory(
+            title='Warehouse housekeeping',
+            description='General rules',
+            content='Keep the fire exits clear.',
+        )
+        DocumentFactory(title='Driving policy', description='Journey management', content='Seat belts.')
+
+    def report(self, reported_by, title):
+        return QuickReport.objects.create(
+            report_type='NEAR_MISS', title=title, description='Blocked fire exit near loading bay',
+            location='Warehouse', incident_date=timezone.now(), reported_by=reported_by,
+        )
+
+    def test_document_list_search_is_ranked(self):
+        """Test title matches rank above body matches."""
+        response = self.client.get(reverse('document-list-create'), {'search': 'fire'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [doc['id'] for doc in response.data['results']] == [str(self.extinguisher.id), str(self.mention.id)]
+
+    def test_prefix_matching(self):
+        """Test partially typed words match."""
+        response = self.client.get(reverse('document-list-create'), {'search': 'extingu insp'})
+
+        assert [doc['id'] for doc in response.data['results']] == [str(self.extinguisher.id)]
+
+    def test_vector_refreshed_on_save(self):
+        """Test edits to indexed fields are searchable immediately."""
+        self.mention.content = 'Forklift charging area'
+        self.mention.save()
+
+        response = self.client.get(reverse('document-list-create'), {'search': 'forklift'})
+
+        assert [doc['id'] for doc in response.data['results']] == [str(self.mention.id)]
+
+    def test_unified_search_with_snippets(self):
+        """Test hits from several modules come back paginated with highlights."""
+        self.report(self.user, 'Fire exit blocked')
+
+        response = self.client.get(reverse('search'), {'q': 'fire', 'modules': 'documents,quick_reports', 'page_size': 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 3
+        assert response.data['next'] is not None
+        assert len(response.data['results']) == 2
+        assert response.data['results'][0]['title'] == 'Fire exit blocked'
+        assert response.data['results'][0]['snippet'] == 'Blocked <mark>fire</mark> exit near loading bay Warehouse'
+
+    def test_unified_search_respects_visibility(self):
+        """Test users only find quick reports they may see."""
+        self.report(HSSEManagerFactory(), 'Fire alarm fault')
+
+        response = self.client.get(reverse('search'), {'q': 'alarm', 'modules': 'quick_reports'})
+
+        assert response.data['count'] == 0
+
+    def search_as_staff(self, module, q):
+        staff = UserFactory(position='OPS MANAGER', is_staff=True)
+        self.client.force_authenticate(user=staff)
+        return self.client.get(reverse('search'), {'q': q, 'modules': module})
+
+    def test_staff_sees_all_documents(self):
+        """Test staff find every document, as in the document list."""
+        response = self.search_as_staff('documents', 'extinguisher')
+
+        assert [hit['id'] for hit in response.data['results']] == [str(self.extinguisher.id)]
+
+    def test_staff_sees_all_records(self):
+        """Test staff find records submitted by others, as in the record list."""
+        record = RecordFactory(title='Fire drill attendance')
+
+        response = self.search_as_staff('records', 'drill')
+
+        assert [hit['id'] for hit in response.data['results']] == [str(record.id)]
+
+    def test_staff_sees_all_laws(self):
+        """Test staff find every law, as in the law library list."""
+        category = LawCategory.objects.create(name='Fire safety')
+        law = LawResource.objects.create(title='Fire Services Act', category=category, jurisdiction='national')
+
+        response = self.search_as_staff('laws', 'services')
+
+        assert [hit['id'] for hit in response.data['results']] == [str(law.id)]
+
+    def test_staff_only_sees_own_quick_reports(self):
+        """Test staff who are not managers only find their own quick reports, as in the quick report list."""
+        self.report(self.user, 'Fire alarm fault')
+
+        response = self.search_as_staff('quick_reports', 'alarm')
+
+        assert response.data['count'] == 0
+
+    def test_unknown_module_is_rejected(self):
+        """Test an unknown module name returns 400."""
+        response = self.client.get(reverse('search'), {'q': 'fire', 'modules': 'payroll'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rebuild_search_index(self):
+        """Test the rebuild command recomputes missing vectors."""
+        Document.objects.update(search_vector=None)
+
+        call_command('rebuild_search_index', 'documents', verbosity=0)
+
+        assert not Document.objects.filter(search_vector__isnull=True).exists()
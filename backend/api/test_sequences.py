@@ -0,0 +1,71 @@
+"""
+Tests for business code sequence counters.
+"""
+from django.core.management import call_command
+from django.test import TestCase
+from accounts.factories import HSSEManagerFactory
+from risks.models import RiskAssessment
+from sequences.models import SequenceCounter
+from sequences.services import next_code, parse_code, seed_counters_from_existing
+
+
+class SequenceCounterTests(TestCase):
+    """Tests for code allocation."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.assessor = HSSEManagerFactory()
+
+    def create_risk(self, **kwargs):
+        return RiskAssessment.objects.create(
+            assessed_by=self.assessor,
+            location='Depot',
+            process_area='Loading',
+            activity_description='Tanker loading',
+            risk_category='SAFETY',
+            activity_type='ROUTINE',
+            initial_probability=3,
+            initial_severity=3,
+            residual_probability=2,
+            residual_severity=2,
+            **kwargs,
+        )
+
+    def test_allocation_increments(self):
+        """Test consecutive allocations return consecutive numbers."""
+        assert SequenceCounter.allocate('TST', 2025) == 1
+        assert SequenceCounter.allocate('TST', 2025) == 2
+        assert SequenceCounter.allocate('TST', 2026) == 1
+
+    def test_next_code_format(self):
+        """Test codes are zero padded to the requested width."""
+        assert next_code(RiskAssessment, 'event_number', 'RA', year=2025) == 'RA-2025-0001'
+        assert next_code(RiskAssessment, 'event_number', 'RA', year=2025, width=3) == 'RA-2025-002'
+        assert parse_code('QR-AC-2025-007') == ('QR-AC', 2025, 7)
+        assert parse_code('legacy') is None
+
+    def test_counter_seeded_from_existing_codes(self):
+        """Test the first allocation continues after codes already stored."""
+        self.create_risk(event_number='RA-2025-0041')
+
+        assert next_code(RiskAssessment, 'event_number', 'RA', year=2025) == 'RA-2025-0042'
+
+    def test_saved_risks_get_distinct_codes(self):
+        """Test new risk assessments draw their numbers from the counter."""
+        first = self.create_risk()
+        second = self.create_risk()
+
+        assert parse_code(first.event_number)[2] + 1 == parse_code(second.event_number)[2]
+        assert SequenceCounter.objects.get(prefix='RA').last_value == 2
+
+    def test_seed_counters_from_existing(self):
+        """Test the backfill raises counters but never lowers them."""
+        self.create_risk(event_number='RA-2024-0015')
+        SequenceCounter.objects.create(prefix='RA', year=2023, last_value=9)
+        self.create_risk(event_number='RA-2023-0003')
+
+        assert seed_counters_from_existing() == [('RA', 2024, 15)]
+        assert SequenceCounter.objects.get(prefix='RA', year=2023).last_value == 9
+
+        call_command('seed_sequence_counters', verbosity=0)
+        assert SequenceCounter.objects.get(prefix='RA', year=2024).last_value == 15
@@ -0,0 +1,105 @@
+"""
+Tests for prefetched and cached audit checklist templates.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from accounts.factories import HSSEManagerFactory
+from audits.models import AuditType, AuditChecklistTemplate, AuditChecklistCategory, AuditChecklistQuestion
+
+
+class ChecklistTemplateCacheTests(APITestCase):
+    """Tests for the template tree queries, cached payloads and invalidation."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=HSSEManagerFactory())
+        audit_type = AuditType.objects.create(name='Template Cache Audit', code='TCA')
+        self.template = AuditChecklistTemplate.objects.create(audit_type=audit_type, name='System v1')
+        self.url = reverse('audit-template-detail', kwargs={'pk': self.template.pk})
+        self.categories = [self.add_category(section) for section in (1, 2)]
+
+    def add_category(self, section, questions=2):
+        category = AuditChecklistCategory.objects.create(
+            template=self.template, section_number=section, category_name=f'Section {section}', weight=50,
+        )
+        for index in range(questions):
+            AuditChecklistQuestion.objects.create(
+                category=category, reference_number=f'{section}.1', question_letter='abcdef'[index],
+                question_text='Is it done?', weight=Decimal('100') / questions,
+            )
+        return category
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        assert response.status_code == 200
+        return len(queries), response
+
+    def test_tree_queries_do_not_grow(self):
+        """Test rendering costs the same for more categories and questions."""
+        baseline, _ = self.get(self.url)
+        list_baseline, _ = self.get(reverse('audit-template-list'))
+
+        self.add_category(3, questions=4)
+        count, response = self.get(self.url)
+
+        assert count == baseline
+        assert self.get(reverse('audit-template-list'))[0] == list_baseline
+        assert response.data['total_questions'] == 8
+        category = response.data['categories'][2]
+        assert category['question_count'] == 4
+        assert category['total_weight_check'] == {'total': 100.0, 'valid': True}
+
+    def test_detail_is_cached(self):
+        """Test a repeat request is served from the cache."""
+        miss_queries, first = self.get(self.url)
+        hit_queries, second = self.get(self.url)
+
+        assert (first['X-Template-Cache'], second['X-Template-Cache']) == ('MISS', 'HIT')
+        assert second.data == first.data
+        # The tree is no longer loaded, only the template lookup remains
+        assert hit_queries == miss_queries - 3
+
+    def test_question_change_invalidates(self):
+        """Test editing a question renders the template again."""
+        self.get(self.url)
+
+        question = AuditChecklistQuestion.objects.filter(category=self.categories[0]).first()
+        question.question_text = 'Is it documented?'
+        question.save()
+        _, response = self.get(self.url)
+
+        assert response['X-Template-Cache'] == 'MISS'
+        assert response.data['categories'][0]['questions'][0]['question_text'] == 'Is it documented?'
+
+    def test_payload_cached_during_save_is_dropped_on_commit(self):
+        """Test a payload cached before the question change commits is not served afterwards."""
+        self.get(self.url)
+        question = AuditChecklistQuestion.objects.filter(category=self.categories[0]).first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            question.question_text = 'Is it documented?'
+            question.save()
+            # Stands in for a concurrent request caching before the commit
+            self.get(self.url)
+
+        _, response = self.get(self.url)
+
+        assert response['X-Template-Cache'] == 'MISS'
+
+    def test_category_delete_invalidates(self):
+        """Test deleting a category renders the template again."""
+        self.get(self.url)
+
+        self.categories[1].delete()
+        _, response = self.get(self.url)
+
+        assert response['X-Template-Cache'] == 'MISS'
+        assert response.data['total_questions'] == 2
@@ -30,8 +30,8 @@ from api.views import (
     DocumentReviewScheduleAPIView,
     # Audit Management Views
     AuditTypeListView, AuditChecklistTemplateListView, AuditChecklistTemplateDetailView,
-    AuditScoringCriteriaListView, AuditScoreCalculationView, AuditFindingPDFReportView,
-    ISOClause45001ListView, ISOClause45001DetailView,
+    AuditScoringCriteriaListView, AuditScoreCalculationView, AuditPlanScoresView, AuditFindingPDFReportView,
+    ISOClause45001ListView, ISOClause45001TreeView, ISOClause45001DetailView,
     AuditPlanListCreateView, AuditPlanDetailView,
     AuditChecklistListCreateView, AuditChecklistDetailView,
     AuditChecklistResponseListCreateView, AuditChecklistResponseDetailView,
@@ -41,11 +41,15 @@ from api.views import (
     AuditReportListCreateView, AuditReportDetailView,
     AuditMeetingListCreateView, AuditCommentListCreateView,
     AuditDashboardView, BulkCAPAAssignView, MyCAPAsView,
-    SendAuditPlanNotificationView, SendCAPANotificationView, SendFindingNotificationView,
+    SendAuditPlanNotificationView, SendCAPANotificationView, SendFindingNotificationView, EmailBatchDetailView,
     CompanySettingsView,
     # Risk Management Views
     RiskMatrixConfigView, RiskAssessmentListCreateView, RiskAssessmentDetailView,
-    RiskAssessmentApproveView, RiskDashboardView, RiskExcelExportView, MyRiskAssessmentsView,
+    RiskAssessmentApproveView, RiskDashboardView, RiskExcelExportView, RiskCSVExportView, MyRiskAssessmentsView,
+    # Export Jobs
+    ExportJobListCreateView, ExportJobDetailView, ExportJobDownloadView,
+    # Search
+    SearchView,
     LawCategoryListCreateAPIView,
     LawCategoryRetrieveUpdateDestroyAPIView,
     LawResourceListCreateAPIView,
@@ -217,10 +221,12 @@ urlpatterns = [
     # Scoring
     path('audits/scoring-criteria/', AuditScoringCriteriaListView.as_view(), name='scoring-criteria-list'),
     path('audits/findings/<uuid:pk>/score/', AuditScoreCalculationView.as_view(), name='finding-score'),
+    path('audits/plans/<uuid:pk>/scores/', AuditPlanScoresView.as_view(), name='audit-plan-scores'),
     path('audits/findings/<uuid:pk>/pdf-report/', AuditFindingPDFReportView.as_view(), name='finding-pdf-report'),
     
     # ISO 45001 Clauses
     path('audits/iso-clauses/', ISOClause45001ListView.as_view(), name='iso-clause-45001-list'),
+    path('audits/iso-clauses/tree/', ISOClause45001TreeView.as_view(), name='iso-clause-45001-tree'),
     path('audits/iso-clauses/<int:pk>/', ISOClause45001DetailView.as_view(), name='iso-clause-45001-detail'),
     
     # Company Settings
@@ -270,6 +276,7 @@ urlpatterns = [
     path('audits/plans/<uuid:pk>/send-notification/', SendAuditPlanNotificationView.as_view(), name='send-audit-notification'),
     path('audits/capas/<uuid:pk>/send-notification/', SendCAPANotificationView.as_view(), name='send-capa-notification'),
     path('audits/findings/<uuid:pk>/send-notification/', SendFindingNotificationView.as_view(), name='send-finding-notification'),
+    path('mail/batches/<uuid:pk>/', EmailBatchDetailView.as_view(), name='email-batch-detail'),
     
     # ===========================================
     # RISK MANAGEMENT ENDPOINTS
@@ -287,6 +294,15 @@ urlpatterns = [
     # Risk Dashboard & Exports
     path('risks/dashboard/', RiskDashboardView.as_view(), name='risk-dashboard'),
     path('risks/export-excel/', RiskExcelExportView.as_view(), name='risk-export-excel'),
+    path('risks/export-csv/', RiskCSVExportView.as_view(), name='risk-export-csv'),
+    
+    # Background export jobs
+    path('exports/', ExportJobListCreateView.as_view(), name='export-job-list'),
+    path('exports/<uuid:pk>/', ExportJobDetailView.as_view(), name='export-job-detail'),
+    path('exports/<uuid:pk>/download/', ExportJobDownloadView.as_view(), name='export-job-download'),
+    
+    # Search
+    path('search/', SearchView.as_view(), name='search'),
     
     path('', include(router.urls)),
 ]
@@ -24,7 +24,9 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from rest_framework.decorators import action
-from .permissions import IsHSSEManager, LegalCompliancePermission, PPEManagementPermission, AuditManagementPermission, RiskManagementPermission
+from . import dashboard_cache
+from search.services import parse_query, search_queryset
+from .permissions import IsHSSEManager, LegalCompliancePermission, PPEManagementPermission, AuditManagementPermission, RiskManagementPermission, ExportJobPermission
 from legals.models import (
     LawCategory, LawResource, LawResourceChange,
     LegalRegisterEntry, LegalRegisterComment, LegalRegisterDocument, Position, LegislationTracker
@@ -48,6 +50,7 @@ from ppes.serializers import (
     PPEUserStockSerializer, BulkPPEIssueSerializer, BulkPPERequestApprovalSerializer,
     PPEPurchaseReceiptSerializer
 )
+from ppes.services import bulk_issue_ppe, get_stock_positions, set_stock_level
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
@@ -69,16 +72,12 @@ class DocumentListCreateAPIView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Document.objects.all()
+        queryset = Document.objects.for_list()
         
-        # Handle search filtering
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search) |
-                Q(content__icontains=search)
-            )
+        # Handle search filtering (ranked, prefix-matched full-text search)
+        search_query = parse_query(self.request.query_params.get('search', None))
+        if search_query is not None:
+            queryset = search_queryset(queryset, search_query)
         
         # Handle category filtering (map folder value to document_type)
         category = self.request.query_params.get('category', None)
@@ -138,8 +137,8 @@ class DocumentFolderListCreateAPIView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        """Return all active folders, ordered by name."""
-        return DocumentFolder.objects.filter(is_active=True).order_by('name')
+        """Return all active folders with their document counts, ordered by name."""
+        return DocumentFolder.objects.filter(is_active=True).with_document_counts().order_by('name')
     
     def get_permissions(self):
         """Only HSSE Manager/Superadmin can create folders."""
@@ -168,7 +167,7 @@ class DocumentFolderRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyA
     Only HSSE Manager and Superadmins can update/delete.
     Folders can only be deleted if they are empty.
     """
-    queryset = DocumentFolder.objects.all()
+    queryset = DocumentFolder.objects.with_document_counts()
     serializer_class = DocumentFolderSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
@@ -191,7 +190,9 @@ class DocumentFolderRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyA
         user = self.request.user
         if not (user.position == 'HSSE MANAGER' or user.is_superuser):
             raise PermissionDenied("Only HSSE Managers and Superadmins can update folders.")
-        serializer.save()
+        folder = serializer.save()
+        # The annotated count belongs to the old value if the folder was remapped
+        folder.__dict__.pop('document_count', None)
     
     def perform_destroy(self, instance):
         """Validate permissions and ensure folder is empty before deletion."""
@@ -355,7 +356,7 @@ class CreateNewVersionAPIView(APIView):
 # Template Management Views
 # =============================
 class DocumentTemplateListCreateAPIView(generics.ListCreateAPIView):
-    queryset = DocumentTemplate.objects.filter(is_active=True)
+    queryset = DocumentTemplate.objects.filter(is_active=True).with_document_counts()
     serializer_class = DocumentTemplateSerializer
     
     def perform_create(self, serializer):
@@ -363,7 +364,7 @@ class DocumentTemplateListCreateAPIView(generics.ListCreateAPIView):
 
 
 class DocumentTemplateRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = DocumentTemplate.objects.all()
+    queryset = DocumentTemplate.objects.with_document_counts()
     serializer_class = DocumentTemplateSerializer
     
     def perform_update(self, serializer):
@@ -432,86 +433,89 @@ class DocumentDashboardAPIView(APIView):
 
     def get(self, request):
         try:
-            # Get basic document counts
-            total_documents = Document.objects.count()
-            
-            # Get documents by status
-            status_counts = Document.objects.values('status').annotate(count=Count('id'))
-            status_dict = {item['status']: item['count'] for item in status_counts}
-            
-            # Get documents by type
-            type_counts = Document.objects.values('document_type').annotate(count=Count('id'))
-            type_dict = {item['document_type']: item['count'] for item in type_counts}
-            
-            # Get change requests count
-            change_requests_count = ChangeRequest.objects.count()
-            
-            # Get recent activities (last 10 workflow entries)
-            recent_activities = ApprovalWorkflow.objects.select_related(
-                'document', 'performed_by'
-            ).order_by('-timestamp')[:10]
-            
-            # Format recent activities
-            activities = []
-            for activity in recent_activities:
-                activities.append({
-                    'id': activity.id,
-                    'document_title': activity.document.title,
-                    'action': activity.action,
-                    'performed_by': activity.performed_by.get_full_name() if activity.performed_by else 'System',
-                    'created_at': activity.timestamp,
-                    'comment': activity.comment
-                })
-            
-            # Calculate percentages for document types
-            document_types = {
-                'policy': type_dict.get('POLICY', 0),
-                'system_document': type_dict.get('SYSTEM DOCUMENT', 0),
-                'procedure': type_dict.get('PROCEDURE', 0),
-                'form': type_dict.get('FORM', 0),
-                'ssow': type_dict.get('SSOW', 0),
-                'other': type_dict.get('OTHER', 0)
-            }
-            
-            # Calculate status percentages
-            status_breakdown = {
-                'draft': status_dict.get('DRAFT', 0),
-                'hsse_review': status_dict.get('HSSE_REVIEW', 0),
-                'ops_review': status_dict.get('OPS_REVIEW', 0),
-                'md_approval': status_dict.get('MD_APPROVAL', 0),
-                'approved': status_dict.get('APPROVED', 0),
-                'rejected': status_dict.get('REJECTED', 0)
-            }
-            
-            # Calculate pending approvals (documents in review stages)
-            pending_approvals = (
-                status_dict.get('HSSE_REVIEW', 0) + 
-                status_dict.get('OPS_REVIEW', 0) + 
-                status_dict.get('MD_APPROVAL', 0)
-            )
-            
-            response_data = {
-                'metrics': {
-                    'total_documents': total_documents,
-                    'pending_approvals': pending_approvals,
-                    'change_requests': change_requests_count,
-                    'approved_documents': status_dict.get('APPROVED', 0),
-                    'rejected_documents': status_dict.get('REJECTED', 0),
-                    'draft_documents': status_dict.get('DRAFT', 0),
-                },
-                'document_types': document_types,
-                'status_breakdown': status_breakdown,
-                'recent_activities': activities
-            }
-            
-            return Response(response_data)
-            
+            return dashboard_cache.cached_response('documents', 'all', self.build_dashboard)
         except Exception as e:
             return Response(
                 {"error": f"Failed to fetch dashboard data: {str(e)}"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def build_dashboard(self):
+        """Compute the dashboard payload; served through the dashboard cache."""
+        # Get basic document counts
+        total_documents = Document.objects.count()
+        
+        # Get documents by status
+        status_counts = Document.objects.values('status').annotate(count=Count('id'))
+        status_dict = {item['status']: item['count'] for item in status_counts}
+        
+        # Get documents by type
+        type_counts = Document.objects.values('document_type').annotate(count=Count('id'))
+        type_dict = {item['document_type']: item['count'] for item in type_counts}
+        
+        # Get change requests count
+        change_requests_count = ChangeRequest.objects.count()
+        
+        # Get recent activities (last 10 workflow entries)
+        recent_activities = ApprovalWorkflow.objects.select_related(
+            'document', 'performed_by'
+        ).order_by('-timestamp')[:10]
+        
+        # Format recent activities
+        activities = []
+        for activity in recent_activities:
+            activities.append({
+                'id': activity.id,
+                'document_title': activity.document.title,
+                'action': activity.action,
+                'performed_by': activity.performed_by.get_full_name() if activity.performed_by else 'System',
+                'created_at': activity.timestamp,
+                'comment': activity.comment
+            })
+        
+        # Calculate percentages for document types
+        document_types = {
+            'policy': type_dict.get('POLICY', 0),
+            'system_document': type_dict.get('SYSTEM DOCUMENT', 0),
+            'procedure': type_dict.get('PROCEDURE', 0),
+            'form': type_dict.get('FORM', 0),
+            'ssow': type_dict.get('SSOW', 0),
+            'other': type_dict.get('OTHER', 0)
+        }
+        
+        # Calculate status percentages
+        status_breakdown = {
+            'draft': status_dict.get('DRAFT', 0),
+            'hsse_review': status_dict.get('HSSE_REVIEW', 0),
+            'ops_review': status_dict.get('OPS_REVIEW', 0),
+            'md_approval': status_dict.get('MD_APPROVAL', 0),
+            'approved': status_dict.get('APPROVED', 0),
+            'rejected': status_dict.get('REJECTED', 0)
+        }
+        
+        # Calculate pending approvals (documents in review stages)
+        pending_approvals = (
+            status_dict.get('HSSE_REVIEW', 0) + 
+            status_dict.get('OPS_REVIEW', 0) + 
+            status_dict.get('MD_APPROVAL', 0)
+        )
+        
+        response_data = {
+            'metrics': {
+                'total_documents': total_documents,
+                'pending_approvals': pending_approvals,
+                'change_requests': change_requests_count,
+                'approved_documents': status_dict.get('APPROVED', 0),
+                'rejected_documents': status_dict.get('REJECTED', 0),
+                'draft_documents': status_dict.get('DRAFT', 0),
+            },
+            'document_types': document_types,
+            'status_breakdown': status_breakdown,
+            'recent_activities': activities
+        }
+        
+        return response_data
+
 
 # =============================
 # Document Review Schedule Dashboard API View
@@ -740,7 +744,7 @@ class QuickReportViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         queryset = QuickReport.objects.all() if (user.position == 'HSSE MANAGER' or user.is_superuser) else QuickReport.objects.filter(reported_by=user)
-        return queryset.order_by('-created_at')
+        return queryset.select_related('reported_by', 'reviewed_by', 'created_record').order_by('-created_at')
 
     def perform_create(self, serializer):
         serializer.save(reported_by=self.request.user)
@@ -779,8 +783,15 @@ class QuickReportViewSet(viewsets.ModelViewSet):
     def statistics(self, request):
         """Get quick report statistics."""
         user = request.user
-        queryset = QuickReport.objects.all() if (user.position == 'HSSE MANAGER' or user.is_superuser) else QuickReport.objects.filter(reported_by=user)
-        
+        sees_all = user.position == 'HSSE MANAGER' or user.is_superuser
+        queryset = QuickReport.objects.all() if sees_all else QuickReport.objects.filter(reported_by=user)
+        return dashboard_cache.cached_response(
+            'quickreports',
+            dashboard_cache.scope_for(user, sees_all),
+            lambda: self._build_statistics(queryset)
+        )
+
+    def _build_statistics(self, queryset):
         stats = {
             'total': queryset.count(),
             'pending': queryset.filter(status='PENDING').count(),
@@ -800,7 +811,7 @@ class QuickReportViewSet(viewsets.ModelViewSet):
             },
         }
         
-        return Response(stats)
+        return stats
 
 
 # =================================
@@ -822,9 +833,28 @@ class RecordViewSet(viewsets.ModelViewSet):
     serializer_class = RecordSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_expand(self):
+        """Nested fields to render in full, from ``?expand=form_document,source_document``."""
+        requested = self.request.query_params.get('expand', '')
+        names = {name.strip() for name in requested.split(',')}
+        return sorted(names & set(RecordSerializer.EXPANDABLE_FIELDS))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
+
     def get_queryset(self):
         user = self.request.user
         queryset = Record.objects.all() if (user.position == 'HSSE MANAGER' or user.is_staff) else Record.objects.filter(submitted_by=user)
+        queryset = queryset.select_related(
+            'submitted_by', 'reviewed_by', 'locked_by', 'parent_record', 'form_document', 'source_document'
+        )
+        for name in self.get_expand():
+            # Everything the full DocumentSerializer reads
+            queryset = queryset.select_related(
+                f'{name}__created_by', f'{name}__verified_by', f'{name}__approved_by', f'{name}__obsoleted_by'
+            ).prefetch_related(f'{name}__tags', f'{name}__iso_clauses', f'{name}__distribution_list')
         
         # Filter by year
         year = self.request.query_params.get('year', None)
@@ -921,7 +951,7 @@ class LawCategoryRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIV
 
 # LawResource Views
 class LawResourceListCreateAPIView(generics.ListCreateAPIView):
-    queryset = LawResource.objects.all()
+    queryset = LawResource.objects.for_list()
     serializer_class = LawResourceSerializer
     permission_classes = [LegalCompliancePermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -1028,7 +1058,7 @@ class LegislationTrackerRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDest
 
 class PPECategoryListCreateAPIView(generics.ListCreateAPIView):
     """API endpoint for listing and creating PPE categories."""
-    queryset = PPECategory.objects.all()
+    queryset = PPECategory.objects.select_related('inventory')
     serializer_class = PPECategorySerializer
     permission_classes = [PPEManagementPermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -1082,7 +1112,9 @@ class VendorRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
 
 class PPEPurchaseListCreateAPIView(generics.ListCreateAPIView):
     """API endpoint for listing and creating PPE purchases."""
-    queryset = PPEPurchase.objects.all().order_by('-purchase_date')
+    queryset = PPEPurchase.objects.select_related(
+        'vendor', 'ppe_category', 'received_by'
+    ).order_by('-purchase_date')
     serializer_class = PPEPurchaseSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -1107,7 +1139,7 @@ class PPEPurchaseRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIV
 
 class PPEInventoryListAPIView(generics.ListAPIView):
     """API endpoint for listing PPE inventory."""
-    queryset = PPEInventory.objects.all()
+    queryset = PPEInventory.objects.select_related('ppe_category')
     serializer_class = PPEInventorySerializer
     permission_classes = [PPEManagementPermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -1121,10 +1153,24 @@ class PPEInventoryRetrieveUpdateAPIView(generics.RetrieveUpdateAPIView):
     serializer_class = PPEInventorySerializer
     permission_classes = [IsHSSEManager]
 
+    def perform_update(self, serializer):
+        # Stock counts are corrected through the ledger so rebuilds keep them;
+        # saving the instance would write back counters read before the lock
+        inventory = serializer.instance
+        if 'current_stock' in serializer.validated_data:
+            set_stock_level(
+                inventory.ppe_category_id,
+                serializer.validated_data['current_stock'],
+                created_by=self.request.user,
+            )
+        inventory.refresh_from_db()
+
 
 class PPEIssueListCreateAPIView(generics.ListCreateAPIView):
     """API endpoint for listing and creating PPE issues."""
-    queryset = PPEIssue.objects.all().order_by('-issue_date')
+    queryset = PPEIssue.objects.select_related(
+        'employee', 'ppe_category', 'issued_by'
+    ).order_by('-issue_date')
     serializer_class = PPEIssueSerializer
     permission_classes = [PPEManagementPermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -1145,7 +1191,9 @@ class PPEIssueMyIssuesAPIView(generics.ListAPIView):
 
     def get_queryset(self):
         """Filter to show only current user's PPE issues."""
-        return PPEIssue.objects.filter(employee=self.request.user).order_by('-issue_date')
+        return PPEIssue.objects.filter(employee=self.request.user).select_related(
+            'employee', 'ppe_category', 'issued_by'
+        ).order_by('-issue_date')
 
 
 class PPEIssueRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -1157,7 +1205,9 @@ class PPEIssueRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
 
 class PPERequestListCreateAPIView(generics.ListCreateAPIView):
     """API endpoint for listing and creating PPE requests."""
-    queryset = PPERequest.objects.all().order_by('-created_at')
+    queryset = PPERequest.objects.select_related(
+        'employee', 'ppe_category', 'approved_by'
+    ).order_by('-created_at')
     serializer_class = PPERequestSerializer
     permission_classes = [PPEManagementPermission]  # Allow regular users to create requests
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -1427,41 +1477,7 @@ class PPEStockPositionAPIView(APIView):
     permission_classes = [PPEManagementPermission]
 
     def get(self, request):
-        categories = PPECategory.objects.all()
-        stock_data = []
-        
-        for category in categories:
-            try:
-                inventory = category.inventory
-                total_received = PPEPurchase.objects.filter(
-                    ppe_category=category
-                ).aggregate(total=Sum('quantity'))['total'] or 0
-                
-                total_issued = PPEIssue.objects.filter(
-                    ppe_category=category
-                ).aggregate(total=Sum('quantity'))['total'] or 0
-                
-                total_damaged = PPEDamageReport.objects.filter(
-                    ppe_issue__ppe_category=category,
-                    is_approved=True
-                ).count()
-                
-                # Filter expired issues in Python since is_expired is a property
-                ppe_issues = PPEIssue.objects.filter(ppe_category=category)
-                total_expired = sum(1 for issue in ppe_issues if issue.is_expired)
-                
-                stock_data.append({
-                    'ppe_category': category,
-                    'total_received': total_received,
-                    'total_issued': total_issued,
-                    'total_damaged': total_damaged,
-                    'total_expired': total_expired,
-                    'current_stock': inventory.current_stock,
-                    'is_low_stock': inventory.is_low_stock
-                })
-            except PPEInventory.DoesNotExist:
-                continue
-        
+        stock_data = get_stock_positions()
         serializer = PPEStockPositionSerializer(stock_data, many=True, context={'request': request})
         return Response(serializer.data)
 
@@ -1668,40 +1684,28 @@ class BulkPPEIssueAPIView(APIView):
             
             try:
                 ppe_category = PPECategory.objects.get(id=ppe_category_id)
-                inventory = ppe_category.inventory
-                
-                # Check if there's enough stock
-                total_quantity_needed = len(employee_ids) * quantity_per_employee
-                if inventory.current_stock < total_quantity_needed:
-                    return Response({
-                        'error': f'Insufficient stock. Available: {inventory.current_stock}, Needed: {total_quantity_needed}'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Create PPE issues for each employee
-                created_issues = []
-                for employee_id in employee_ids:
-                    try:
-                        employee = User.objects.get(id=employee_id)
-                        issue = PPEIssue.objects.create(
-                            employee=employee,
-                            ppe_category=ppe_category,
-                            quantity=quantity_per_employee,
-                            issue_date=issue_date,
-                            expiry_date=ppe_category.calculate_expiry_date(),
-                            issued_by=request.user,
-                            notes=notes
-                        )
-                        created_issues.append(issue)
-                    except User.DoesNotExist:
-                        continue
-                
-                return Response({
-                    'message': f'Successfully issued PPE to {len(created_issues)} employees',
-                    'created_count': len(created_issues)
-                })
-                
             except PPECategory.DoesNotExist:
                 return Response({'error': 'PPE category not found'}, status=status.HTTP_404_NOT_FOUND)
+
+            try:
+                results = bulk_issue_ppe(
+                    ppe_category,
+                    employee_ids,
+                    quantity_per_employee,
+                    issue_date,
+                    issued_by=request.user,
+                    notes=notes
+                )
+            except ValidationError as e:
+                return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+            created_count = sum(1 for result in results if result['success'])
+            return Response({
+                'message': f'Successfully issued PPE to {created_count} employees',
+                'created_count': created_count,
+                'failed_count': len(results) - created_count,
+                'results': results
+            })
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -1876,6 +1880,7 @@ def system_info(request):
         'memory_available': psutil.virtual_memory().available,
         'disk_usage': psutil.disk_usage('/').percent,
         'environment': 'production' if not settings.DEBUG else 'development',
+        'dashboard_cache': dashboard_cache.stats(),
     }
     
     return Response(info, status=status.HTTP_200_OK)
@@ -1897,7 +1902,10 @@ from audits.serializers import (
     AuditReportSerializer, CAPAProgressUpdateSerializer, AuditMeetingSerializer,
     AuditCommentSerializer, AuditDashboardSerializer, BulkCAPAAssignSerializer
 )
-from datetime import datetime, timedelta
+from audits import template_cache
+from audits.clause_tree import get_clause_tree
+from audits.scoring import get_finding_score, get_finding_scores
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
 
@@ -1923,7 +1931,7 @@ class AuditChecklistTemplateListView(generics.ListAPIView):
     
     def get_queryset(self):
         """Get templates, optionally filter by audit type."""
-        queryset = AuditChecklistTemplate.objects.filter(is_active=True)
+        queryset = AuditChecklistTemplate.objects.filter(is_active=True).with_tree()
         
         audit_type_id = self.request.query_params.get('audit_type_id', None)
         if audit_type_id:
@@ -1933,11 +1941,25 @@ class AuditChecklistTemplateListView(generics.ListAPIView):
 
 
 class AuditChecklistTemplateDetailView(generics.RetrieveAPIView):
-    """Get detailed checklist template with all categories and questions."""
+    """
+    Get detailed checklist template with all categories and questions.
+
+    The rendered template is cached until a template, category or question
+    changes; the X-Template-Cache header reports HIT or MISS.
+    """
     serializer_class = AuditChecklistTemplateSerializer
     permission_classes = [AuditManagementPermission]
     queryset = AuditChecklistTemplate.objects.filter(is_active=True)
 
+    def retrieve(self, request, *args, **kwargs):
+        template = self.get_object()
+        payload, hit = template_cache.get_or_render(template, self.render)
+        return Response(payload, headers={'X-Template-Cache': 'HIT' if hit else 'MISS'})
+
+    def render(self, template):
+        template = self.get_queryset().with_tree().get(pk=template.pk)
+        return self.get_serializer(template).data
+
 
 class AuditScoringCriteriaListView(generics.ListAPIView):
     """List all active scoring criteria."""
@@ -1960,7 +1982,7 @@ class AuditScoreCalculationView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        score_data = finding.calculate_overall_score()
+        score_data = get_finding_score(finding)
         
         if score_data is None:
             return Response(
@@ -1971,6 +1993,31 @@ class AuditScoreCalculationView(APIView):
         return Response(score_data, status=status.HTTP_200_OK)
 
 
+class AuditPlanScoresView(APIView):
+    """Score every finding of an audit plan in one pass."""
+    permission_classes = [AuditManagementPermission]
+    
+    def get(self, request, pk):
+        """Return the score of each finding in the plan."""
+        audit_plan = get_object_or_404(AuditPlan, pk=pk)
+        findings = list(audit_plan.findings.only('id', 'finding_code', 'title'))
+        scores = get_finding_scores(findings)
+        
+        return Response({
+            'audit_plan': audit_plan.id,
+            'audit_code': audit_plan.audit_code,
+            'findings': [
+                {
+                    'finding_id': finding.id,
+                    'finding_code': finding.finding_code,
+                    'title': finding.title,
+                    'score': scores[finding.pk],
+                }
+                for finding in findings
+            ],
+        }, status=status.HTTP_200_OK)
+
+
 class AuditFindingPDFReportView(APIView):
     """Generate PDF report for an audit finding."""
     permission_classes = [AuditManagementPermission]
@@ -2023,6 +2070,14 @@ class ISOClause45001ListView(generics.ListCreateAPIView):
     ordering_fields = ['clause_number']
 
 
+class ISOClause45001TreeView(APIView):
+    """The whole ISO 45001 clause tree, flattened in clause order with depths and paths."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({'clauses': get_clause_tree().flatten()})
+
+
 class ISOClause45001DetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete ISO 45001 clause."""
     queryset = ISOClause45001.objects.all()
@@ -2049,11 +2104,11 @@ class AuditPlanListCreateView(generics.ListCreateAPIView):
         """Filter audits based on user role."""
         user = self.request.user
         if user.position == 'HSSE MANAGER' or user.is_staff:
-            return AuditPlan.objects.all()
+            return AuditPlan.objects.for_list()
         # Other users see audits they're part of
         return AuditPlan.objects.filter(
             Q(audit_team=user) | Q(lead_auditor=user)
-        ).distinct()
+        ).distinct().for_list()
     
     def perform_create(self, serializer):
         """Only HSSE Manager can create audits."""
@@ -2171,12 +2226,12 @@ class AuditFindingListCreateView(generics.ListCreateAPIView):
         """Filter findings based on user role."""
         user = self.request.user
         if user.position == 'HSSE MANAGER' or user.is_staff:
-            return AuditFinding.objects.all()
+            return AuditFinding.objects.for_list()
         # Other users see findings from their department
         return AuditFinding.objects.filter(
             Q(department_affected=user.department) |
             Q(audit_plan__audit_team=user)
-        ).distinct()
+        ).distinct().for_list()
     
     def perform_create(self, serializer):
         """Only HSSE Manager can create findings."""
@@ -2216,9 +2271,9 @@ class CAPAListCreateView(generics.ListCreateAPIView):
         """Filter CAPAs based on user role."""
         user = self.request.user
         if user.position == 'HSSE MANAGER' or user.is_staff:
-            return CAPA.objects.all()
+            return CAPA.objects.for_list()
         # Users see CAPAs assigned to them
-        return CAPA.objects.filter(responsible_person=user)
+        return CAPA.objects.filter(responsible_person=user).for_list()
     
     def perform_create(self, serializer):
         """Only HSSE Manager can create CAPAs."""
@@ -2385,10 +2440,19 @@ class AuditDashboardView(APIView):
     def get(self, request):
         """Get dashboard data."""
         user = request.user
+        sees_all = user.position == 'HSSE MANAGER' or user.is_staff
+        return dashboard_cache.cached_response(
+            'audits',
+            dashboard_cache.scope_for(user, sees_all),
+            lambda: self.build_dashboard(user, sees_all)
+        )
+
+    def build_dashboard(self, user, sees_all):
+        """Compute the dashboard payload; served through the dashboard cache."""
         current_year = datetime.now().year
         
         # Base querysets
-        if user.position == 'HSSE MANAGER' or user.is_staff:
+        if sees_all:
             audits = AuditPlan.objects.all()
             findings = AuditFinding.objects.all()
             capas = CAPA.objects.all()
@@ -2402,33 +2466,50 @@ class AuditDashboardView(APIView):
             ).distinct()
             capas = CAPA.objects.filter(responsible_person=user)
         
-        # Overall metrics
-        total_audits = audits.count()
-        audits_this_year = audits.filter(created_at__year=current_year).count()
-        completed_audits = audits.filter(status='COMPLETED').count()
-        in_progress_audits = audits.filter(status='IN_PROGRESS').count()
-        scheduled_audits = audits.filter(status='SCHEDULED').count()
+        # Overall metrics, one aggregate query per model
+        audit_counts = audits.aggregate(
+            total=Count('pk'),
+            this_year=Count('pk', filter=Q(created_at__year=current_year)),
+            completed=Count('pk', filter=Q(status='COMPLETED')),
+            in_progress=Count('pk', filter=Q(status='IN_PROGRESS')),
+            scheduled=Count('pk', filter=Q(status='SCHEDULED')),
+        )
+        total_audits = audit_counts['total']
+        audits_this_year = audit_counts['this_year']
+        completed_audits = audit_counts['completed']
+        in_progress_audits = audit_counts['in_progress']
+        scheduled_audits = audit_counts['scheduled']
         
         # Findings metrics
-        total_findings = findings.count()
-        open_findings = findings.exclude(status='CLOSED').count()
-        major_ncs = findings.filter(finding_type='MAJOR_NC').count()
-        minor_ncs = findings.filter(finding_type='MINOR_NC').count()
-        observations = findings.filter(finding_type='OBSERVATION').count()
+        finding_counts = findings.aggregate(
+            total=Count('pk'),
+            open=Count('pk', filter=~Q(status='CLOSED')),
+            major_ncs=Count('pk', filter=Q(finding_type='MAJOR_NC')),
+            minor_ncs=Count('pk', filter=Q(finding_type='MINOR_NC')),
+            observations=Count('pk', filter=Q(finding_type='OBSERVATION')),
+        )
+        total_findings = finding_counts['total']
+        open_findings = finding_counts['open']
+        major_ncs = finding_counts['major_ncs']
+        minor_ncs = finding_counts['minor_ncs']
+        observations = finding_counts['observations']
         
         # CAPA metrics
-        total_capas = capas.count()
-        open_capas = capas.exclude(status='CLOSED').count()
-        overdue_capas = sum(1 for capa in capas if capa.is_overdue)
-        closed_capas = capas.filter(status='CLOSED').count()
+        capa_counts = capas.aggregate(
+            total=Count('pk'),
+            open=Count('pk', filter=~Q(status='CLOSED')),
+            overdue=Count('pk', filter=capas.overdue_condition()),
+            closed=Count('pk', filter=Q(status='CLOSED')),
+        )
+        total_capas = capa_counts['total']
+        open_capas = capa_counts['open']
+        overdue_capas = capa_counts['overdue']
+        closed_capas = capa_counts['closed']
         capa_completion_rate = (closed_capas / total_capas * 100) if total_capas > 0 else 0
         
         # Compliance scoring
         reports = AuditReport.objects.filter(audit_plan__in=audits, status='APPROVED')
-        if reports.exists():
-            avg_score = reports.aggregate(avg=Avg('overall_conformity_score'))['avg'] or 0
-        else:
-            avg_score = 0
+        avg_score = reports.aggregate(avg=Avg('overall_conformity_score'))['avg'] or 0
         
         # Compliance trend (last 6 months)
         six_months_ago = timezone.now() - timedelta(days=180)
@@ -2442,10 +2523,12 @@ class AuditDashboardView(APIView):
         ]
         
         # Findings by ISO clause
-        findings_by_clause = {}
-        for finding in findings:
-            clause = finding.iso_clause.clause_number
-            findings_by_clause[clause] = findings_by_clause.get(clause, 0) + 1
+        findings_by_clause = {
+            row['iso_clause__clause_number']: row['count']
+            for row in findings.order_by().values('iso_clause__clause_number').annotate(
+                count=Count('pk', distinct=True)
+            )
+        }
         
         # Compliance by clause (from latest reports)
         compliance_by_clause = {}
@@ -2457,13 +2540,13 @@ class AuditDashboardView(APIView):
         upcoming_audits = audits.filter(
             status__in=['SCHEDULED', 'IN_PROGRESS'],
             planned_start_date__gte=datetime.now().date()
-        ).order_by('planned_start_date')[:5]
+        ).for_list().order_by('planned_start_date')[:5]
         
         # Recent findings
-        recent_findings = findings.order_by('-identified_date')[:10]
+        recent_findings = findings.for_list().order_by('-identified_date')[:10]
         
         # Overdue CAPAs list
-        overdue_capas_list = [capa for capa in capas if capa.is_overdue][:10]
+        overdue_capas_list = capas.overdue().for_list()[:10]
         
         dashboard_data = {
             'total_audits': total_audits,
@@ -2494,7 +2577,7 @@ class AuditDashboardView(APIView):
             'overdue_capas_list': CAPAListSerializer(overdue_capas_list, many=True).data,
         }
         
-        return Response(dashboard_data, status=status.HTTP_200_OK)
+        return dashboard_data
 
 
 # CAPA Bulk Operations
@@ -2556,7 +2639,7 @@ class MyCAPAsView(generics.ListAPIView):
     
     def get_queryset(self):
         """Get CAPAs for current user."""
-        return CAPA.objects.filter(responsible_person=self.request.user)
+        return CAPA.objects.filter(responsible_person=self.request.user).for_list()
 
 
 # Email Notification Views
@@ -2566,15 +2649,27 @@ from audits.services import (
     send_finding_notification,
     send_audit_completion_notification
 )
+from mailer.models import EmailBatch
+from mailer.serializers import EmailBatchSerializer
+
+
+def queued_notification_response(batch, message):
+    """202 with the queued email batch; poll email-batch-detail for delivery status."""
+    return Response({
+        'message': message,
+        'job_id': batch.pk,
+        'status': batch.status,
+        'recipients_count': sum(len(email.to) for email in batch.messages.all()),
+    }, status=status.HTTP_202_ACCEPTED)
 
 
 class SendAuditPlanNotificationView(APIView):
-    """Send audit plan notification email to specified recipients."""
+    """Queue audit plan notification email to specified recipients."""
     permission_classes = [IsHSSEManager]
     
     def post(self, request, pk):
         """
-        Send audit plan notification.
+        Queue audit plan notification.
         
         Request body:
         {
@@ -2610,14 +2705,11 @@ class SendAuditPlanNotificationView(APIView):
         
         additional_message = request.data.get('additional_message', '')
         
-        # Send notification
-        count = send_audit_plan_notification(audit_plan, recipients, additional_message)
+        # Queue notification
+        batch = send_audit_plan_notification(audit_plan, recipients, additional_message)
         
-        if count > 0:
-            return Response({
-                'message': f'Audit plan notification sent to {count} recipient(s)',
-                'recipients_count': count
-            }, status=status.HTTP_200_OK)
+        if batch:
+            return queued_notification_response(batch, 'Audit plan notification queued')
         else:
             return Response({
                 'error': 'Failed to send notifications. No valid recipients found.'
@@ -2625,11 +2717,11 @@ class SendAuditPlanNotificationView(APIView):
 
 
 class SendCAPANotificationView(APIView):
-    """Send CAPA assignment notification."""
+    """Queue CAPA assignment notification."""
     permission_classes = [IsHSSEManager]
     
     def post(self, request, pk):
-        """Send CAPA assignment notification to responsible person."""
+        """Queue CAPA assignment notification to responsible person."""
         try:
             capa = CAPA.objects.get(pk=pk)
         except CAPA.DoesNotExist:
@@ -2638,12 +2730,12 @@ class SendCAPANotificationView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        success = send_capa_assignment_notification(capa)
+        batch = send_capa_assignment_notification(capa)
         
-        if success:
-            return Response({
-                'message': f'CAPA notification sent to {capa.responsible_person.get_full_name}'
-            }, status=status.HTTP_200_OK)
+        if batch:
+            return queued_notification_response(
+                batch, f'CAPA notification queued for {capa.responsible_person.get_full_name}'
+            )
         else:
             return Response({
                 'error': 'Failed to send CAPA notification'
@@ -2651,11 +2743,11 @@ class SendCAPANotificationView(APIView):
 
 
 class SendFindingNotificationView(APIView):
-    """Send finding notification to department and HSSE Manager."""
+    """Queue finding notification to department and HSSE Manager."""
     permission_classes = [IsHSSEManager]
     
     def post(self, request, pk):
-        """Send finding notification."""
+        """Queue finding notification."""
         try:
             finding = AuditFinding.objects.get(pk=pk)
         except AuditFinding.DoesNotExist:
@@ -2664,18 +2756,23 @@ class SendFindingNotificationView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        success = send_finding_notification(finding)
+        batch = send_finding_notification(finding)
         
-        if success:
-            return Response({
-                'message': 'Finding notification sent successfully'
-            }, status=status.HTTP_200_OK)
+        if batch:
+            return queued_notification_response(batch, 'Finding notification queued successfully')
         else:
             return Response({
                 'error': 'Failed to send finding notification'
             }, status=status.HTTP_400_BAD_REQUEST)
 
 
+class EmailBatchDetailView(generics.RetrieveAPIView):
+    """Delivery status of a queued notification email batch."""
+    queryset = EmailBatch.objects.prefetch_related('messages')
+    serializer_class = EmailBatchSerializer
+    permission_classes = [IsHSSEManager]
+
+
 # ===========================================
 # Company Settings Views
 # ===========================================
@@ -2717,7 +2814,8 @@ class CompanySettingsView(APIView):
 # ===========================================
 from risks.models import (
     RiskAssessment, RiskHazard, RiskExposure, ControlBarrier,
-    RiskTreatmentAction, RiskReview, RiskAttachment, RiskMatrixConfig
+    RiskTreatmentAction, RiskReview, RiskAttachment, RiskMatrixConfig,
+    RiskAssessmentQuerySet
 )
 from risks.serializers import (
     RiskAssessmentListSerializer, RiskAssessmentDetailSerializer,
@@ -2725,10 +2823,8 @@ from risks.serializers import (
     RiskTreatmentActionSerializer, RiskReviewSerializer,
     RiskAttachmentSerializer, RiskMatrixConfigSerializer
 )
-from django.http import HttpResponse
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from risks import register_export
 
 
 class RiskMatrixConfigView(APIView):
@@ -2768,13 +2864,8 @@ class RiskAssessmentListCreateView(generics.ListCreateAPIView):
         
         # Filter by risk level
         risk_level = self.request.query_params.get('risk_level')
-        if risk_level:
-            if risk_level == 'LOW':
-                queryset = [ra for ra in queryset if ra.residual_risk_level <= 5]
-            elif risk_level == 'MEDIUM':
-                queryset = [ra for ra in queryset if 6 <= ra.residual_risk_level <= 12]
-            elif risk_level == 'HIGH':
-                queryset = [ra for ra in queryset if ra.residual_risk_level >= 15]
+        if risk_level in RiskAssessmentQuerySet.RATINGS:
+            queryset = queryset.by_rating(risk_level)
         
         # Filter by location
         location = self.request.query_params.get('location')
@@ -2825,42 +2916,38 @@ class RiskDashboardView(APIView):
     permission_classes = [RiskManagementPermission]  # Dashboard access control
     
     def get(self, request):
-        from django.db.models import Count, Q
-        
+        return dashboard_cache.cached_response('risks', 'all', self.build_dashboard)
+
+    def build_dashboard(self):
+        """Compute the dashboard payload; served through the dashboard cache."""
         # Total counts
         total_assessments = RiskAssessment.objects.count()
         active_assessments = RiskAssessment.objects.filter(status='ACTIVE').count()
         
         # Risk level distribution
         risk_assessments = RiskAssessment.objects.filter(status__in=['APPROVED', 'ACTIVE'])
-        
-        low_risk = sum(1 for ra in risk_assessments if ra.residual_risk_level <= 5)
-        medium_risk = sum(1 for ra in risk_assessments if 6 <= ra.residual_risk_level <= 12)
-        high_risk = sum(1 for ra in risk_assessments if ra.residual_risk_level >= 15)
+        distribution = risk_assessments.rating_distribution()
+        low_risk = distribution['low']
+        medium_risk = distribution['medium']
+        high_risk = distribution['high']
         
         # Overdue reviews
-        overdue_reviews = sum(1 for ra in risk_assessments if ra.is_overdue_for_review)
+        overdue_reviews = risk_assessments.overdue_for_review().count()
         
         # Risk by category
-        by_category = {}
-        for category, _ in RiskAssessment.RISK_CATEGORY_CHOICES:
-            count = RiskAssessment.objects.filter(
-                risk_category=category,
-                status__in=['APPROVED', 'ACTIVE']
-            ).count()
-            by_category[category] = count
+        by_category = dict.fromkeys((category for category, _ in RiskAssessment.RISK_CATEGORY_CHOICES), 0)
+        by_category.update(
+            risk_assessments.order_by().values('risk_category').annotate(
+                count=Count('id')
+            ).values_list('risk_category', 'count')
+        )
         
         # Pending actions
-        pending_actions = RiskTreatmentAction.objects.filter(
-            status__in=['PLANNED', 'IN_PROGRESS']
-        ).count()
-        
-        overdue_actions = sum(
-            1 for action in RiskTreatmentAction.objects.filter(status__in=['PLANNED', 'IN_PROGRESS'])
-            if action.is_overdue
-        )
+        open_actions = RiskTreatmentAction.objects.filter(status__in=['PLANNED', 'IN_PROGRESS'])
+        pending_actions = open_actions.count()
+        overdue_actions = open_actions.filter(target_date__lt=date.today()).count()
         
-        return Response({
+        return {
             'total_assessments': total_assessments,
             'active_assessments': active_assessments,
             'risk_distribution': {
@@ -2872,152 +2959,45 @@ class RiskDashboardView(APIView):
             'by_category': by_category,
             'pending_actions': pending_actions,
             'overdue_actions': overdue_actions,
-        })
+        }
 
 
 class RiskExcelExportView(APIView):
     """Export risk assessments to Excel."""
     permission_classes = [RiskManagementPermission]  # Export access control
     
+    def get_export_queryset(self, request):
+        """Register rows selected by the status, category and risk_level filters."""
+        risk_level = request.query_params.get('risk_level')
+        return register_export.risk_register_queryset(
+            status=request.query_params.get('status'),
+            category=request.query_params.get('category'),
+            risk_level=risk_level if risk_level in RiskAssessmentQuerySet.RATINGS else None,
+        )
+    
     def get(self, request):
         """Export all or filtered risk assessments to Excel."""
-        from datetime import datetime
-        
-        # Get filter parameters
-        status_filter = request.query_params.get('status')
-        category_filter = request.query_params.get('category')
-        
-        queryset = RiskAssessment.objects.all().select_related(
-            'assessed_by', 'risk_owner'
-        ).prefetch_related('hazards', 'barriers', 'treatment_actions')
-        
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        if category_filter:
-            queryset = queryset.filter(risk_category=category_filter)
-        
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Risk Register"
-        
-        # Header styling
-        header_fill = PatternFill(start_color="0052D4", end_color="0052D4", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True, size=11)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
+        spool = register_export.xlsx_tempfile(self.get_export_queryset(request))
+        filename = f'Risk_Register_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+        return FileResponse(
+            spool,
+            as_attachment=True,
+            filename=filename,
+            content_type=register_export.XLSX_CONTENT_TYPE,
         )
-        
-        # Define headers
-        headers = [
-            'Event Number', 'Status', 'Location', 'Process Area', 'Activity Type',
-            'Risk Category', 'Hazard Type', 'Hazard Description', 'Event Description',
-            'Causes', 'Consequences', 'Initial Prob', 'Initial Sev', 'Initial Risk',
-            'Initial Rating', 'Preventive Barriers', 'Protective Barriers',
-            'Residual Prob', 'Residual Sev', 'Residual Risk', 'Residual Rating',
-            'Risk Acceptable', 'ALARP Required', 'Additional Actions',
-            'Person Responsible', 'Target Date', 'Assessed By', 'Assessment Date',
-            'Next Review', 'Comments'
-        ]
-        
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = border
-        
-        # Write data
-        row = 2
-        for ra in queryset:
-            hazards = ra.hazards.all()
-            hazard = hazards.first() if hazards.exists() else None
-            
-            preventive_barriers = "; ".join([
-                b.description for b in ra.barriers.filter(barrier_type='PREVENTIVE')
-            ])
-            protective_barriers = "; ".join([
-                b.description for b in ra.barriers.filter(barrier_type='PROTECTIVE')
-            ])
-            additional_actions = "; ".join([
-                a.action_description for a in ra.treatment_actions.all()
-            ])
-            
-            data = [
-                ra.event_number,
-                ra.status,
-                ra.location,
-                ra.process_area,
-                ra.get_activity_type_display(),
-                ra.get_risk_category_display(),
-                hazard.get_hazard_type_display() if hazard else '',
-                hazard.hazard_description if hazard else '',
-                hazard.event_description if hazard else '',
-                hazard.causes if hazard else '',
-                hazard.consequences if hazard else '',
-                ra.initial_probability,
-                ra.initial_severity,
-                ra.initial_risk_level,
-                ra.initial_risk_rating,
-                preventive_barriers,
-                protective_barriers,
-                ra.residual_probability,
-                ra.residual_severity,
-                ra.residual_risk_level,
-                ra.residual_risk_rating,
-                'Yes' if ra.risk_acceptable else 'No',
-                'Yes' if ra.alarp_required else 'No',
-                additional_actions,
-                ra.risk_owner.get_full_name if ra.risk_owner else '',
-                ra.next_review_date,
-                ra.assessed_by.get_full_name if ra.assessed_by else '',
-                ra.assessment_date,
-                ra.next_review_date,
-                ra.comments,
-            ]
-            
-            for col, value in enumerate(data, 1):
-                cell = ws.cell(row=row, column=col, value=value)
-                cell.border = border
-                cell.alignment = Alignment(vertical='top', wrap_text=True)
-                
-                # Color code risk levels
-                if col == 14:  # Initial risk level
-                    cell.fill = PatternFill(
-                        start_color=ra.initial_risk_color.replace('#', ''),
-                        end_color=ra.initial_risk_color.replace('#', ''),
-                        fill_type="solid"
-                    )
-                    cell.font = Font(color="FFFFFF", bold=True)
-                elif col == 20:  # Residual risk level
-                    cell.fill = PatternFill(
-                        start_color=ra.residual_risk_color.replace('#', ''),
-                        end_color=ra.residual_risk_color.replace('#', ''),
-                        fill_type="solid"
-                    )
-                    cell.font = Font(color="FFFFFF", bold=True)
-            
-            row += 1
-        
-        # Auto-size columns
-        for col in range(1, len(headers) + 1):
-            ws.column_dimensions[get_column_letter(col)].width = 20
-        
-        # Freeze header row
-        ws.freeze_panes = 'A2'
-        
-        # Create response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class RiskCSVExportView(RiskExcelExportView):
+    """Export risk assessments to CSV, streamed row by row."""
+    
+    def get(self, request):
+        """Export all or filtered risk assessments to CSV."""
+        response = StreamingHttpResponse(
+            register_export.iter_csv(self.get_export_queryset(request)),
+            content_type='text/csv',
         )
-        filename = f'Risk_Register_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+        filename = f'Risk_Register_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        
-        wb.save(response)
         return response
 
 
@@ -3031,3 +3011,120 @@ class MyRiskAssessmentsView(generics.ListAPIView):
         return RiskAssessment.objects.filter(
             Q(assessed_by=user) | Q(risk_owner=user)
         ).select_related('assessed_by', 'risk_owner').prefetch_related('hazards', 'barriers')
+
+
+# ===========================================
+# EXPORT JOB VIEWS
+# ===========================================
+from exports.models import ExportJob
+from exports.serializers import ExportJobSerializer, ExportJobCreateSerializer
+from exports.services import create_export_job
+
+
+class ExportJobQuerysetMixin:
+    """Jobs visible to the current user: their own, or all for superusers."""
+    
+    def get_queryset(self):
+        queryset = ExportJob.objects.select_related('requested_by')
+        if self.request.user.is_superuser:
+            return queryset
+        return queryset.filter(requested_by=self.request.user)
+
+
+class ExportJobListCreateView(ExportJobQuerysetMixin, generics.ListAPIView):
+    """List the user's export jobs or queue a new one."""
+    serializer_class = ExportJobSerializer
+    permission_classes = [ExportJobPermission]
+    
+    def post(self, request):
+        """Queue an export; poll the returned job until it completes."""
+        serializer = ExportJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = create_export_job(
+            request.user,
+            serializer.validated_data['export_type'],
+            serializer.validated_data['parameters'],
+        )
+        return Response(
+            ExportJobSerializer(job, context={'request': request}).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class ExportJobDetailView(ExportJobQuerysetMixin, generics.RetrieveDestroyAPIView):
+    """Poll an export job's status and progress, or delete it."""
+    serializer_class = ExportJobSerializer
+    permission_classes = [ExportJobPermission]
+    
+    def perform_destroy(self, instance):
+        if instance.result_file:
+            instance.result_file.delete(save=False)
+        instance.delete()
+
+
+class ExportJobDownloadView(ExportJobQuerysetMixin, generics.GenericAPIView):
+    """Download the file produced by a completed export job."""
+    permission_classes = [ExportJobPermission]
+    
+    def get(self, request, pk):
+        job = self.get_object()
+        
+        if job.status != 'COMPLETED':
+            return Response(
+                {'error': f'Export is not ready (status: {job.status})'},
+                status=status.HTTP_409_CONFLICT
+            )
+        if not job.is_downloadable:
+            return Response(
+                {'error': 'Export has expired'},
+                status=status.HTTP_410_GONE
+            )
+        
+        return FileResponse(
+            job.result_file.open('rb'),
+            as_attachment=True,
+            filename=os.path.basename(job.result_file.name),
+        )
+
+
+# ===========================================
+# SEARCH VIEWS
+# ===========================================
+from rest_framework.pagination import PageNumberPagination
+from search.services import SEARCH_MODULES, search_all, with_snippets
+
+
+class SearchPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search across documents, records, laws and quick reports.
+    
+    Query params: q (words are prefix matched), modules (comma separated,
+    default all), page, page_size.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        modules = request.query_params.get('modules')
+        if modules:
+            modules = [module.strip() for module in modules.split(',') if module.strip()]
+            unknown = sorted(set(modules) - set(SEARCH_MODULES))
+            if unknown:
+                return Response(
+                    {'error': f"Unknown search modules: {', '.join(unknown)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        hits = search_all(text, request.user, modules=modules or None)
+        if hits is None:
+            return Response({'count': 0, 'next': None, 'previous': None, 'results': []})
+        
+        paginator = SearchPagination()
+        page = paginator.paginate_queryset(hits, request, view=self)
+        return paginator.get_paginated_response(with_snippets(page, text))
@@ -6,7 +6,8 @@ from audits.models import (
     AuditScoringCriteria, AuditType, AuditChecklistTemplate, AuditChecklistCategory, 
     AuditChecklistQuestion, AuditQuestionResponse, ISOClause45001, AuditPlan, 
     AuditChecklist, AuditChecklistResponse, AuditFinding, CAPA, AuditEvidence, 
-    AuditReport, CAPAProgressUpdate, AuditMeeting, AuditComment, CompanySettings
+    AuditReport, CAPAProgressUpdate, AuditMeeting, AuditComment, CompanySettings,
+    AuditFindingScore
 )
 
 
@@ -181,6 +182,22 @@ class AuditQuestionResponseAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(AuditFindingScore)
+class AuditFindingScoreAdmin(admin.ModelAdmin):
+    """Read-only admin for stored finding scores."""
+    
+    list_display = ['finding', 'overall_score', 'grade', 'total_questions_answered', 'computed_at']
+    list_filter = ['grade', 'computed_at']
+    search_fields = ['finding__finding_code']
+    readonly_fields = [
+        'finding', 'template', 'overall_score', 'grade', 'color',
+        'category_scores', 'total_questions_answered', 'computed_at',
+    ]
+    
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(ISOClause45001)
 class ISOClause45001Admin(admin.ModelAdmin):
     """Admin for ISO 45001 clauses."""
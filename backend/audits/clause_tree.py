@@ -0,0 +1,147 @@
+"""
+In-memory ISO 45001 clause tree.
+
+Every clause is loaded in a single query and the tree (children and
+materialized ``4 > 4.1 > 4.1.1`` paths) is built in Python, so serializing
+nested sub-clauses and full paths costs no queries per node.
+
+The tree is cached per process. Saving or deleting a clause bumps a
+generation number in the shared Django cache, and each process rebuilds
+its copy when it sees a generation it has not built.
+"""
+import logging
+import threading
+
+from audits.models import ISOClause45001
+from core.cache_generation import GenerationKey
+
+logger = logging.getLogger(__name__)
+
+GENERATION = GenerationKey('audits:clause_tree:generation')
+
+NODE_FIELDS = [
+    'id', 'clause_number', 'title', 'description', 'parent_clause',
+    'requirements', 'is_mandatory', 'risk_category', 'guidance_notes',
+]
+
+_lock = threading.Lock()
+_cached = None
+
+
+class ClauseTree:
+    """Clauses keyed by id, with children in clause number order and full paths."""
+
+    def __init__(self, rows, generation=None):
+        self.generation = generation
+        self.nodes = {}
+        self.children = {}
+        self.roots = []
+        for row in rows:
+            node = dict(row)
+            node['parent_clause'] = node.pop('parent_clause_id')
+            self.nodes[node['id']] = node
+            self.children[node['id']] = []
+
+        for node in self.nodes.values():
+            parent_id = node['parent_clause']
+            if parent_id in self.children:
+                self.children[parent_id].append(node['id'])
+            else:
+                self.roots.append(node['id'])
+
+        self.paths = {}
+        self.depths = {}
+        stack = [(clause_id, None, 0) for clause_id in reversed(self.roots)]
+        while stack:
+            clause_id, parent_path, depth = stack.pop()
+            number = self.nodes[clause_id]['clause_number']
+            self.paths[clause_id] = number if parent_path is None else f'{parent_path} > {number}'
+            self.depths[clause_id] = depth
+            stack.extend(
+                (child_id, self.paths[clause_id], depth + 1)
+                for child_id in reversed(self.children[clause_id])
+            )
+
+    def __contains__(self, clause_id):
+        return clause_id in self.nodes
+
+    def path(self, clause_id):
+        """Full path of a clause, e.g. ``4 > 4.1 > 4.1.1``."""
+        return self.paths.get(clause_id)
+
+    def sub_clauses(self, clause_id):
+        """Serialized children of a clause, nested all the way down."""
+        return [self.payload(child_id) for child_id in self.children.get(clause_id, [])]
+
+    def payload(self, clause_id):
+        """A clause as ISOClause45001Serializer renders it, built from the tree."""
+        return {
+            **self.nodes[clause_id],
+            'sub_clauses': self.sub_clauses(clause_id),
+            'full_path': self.paths.get(clause_id),
+        }
+
+    def flatten(self):
+        """Every clause in depth-first clause number order, with its depth and path."""
+        flat = []
+        stack = list(reversed(self.roots))
+        while stack:
+            clause_id = stack.pop()
+            node = self.nodes[clause_id]
+            flat.append({
+                'id': clause_id,
+                'clause_number': node['clause_number'],
+                'title': node['title'],
+                'parent_clause': node['parent_clause'],
+                'is_mandatory': node['is_mandatory'],
+                'risk_category': node['risk_category'],
+                'depth': self.depths[clause_id],
+                'full_path': self.paths[clause_id],
+                'children': list(self.children[clause_id]),
+            })
+            stack.extend(reversed(self.children[clause_id]))
+        return flat
+
+
+def _generation():
+    try:
+        return GENERATION.get()
+    except Exception as e:
+        logger.warning(f"Clause tree generation unavailable: {e}")
+        return None
+
+
+def load_clause_tree(generation=None):
+    """Build a ClauseTree from a single query over every clause."""
+    rows = ISOClause45001.objects.order_by('clause_number').values(
+        *[field for field in NODE_FIELDS if field != 'parent_clause'], 'parent_clause_id'
+    )
+    return ClauseTree(rows, generation)
+
+
+def get_clause_tree(clause_id=None):
+    """
+    The process-wide clause tree, rebuilt when the generation has moved on.
+
+    Passing ``clause_id`` rebuilds a tree that does not contain that clause,
+    which covers clauses written before this process saw the invalidation.
+    """
+    global _cached
+    generation = _generation()
+    tree = _cached
+    if (
+        tree is None or generation is None or tree.generation != generation
+        or (clause_id is not None and clause_id not in tree)
+    ):
+        with _lock:
+            tree = load_clause_tree(generation)
+            if generation is not None:
+                _cached = tree
+    return tree
+
+
+def invalidate():
+    """Make every process rebuild its clause tree on next use, and again once the change commits."""
+    global _cached
+    _cached = None
+    GENERATION.bump_on_commit()
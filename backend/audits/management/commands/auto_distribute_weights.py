@@ -2,6 +2,7 @@
 Management command to automatically distribute weights equally across categories and questions.
 """
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from audits.models import AuditChecklistTemplate, AuditChecklistCategory, AuditChecklistQuestion
 from decimal import Decimal
 
@@ -9,6 +10,8 @@ from decimal import Decimal
 class Command(BaseCommand):
     help = 'Automatically distribute weights equally across all categories and questions'
 
+    # One transaction, so stored finding scores are refreshed once when it commits
+    @transaction.atomic
     def handle(self, *args, **kwargs):
         templates = AuditChecklistTemplate.objects.filter(is_active=True)
         
@@ -45,6 +48,7 @@ class Command(BaseCommand):
                 f'\n\n  All categories weighted equally within template'
                 f'\n  All questions weighted equally within category'
                 f'\n  You can manually adjust weights in admin if needed'
+                f'\n  Stored finding scores are refreshed automatically'
             )
         )
 
@@ -1,65 +1,36 @@
 """
 Management command to send CAPA deadline reminders.
-Run daily via cron or Celery Beat.
+Runs daily via Celery Beat (audits.tasks.send_capa_reminders) or cron.
 """
 from django.core.management.base import BaseCommand
-from audits.models import CAPA
-from audits.services import send_capa_deadline_approaching, send_capa_overdue_reminder
-from datetime import date
+from audits.services import send_capa_reminder_digests
 
 
 class Command(BaseCommand):
-    help = 'Send reminder emails for CAPAs approaching deadline or overdue'
+    help = 'Send one reminder digest per person for CAPAs approaching deadline or overdue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--due-within', type=int, default=7,
+            help='Include CAPAs due within this many days (default: 7)'
+        )
+
+    def handle(self, *args, **options):
+        summary = send_capa_reminder_digests(options['due_within'])
+
+        if not summary['digests']:
+            self.stdout.write(
+                self.style.SUCCESS('✅ No reminders needed - all CAPAs on track or already reminded today!')
+            )
+            return
 
-    def handle(self, *args, **kwargs):
-        # Get all active CAPAs
-        capas = CAPA.objects.filter(
-            status__in=['ASSIGNED', 'ACKNOWLEDGED', 'IN_PROGRESS']
-        ).select_related('responsible_person', 'assigned_by', 'finding')
-        
-        sent_count = 0
-        overdue_count = 0
-        due_soon_count = 0
-        
-        for capa in capas:
-            # Check if overdue
-            if capa.is_overdue:
-                if send_capa_overdue_reminder(capa):
-                    sent_count += 1
-                    overdue_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(f'🚨 Overdue reminder: {capa.action_code} ({capa.days_overdue} days overdue)')
-                    )
-            
-            # Check if due within 7 days
-            elif capa.days_remaining <= 7:
-                if send_capa_deadline_approaching(capa, capa.days_remaining):
-                    sent_count += 1
-                    due_soon_count += 1
-                    self.stdout.write(
-                        self.style.WARNING(f'⏰ Due soon reminder: {capa.action_code} ({capa.days_remaining} days remaining)')
-                    )
-            
-            # Check if due within 1 day (urgent)
-            elif capa.days_remaining == 1:
-                if send_capa_deadline_approaching(capa, 1):
-                    sent_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(f'🚨 URGENT: {capa.action_code} (due tomorrow!)')
-                    )
-        
         self.stdout.write(
             self.style.SUCCESS(
                 f'\n📧 CAPA Reminder Summary:'
-                f'\n   Total reminders sent: {sent_count}'
-                f'\n   Overdue reminders: {overdue_count}'
-                f'\n   Due soon reminders: {due_soon_count}'
+                f'\n   Digests queued: {summary["digests"]}'
+                f'\n   Overdue CAPAs: {summary["overdue"]}'
+                f'\n   Due soon CAPAs: {summary["due_soon"]}'
+                f'\n   Email batch: {summary["batch"].pk}'
                 f'\n\n✅ Reminder job complete!'
             )
         )
-        
-        if sent_count == 0:
-            self.stdout.write(
-                self.style.SUCCESS('✅ No reminders needed - all CAPAs on track!')
-            )
-
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0010_add_company_settings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditFindingScore',
+            fields=[
+                ('finding', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_snapshot', serialize=False, to='audits.auditfinding')),
+                ('overall_score', models.FloatField()),
+                ('grade', models.CharField(max_length=20)),
+                ('color', models.CharField(max_length=10)),
+                ('category_scores', models.JSONField(default=list, help_text='Per-category breakdown: category_id, name, score, weight, weighted_contribution')),
+                ('total_questions_answered', models.IntegerField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('template', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='score_snapshots', to='audits.auditchecklisttemplate')),
+            ],
+            options={
+                'verbose_name': 'Audit Finding Score',
+                'verbose_name_plural': 'Audit Finding Scores',
+                'indexes': [models.Index(fields=['grade', 'computed_at'], name='audits_audi_grade_1f1556_idx'), models.Index(fields=['overall_score'], name='audits_audi_overall_f7ac13_idx')],
+            },
+        ),
+    ]
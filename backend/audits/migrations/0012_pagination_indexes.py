@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0011_finding_score_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditfinding',
+            index=models.Index(fields=['-identified_date', '-severity'], name='finding_identified_idx'),
+        ),
+    ]
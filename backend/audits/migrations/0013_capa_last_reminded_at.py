@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audits', '0012_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='capa',
+            name='last_reminded_at',
+            field=models.DateTimeField(blank=True, help_text='When the last deadline reminder digest included this CAPA', null=True),
+        ),
+    ]
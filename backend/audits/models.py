@@ -7,7 +7,8 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
-from datetime import timedelta, date
+from datetime import datetime, time, timedelta, date
+from sequences.services import next_code
 
 User = get_user_model()
 
@@ -72,6 +73,19 @@ class AuditType(models.Model):
 # =============================
 # Audit Checklist Templates
 # =============================
+class AuditChecklistTemplateQuerySet(models.QuerySet):
+    """Checklist template querysets prepared for the template serializer."""
+    
+    def with_tree(self):
+        """Load the audit type and prefetch every category with its questions."""
+        return self.select_related('audit_type').prefetch_related(
+            models.Prefetch(
+                'categories',
+                queryset=AuditChecklistCategory.objects.prefetch_related('questions'),
+            )
+        )
+
+
 class AuditChecklistTemplate(models.Model):
     """Template for audit checklists based on audit type."""
     
@@ -93,6 +107,8 @@ class AuditChecklistTemplate(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = AuditChecklistTemplateQuerySet.as_manager()
+    
     class Meta:
         ordering = ['audit_type', '-version']
         verbose_name = "Audit Checklist Template"
@@ -152,25 +168,13 @@ class AuditChecklistCategory(models.Model):
     
     def calculate_score(self, finding):
         """Calculate score for this category based on question responses."""
-        from decimal import Decimal
-        
-        questions = self.questions.all()
-        if not questions:
-            return Decimal('100')
+        from audits.scoring import category_score
         
-        total_weight = sum(q.weight for q in questions)
-        if total_weight == 0:
-            return Decimal('100')
-        
-        weighted_score = Decimal('0')
-        
-        for question in questions:
-            response = finding.question_responses.filter(question=question).first()
-            if response:
-                question_score = self.get_compliance_score(response.compliance_status)
-                weighted_score += (question_score * question.weight) / total_weight
-        
-        return weighted_score
+        question_weights = [(q.id, q.weight) for q in self.questions.all()]
+        statuses = dict(
+            finding.question_responses.filter(question__category=self).values_list('question_id', 'compliance_status')
+        )
+        return category_score(question_weights, statuses)
     
     @staticmethod
     def get_compliance_score(status):
@@ -291,6 +295,12 @@ class ISOClause45001(models.Model):
     
     def get_full_path(self):
         """Get the full clause path (e.g., 4 > 4.1 > 4.1.1)."""
+        from audits.clause_tree import get_clause_tree
+
+        if self.pk:
+            path = get_clause_tree(self.pk).path(self.pk)
+            if path is not None:
+                return path
         if self.parent_clause:
             return f"{self.parent_clause.get_full_path()} > {self.clause_number}"
         return self.clause_number
@@ -299,6 +309,16 @@ class ISOClause45001(models.Model):
 # =============================
 # Audit Planning
 # =============================
+class AuditPlanQuerySet(models.QuerySet):
+    """Audit plan querysets prepared for list serializers."""
+    
+    def for_list(self):
+        """Load audit type and lead auditor and annotate iso_clause_count."""
+        return self.select_related('audit_type', 'lead_auditor').annotate(
+            iso_clause_count=models.Count('iso_clauses', distinct=True)
+        )
+
+
 class AuditPlan(models.Model):
     """Master audit plan record."""
     
@@ -376,6 +396,8 @@ class AuditPlan(models.Model):
     )
     approved_at = models.DateTimeField(null=True, blank=True)
     
+    objects = AuditPlanQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         permissions = [
@@ -396,22 +418,7 @@ class AuditPlan(models.Model):
     def generate_audit_code(self):
         """Generate unique audit code: AUD-YYYY-XXXX."""
         from datetime import datetime
-        current_year = datetime.now().year
-        
-        last_audit = AuditPlan.objects.filter(
-            audit_code__startswith=f'AUD-{current_year}-'
-        ).order_by('-audit_code').first()
-        
-        if last_audit:
-            try:
-                last_number = int(last_audit.audit_code.split('-')[-1])
-                new_number = last_number + 1
-            except (ValueError, IndexError):
-                new_number = 1
-        else:
-            new_number = 1
-        
-        return f'AUD-{current_year}-{new_number:04d}'
+        return next_code(AuditPlan, 'audit_code', 'AUD', year=datetime.now().year)
     
     @property
     def is_overdue(self):
@@ -534,6 +541,23 @@ class AuditChecklistResponse(models.Model):
 # =============================
 # Findings & Non-Conformities
 # =============================
+class AuditFindingQuerySet(models.QuerySet):
+    """Audit finding querysets prepared for list serializers."""
+    
+    def with_capa_counts(self):
+        """Annotate capa_count and closed_capa_count."""
+        return self.annotate(
+            capa_count=models.Count('capas', distinct=True),
+            closed_capa_count=models.Count(
+                'capas', filter=models.Q(capas__status='CLOSED'), distinct=True
+            ),
+        )
+    
+    def for_list(self):
+        """Load the clause, plan and audit type and annotate CAPA counts."""
+        return self.select_related('iso_clause', 'audit_plan__audit_type').with_capa_counts()
+
+
 class AuditFinding(models.Model):
     """Audit findings, non-conformities, and observations."""
     
@@ -647,8 +671,13 @@ class AuditFinding(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = AuditFindingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-identified_date', '-severity']
+        indexes = [
+            models.Index(fields=['-identified_date', '-severity'], name='finding_identified_idx'),
+        ]
         permissions = [
             ('can_create_findings', 'Can create audit findings'),
             ('can_close_findings', 'Can close audit findings'),
@@ -677,67 +706,27 @@ class AuditFinding(models.Model):
         }
         prefix = prefix_map.get(self.finding_type, 'FND')
         
-        last_finding = AuditFinding.objects.filter(
-            finding_code__startswith=f'{prefix}-{current_year}-'
-        ).order_by('-finding_code').first()
-        
-        if last_finding:
-            try:
-                last_number = int(last_finding.finding_code.split('-')[-1])
-                new_number = last_number + 1
-            except (ValueError, IndexError):
-                new_number = 1
-        else:
-            new_number = 1
-        
-        return f'{prefix}-{current_year}-{new_number:04d}'
+        return next_code(AuditFinding, 'finding_code', prefix, year=current_year)
     
     @property
     def has_capa(self):
         """Check if finding has assigned CAPA."""
+        if hasattr(self, 'capa_count'):
+            return self.capa_count > 0
         return self.capas.exists()
     
     @property
     def all_capas_closed(self):
         """Check if all CAPAs are closed."""
+        if hasattr(self, 'capa_count'):
+            return self.closed_capa_count == self.capa_count
         return self.capas.filter(status='CLOSED').count() == self.capas.count()
     
     def calculate_overall_score(self):
         """Calculate overall audit score based on category scores and weights."""
-        from decimal import Decimal
-        from audits.models import AuditChecklistCategory
-        
-        # Get template from audit plan
-        template = self.audit_plan.audit_type.checklist_templates.filter(is_active=True).first()
-        if not template:
-            return None
-        
-        categories = template.categories.all()
-        total_category_weight = sum(c.weight for c in categories)
+        from audits.scoring import score_finding
         
-        if total_category_weight == 0:
-            return None
-        
-        weighted_score = Decimal('0')
-        category_scores = {}
-        
-        for category in categories:
-            category_score = category.calculate_score(self)
-            category_scores[category.id] = {
-                'name': category.category_name,
-                'score': float(category_score),
-                'weight': float(category.weight),
-                'weighted_contribution': float((category_score * category.weight) / 100)
-            }
-            weighted_score += (category_score * category.weight) / 100
-        
-        return {
-            'overall_score': float(weighted_score),
-            'grade': self.get_grade(weighted_score),
-            'color': self.get_score_color(weighted_score),
-            'category_scores': category_scores,
-            'total_questions_answered': self.question_responses.count(),
-        }
+        return score_finding(self)
     
     @staticmethod
     def get_grade(score):
@@ -813,9 +802,104 @@ class AuditQuestionResponse(models.Model):
         return f"{self.finding.finding_code} - {self.question.full_reference}"
 
 
+# =============================
+# Audit Score Snapshots
+# =============================
+class AuditFindingScore(models.Model):
+    """
+    Stored result of scoring a finding against its active checklist template.
+    
+    Kept in sync by audits.signals when question responses, checklist
+    templates, categories or questions change, or a finding moves plan.
+    """
+    
+    finding = models.OneToOneField(
+        AuditFinding,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_snapshot'
+    )
+    template = models.ForeignKey(
+        AuditChecklistTemplate,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='score_snapshots'
+    )
+    overall_score = models.FloatField()
+    grade = models.CharField(max_length=20)
+    color = models.CharField(max_length=10)
+    category_scores = models.JSONField(
+        default=list,
+        help_text="Per-category breakdown: category_id, name, score, weight, weighted_contribution"
+    )
+    total_questions_answered = models.IntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Audit Finding Score"
+        verbose_name_plural = "Audit Finding Scores"
+        indexes = [
+            models.Index(fields=['grade', 'computed_at']),
+            models.Index(fields=['overall_score']),
+        ]
+    
+    def __str__(self):
+        return f"{self.finding_id} - {self.overall_score:.1f} ({self.grade})"
+    
+    def to_payload(self):
+        """Score in the shape returned by AuditFinding.calculate_overall_score."""
+        return {
+            'overall_score': self.overall_score,
+            'grade': self.grade,
+            'color': self.color,
+            'category_scores': {
+                row['category_id']: {key: value for key, value in row.items() if key != 'category_id'}
+                for row in self.category_scores
+            },
+            'total_questions_answered': self.total_questions_answered,
+        }
+
+
 # =============================
 # CAPA (Corrective & Preventive Actions)
 # =============================
+class CAPAQuerySet(models.QuerySet):
+    """CAPA querysets prepared for list serializers."""
+    
+    DONE_STATUSES = ['COMPLETED', 'VERIFIED', 'CLOSED']
+    REMINDER_STATUSES = ['ASSIGNED', 'ACKNOWLEDGED', 'IN_PROGRESS']
+    
+    def for_list(self):
+        """Load the finding and responsible person."""
+        return self.select_related('finding', 'responsible_person')
+    
+    @classmethod
+    def overdue_condition(cls):
+        """Filter condition for ``overdue``, for use in aggregates."""
+        return ~models.Q(status__in=cls.DONE_STATUSES) & models.Q(target_completion_date__lt=date.today())
+    
+    def overdue(self):
+        """CAPAs past their target date that are not completed (matches ``CAPA.is_overdue``)."""
+        return self.filter(self.overdue_condition())
+    
+    def needing_reminder(self, due_within=7):
+        """
+        Active CAPAs overdue or due within ``due_within`` days that have not
+        been reminded about today, ordered by responsible person.
+        """
+        today = date.today()
+        start_of_today = timezone.make_aware(datetime.combine(today, time.min))
+        return self.filter(
+            status__in=self.REMINDER_STATUSES,
+            responsible_person__isnull=False,
+            target_completion_date__lte=today + timedelta(days=due_within),
+        ).filter(
+            models.Q(last_reminded_at__isnull=True) | models.Q(last_reminded_at__lt=start_of_today)
+        ).select_related(
+            'responsible_person', 'assigned_by', 'finding'
+        ).order_by('responsible_person', 'target_completion_date', 'action_code')
+
+
 class CAPA(models.Model):
     """Corrective and Preventive Actions."""
     
@@ -929,11 +1013,16 @@ class CAPA(models.Model):
     )
     progress_notes = models.TextField(blank=True)
     last_progress_update = models.DateTimeField(null=True, blank=True)
+    last_reminded_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the last deadline reminder digest included this CAPA"
+    )
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CAPAQuerySet.as_manager()
+    
     class Meta:
         ordering = ['target_completion_date', '-priority']
         verbose_name = "CAPA"
@@ -951,22 +1040,7 @@ class CAPA(models.Model):
     def generate_capa_code(self):
         """Generate unique CAPA code: CAPA-YYYY-XXXX."""
         from datetime import datetime
-        current_year = datetime.now().year
-        
-        last_capa = CAPA.objects.filter(
-            action_code__startswith=f'CAPA-{current_year}-'
-        ).order_by('-action_code').first()
-        
-        if last_capa:
-            try:
-                last_number = int(last_capa.action_code.split('-')[-1])
-                new_number = last_number + 1
-            except (ValueError, IndexError):
-                new_number = 1
-        else:
-            new_number = 1
-        
-        return f'CAPA-{current_year}-{new_number:04d}'
+        return next_code(CAPA, 'action_code', 'CAPA', year=datetime.now().year)
     
     @property
     def is_overdue(self):
@@ -1202,22 +1276,7 @@ class AuditReport(models.Model):
     def generate_report_code(self):
         """Generate unique report code: REP-YYYY-XXXX."""
         from datetime import datetime
-        current_year = datetime.now().year
-        
-        last_report = AuditReport.objects.filter(
-            report_code__startswith=f'REP-{current_year}-'
-        ).order_by('-report_code').first()
-        
-        if last_report:
-            try:
-                last_number = int(last_report.report_code.split('-')[-1])
-                new_number = last_number + 1
-            except (ValueError, IndexError):
-                new_number = 1
-        else:
-            new_number = 1
-        
-        return f'REP-{current_year}-{new_number:04d}'
+        return next_code(AuditReport, 'report_code', 'REP', year=datetime.now().year)
     
     @property
     def total_findings(self):
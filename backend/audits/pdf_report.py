@@ -11,13 +11,16 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfgen import canvas
 from datetime import datetime
 from django.conf import settings
+from audits.scoring import get_finding_score
 
 
 class AuditFindingPDFReport:
     """Generate comprehensive PDF report for audit findings."""
     
-    def __init__(self, finding):
+    def __init__(self, finding, score_data=None):
         self.finding = finding
+        # Precomputed score (e.g. from audits.scoring.get_finding_scores) skips the lookup
+        self.score_data = score_data
         self.buffer = BytesIO()
         self.doc = SimpleDocTemplate(
             self.buffer,
@@ -186,7 +189,7 @@ class AuditFindingPDFReport:
     
     def add_audit_score(self):
         """Add audit score breakdown."""
-        score_data = self.finding.calculate_overall_score()
+        score_data = self.score_data or get_finding_score(self.finding)
         
         if not score_data:
             return
@@ -448,8 +451,8 @@ class AuditFindingPDFReport:
         return pdf
 
 
-def generate_finding_pdf(finding):
+def generate_finding_pdf(finding, score_data=None):
     """Generate PDF report for a finding."""
-    report = AuditFindingPDFReport(finding)
+    report = AuditFindingPDFReport(finding, score_data=score_data)
     return report.generate()
 
@@ -0,0 +1,245 @@
+"""
+Batch scoring of audit findings against their checklist templates.
+
+The active template tree (categories and question weights) and every
+question response are loaded up front, so scoring any number of findings
+costs a fixed number of queries instead of one per question.
+
+Results are persisted as AuditFindingScore snapshots; readers go through
+``get_finding_scores`` and only findings without a snapshot are scored.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Q
+
+from audits.models import (
+    AuditChecklistCategory, AuditChecklistQuestion, AuditChecklistTemplate, AuditFinding,
+    AuditFindingScore, AuditQuestionResponse
+)
+
+SNAPSHOT_FIELDS = ['template', 'overall_score', 'grade', 'color', 'category_scores', 'total_questions_answered']
+
+
+def category_score(question_weights, statuses):
+    """
+    Score one category from ``[(question_id, weight), ...]`` and a
+    ``{question_id: compliance_status}`` map of the finding's responses.
+    """
+    if not question_weights:
+        return Decimal('100')
+
+    total_weight = sum(weight for _, weight in question_weights)
+    if total_weight == 0:
+        return Decimal('100')
+
+    weighted_score = Decimal('0')
+    for question_id, weight in question_weights:
+        status = statuses.get(question_id)
+        if status is not None:
+            question_score = AuditChecklistCategory.get_compliance_score(status)
+            weighted_score += (question_score * weight) / total_weight
+    return weighted_score
+
+
+def load_template_trees(audit_type_ids):
+    """
+    Active template tree per audit type: ``{audit_type_id: [(category, [(question_id, weight), ...]), ...]}``.
+
+    Uses the highest-version active template of each type, matching
+    ``AuditType.checklist_templates.filter(is_active=True).first()``.
+    """
+    categories = AuditChecklistCategory.objects.filter(
+        template__audit_type_id__in=audit_type_ids,
+        template__is_active=True,
+    ).select_related('template').order_by(
+        'template__audit_type_id', '-template__version', 'order', 'section_number'
+    )
+
+    trees = {}
+    template_for_type = {}
+    for category in categories:
+        audit_type_id = category.template.audit_type_id
+        template_id = template_for_type.setdefault(audit_type_id, category.template_id)
+        if category.template_id == template_id:
+            trees.setdefault(audit_type_id, []).append((category, []))
+
+    questions_by_category = {category.pk: questions for tree in trees.values() for category, questions in tree}
+    question_rows = AuditChecklistQuestion.objects.filter(
+        category_id__in=questions_by_category
+    ).order_by('order', 'reference_number', 'question_letter').values_list('category_id', 'id', 'weight')
+    for category_id, question_id, weight in question_rows:
+        questions_by_category[category_id].append((question_id, weight))
+
+    return trees
+
+
+def score_from_tree(tree, statuses, responses_count):
+    """Overall score payload for one finding, or None without a usable template."""
+    if not tree:
+        return None
+
+    total_category_weight = sum(category.weight for category, _ in tree)
+    if total_category_weight == 0:
+        return None
+
+    weighted_score = Decimal('0')
+    category_scores = {}
+    for category, question_weights in tree:
+        score = category_score(question_weights, statuses)
+        category_scores[category.id] = {
+            'name': category.category_name,
+            'score': float(score),
+            'weight': float(category.weight),
+            'weighted_contribution': float((score * category.weight) / 100)
+        }
+        weighted_score += (score * category.weight) / 100
+
+    return {
+        'overall_score': float(weighted_score),
+        'grade': AuditFinding.get_grade(weighted_score),
+        'color': AuditFinding.get_score_color(weighted_score),
+        'category_scores': category_scores,
+        'total_questions_answered': responses_count,
+    }
+
+
+def score_finding_ids(finding_ids):
+    """Score findings by id; returns ``{finding_id: (template_id, score payload)}`` with None for unscored."""
+    finding_ids = list(finding_ids)
+    if not finding_ids:
+        return {}
+
+    audit_types = dict(
+        AuditFinding.objects.filter(pk__in=finding_ids).values_list('pk', 'audit_plan__audit_type_id')
+    )
+    trees = load_template_trees(set(audit_types.values()))
+
+    statuses = defaultdict(dict)
+    responses = AuditQuestionResponse.objects.filter(
+        finding_id__in=finding_ids
+    ).order_by().values_list('finding_id', 'question_id', 'compliance_status')
+    for finding_id, question_id, compliance_status in responses:
+        statuses[finding_id][question_id] = compliance_status
+
+    results = {}
+    for finding_id in finding_ids:
+        tree = trees.get(audit_types.get(finding_id))
+        score = score_from_tree(tree, statuses[finding_id], len(statuses[finding_id]))
+        results[finding_id] = (tree[0][0].template_id, score) if score else None
+    return results
+
+
+def score_findings(findings):
+    """
+    Score many findings at once; returns ``{finding_id: score payload or None}``.
+
+    ``findings`` may be a queryset or an iterable of AuditFinding instances.
+    """
+    results = score_finding_ids([finding.pk for finding in findings])
+    return {finding_id: result and result[1] for finding_id, result in results.items()}
+
+
+def score_finding(finding):
+    """Score a single finding; see ``score_findings``."""
+    return score_findings([finding])[finding.pk]
+
+
+def refresh_score_snapshots(finding_ids, batch_size=500):
+    """
+    Recompute and store score snapshots for the given findings.
+
+    Findings that can no longer be scored (no active template) lose their
+    snapshot. Returns ``{finding_id: score payload or None}``.
+    """
+    finding_ids = list(dict.fromkeys(finding_ids))
+    payloads = {}
+    for start in range(0, len(finding_ids), batch_size):
+        results = score_finding_ids(finding_ids[start:start + batch_size])
+        snapshots = []
+        unscored = []
+        for finding_id, result in results.items():
+            if result is None:
+                unscored.append(finding_id)
+                payloads[finding_id] = None
+                continue
+            template_id, score = result
+            payloads[finding_id] = score
+            snapshots.append(AuditFindingScore(
+                finding_id=finding_id,
+                template_id=template_id,
+                overall_score=score['overall_score'],
+                grade=score['grade'],
+                color=score['color'],
+                category_scores=[
+                    {'category_id': category_id, **category}
+                    for category_id, category in score['category_scores'].items()
+                ],
+                total_questions_answered=score['total_questions_answered'],
+            ))
+
+        # Deleted findings have no audit type, so they always land in ``unscored``
+        AuditFindingScore.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['finding'],
+            update_fields=SNAPSHOT_FIELDS + ['computed_at'],
+        )
+        if unscored:
+            AuditFindingScore.objects.filter(finding_id__in=unscored).delete()
+    return payloads
+
+
+def get_finding_scores(findings):
+    """
+    Stored scores for many findings, scoring and storing any that lack a snapshot.
+
+    Returns ``{finding_id: score payload or None}``.
+    """
+    finding_ids = [finding.pk for finding in findings]
+    snapshots = AuditFindingScore.objects.filter(finding_id__in=finding_ids)
+    scores = {snapshot.finding_id: snapshot.to_payload() for snapshot in snapshots}
+
+    missing = [finding_id for finding_id in finding_ids if finding_id not in scores]
+    if missing:
+        scores.update(refresh_score_snapshots(missing))
+    return scores
+
+
+def get_finding_score(finding):
+    """Stored score for one finding; see ``get_finding_scores``."""
+    return get_finding_scores([finding])[finding.pk]
+
+
+def refresh_audit_type_scores(audit_type_ids):
+    """Rescore every finding of the given audit types; returns the number rescored."""
+    finding_ids = list(
+        AuditFinding.objects.filter(audit_plan__audit_type_id__in=audit_type_ids).values_list('pk', flat=True)
+    )
+    refresh_score_snapshots(finding_ids)
+    return len(finding_ids)
+
+
+def refresh_template_scores(template):
+    """Rescore every finding whose audit type uses ``template``; returns the number rescored."""
+    return refresh_audit_type_scores([template.audit_type_id])
+
+
+def refresh_checklist_scores(changes):
+    """
+    Rescore findings whose checklist changed, from ``(kind, id)`` pairs.
+
+    ``kind`` is ``'audit_type'``, ``'template'`` or ``'category'``. Template
+    and category ids are resolved when this runs, after the change has
+    committed; one deleted by then is covered by the pair its deleted
+    parent recorded.
+    """
+    ids = defaultdict(set)
+    for kind, pk in changes:
+        ids[kind].add(pk)
+    audit_type_ids = set(ids['audit_type'])
+    if ids['template'] or ids['category']:
+        audit_type_ids.update(AuditChecklistTemplate.objects.filter(
+            Q(pk__in=ids['template']) | Q(categories__in=ids['category'])
+        ).values_list('audit_type_id', flat=True))
+    return refresh_audit_type_scores(audit_type_ids)
@@ -9,6 +9,7 @@ from audits.models import (
     AuditReport, CAPAProgressUpdate, AuditMeeting, AuditComment, CompanySettings
 )
 from accounts.serializers import UserSerializer
+from audits.clause_tree import get_clause_tree
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -69,7 +70,7 @@ class AuditChecklistCategorySerializer(serializers.ModelSerializer):
         ]
     
     def get_question_count(self, obj):
-        return obj.questions.count()
+        return len(obj.questions.all())
     
     def get_total_weight_check(self, obj):
         """Check if question weights sum to 100%"""
@@ -95,6 +96,8 @@ class AuditChecklistTemplateSerializer(serializers.ModelSerializer):
         ]
     
     def get_total_questions(self, obj):
+        if 'categories' in getattr(obj, '_prefetched_objects_cache', {}):
+            return sum(len(category.questions.all()) for category in obj.categories.all())
         return AuditChecklistQuestion.objects.filter(category__template=obj).count()
 
 
@@ -118,7 +121,7 @@ class ISOClause45001Serializer(serializers.ModelSerializer):
     """Serializer for ISO 45001 clauses."""
     
     sub_clauses = serializers.SerializerMethodField()
-    full_path = serializers.ReadOnlyField(source='get_full_path')
+    full_path = serializers.SerializerMethodField()
     
     class Meta:
         model = ISOClause45001
@@ -129,10 +132,20 @@ class ISOClause45001Serializer(serializers.ModelSerializer):
         ]
     
     def get_sub_clauses(self, obj):
-        """Get sub-clauses recursively."""
-        if obj.sub_clauses.exists():
-            return ISOClause45001Serializer(obj.sub_clauses.all(), many=True).data
-        return []
+        """Get sub-clauses recursively from the cached clause tree."""
+        return self._clause_tree(obj).sub_clauses(obj.pk)
+
+    def get_full_path(self, obj):
+        """Get the full clause path from the cached clause tree."""
+        return self._clause_tree(obj).path(obj.pk)
+
+    def _clause_tree(self, obj):
+        # Shared through the root serializer's context so a list checks the cache once
+        tree = self.context.get('clause_tree')
+        if tree is None or obj.pk not in tree:
+            tree = get_clause_tree(obj.pk)
+            self.context['clause_tree'] = tree
+        return tree
 
 
 # =============================
@@ -157,6 +170,8 @@ class AuditPlanListSerializer(serializers.ModelSerializer):
         ]
     
     def get_iso_clause_count(self, obj):
+        if hasattr(obj, 'iso_clause_count'):
+            return obj.iso_clause_count
         return obj.iso_clauses.count()
 
 
@@ -295,6 +310,8 @@ class AuditFindingListSerializer(serializers.ModelSerializer):
         ]
     
     def get_capa_count(self, obj):
+        if hasattr(obj, 'capa_count'):
+            return obj.capa_count
         return obj.capas.count()
 
 
@@ -341,7 +358,9 @@ class AuditFindingDetailSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         """Create finding and question responses atomically."""
+        from functools import partial
         from django.db import transaction
+        from audits.scoring import refresh_score_snapshots
         
         question_responses_data = validated_data.pop('question_responses_data', [])
         
@@ -354,8 +373,8 @@ class AuditFindingDetailSerializer(serializers.ModelSerializer):
                 finding = super().create(validated_data)
                 
                 # Create question responses
-                for response_data in question_responses_data:
-                    AuditQuestionResponse.objects.create(
+                AuditQuestionResponse.objects.bulk_create([
+                    AuditQuestionResponse(
                         finding=finding,
                         question_id=response_data.get('question_id'),
                         answer_text=response_data.get('answer_text', ''),
@@ -363,6 +382,10 @@ class AuditFindingDetailSerializer(serializers.ModelSerializer):
                         notes=response_data.get('notes', ''),
                         evidence_files=response_data.get('evidence_files', [])
                     )
+                    for response_data in question_responses_data
+                ])
+                # bulk_create skips the per-response signal; score the finding once instead
+                transaction.on_commit(partial(refresh_score_snapshots, [finding.pk]))
                 
                 return finding
         except Exception as e:
@@ -1,12 +1,18 @@
 """
 Email services for Audit Management System.
+
+Messages are rendered here and queued for background delivery by the mailer app.
 """
-from django.core.mail import send_mail, EmailMultiAlternatives
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
-from audits.models import AuditPlan, AuditFinding, CAPA
+from django.utils import timezone
+from audits.models import AuditPlan, AuditFinding, CAPA, CAPAQuerySet
+from mailer.services import queue_email, queue_emails
 from django.contrib.auth import get_user_model
+from collections import defaultdict
+from itertools import groupby
+from operator import attrgetter
 import logging
 
 User = get_user_model()
@@ -23,7 +29,7 @@ def send_audit_plan_notification(audit_plan, recipients=None, additional_message
         additional_message: Custom message to include (optional)
     
     Returns:
-        Number of emails sent successfully
+        EmailBatch queued for delivery, or None if nothing was queued
     """
     try:
         # Determine recipients
@@ -47,7 +53,7 @@ def send_audit_plan_notification(audit_plan, recipients=None, additional_message
         
         if not recipient_emails:
             logger.warning(f"No recipients for audit plan {audit_plan.audit_code}")
-            return 0
+            return None
         
         # Prepare email content
         subject = f"Audit Notification: {audit_plan.audit_code} - {audit_plan.title}"
@@ -232,22 +238,21 @@ If you have any questions, please contact {audit_plan.lead_auditor.get_full_name
 </html>
 """
         
-        # Send email
-        email = EmailMultiAlternatives(
+        # Queue email
+        batch = queue_email(
+            'audit_plan',
             subject=subject,
             body=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
             to=recipient_emails,
+            html_body=html_message,
         )
-        email.attach_alternative(html_message, "text/html")
-        email.send(fail_silently=False)
         
-        logger.info(f"Audit plan notification sent for {audit_plan.audit_code} to {len(recipient_emails)} recipients")
-        return len(recipient_emails)
+        logger.info(f"Audit plan notification queued for {audit_plan.audit_code} to {len(recipient_emails)} recipients")
+        return batch
         
     except Exception as e:
-        logger.error(f"Failed to send audit plan notification: {str(e)}")
-        return 0
+        logger.error(f"Failed to queue audit plan notification: {str(e)}")
+        return None
 
 
 def send_capa_assignment_notification(capa):
@@ -258,11 +263,11 @@ def send_capa_assignment_notification(capa):
         capa: CAPA instance
     
     Returns:
-        Boolean indicating success
+        EmailBatch queued for delivery, or None if nothing was queued
     """
     try:
         if not capa.responsible_person:
-            return False
+            return None
         
         subject = f"CAPA Assigned: {capa.action_code} - {capa.title}"
         
@@ -298,20 +303,19 @@ Access your CAPA: {settings.FRONTEND_URL}/audit/capas
 This is an automated notification from SafeSphere Audit Management System.
 """
         
-        send_mail(
+        batch = queue_email(
+            'capa_assignment',
             subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[capa.responsible_person.email],
-            fail_silently=False,
+            body=message,
+            to=[capa.responsible_person.email],
         )
         
-        logger.info(f"CAPA assignment notification sent for {capa.action_code}")
-        return True
+        logger.info(f"CAPA assignment notification queued for {capa.action_code}")
+        return batch
         
     except Exception as e:
-        logger.error(f"Failed to send CAPA notification: {str(e)}")
-        return False
+        logger.error(f"Failed to queue CAPA notification: {str(e)}")
+        return None
 
 
 def send_capa_overdue_reminder(capa):
@@ -322,11 +326,11 @@ def send_capa_overdue_reminder(capa):
         capa: CAPA instance
     
     Returns:
-        Boolean indicating success
+        EmailBatch queued for delivery, or None if nothing was queued
     """
     try:
         if not capa.responsible_person:
-            return False
+            return None
         
         recipients = [capa.responsible_person.email]
         
@@ -367,20 +371,19 @@ Access CAPA: {settings.FRONTEND_URL}/audit/capas
 This is an automated reminder from SafeSphere Audit Management System.
 """
         
-        send_mail(
+        batch = queue_email(
+            'capa_overdue',
             subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            fail_silently=False,
+            body=message,
+            to=recipients,
         )
         
-        logger.info(f"Overdue CAPA reminder sent for {capa.action_code}")
-        return True
+        logger.info(f"Overdue CAPA reminder queued for {capa.action_code}")
+        return batch
         
     except Exception as e:
-        logger.error(f"Failed to send overdue reminder: {str(e)}")
-        return False
+        logger.error(f"Failed to queue overdue reminder: {str(e)}")
+        return None
 
 
 def send_capa_deadline_approaching(capa, days_remaining):
@@ -392,11 +395,11 @@ def send_capa_deadline_approaching(capa, days_remaining):
         days_remaining: Number of days until deadline
     
     Returns:
-        Boolean indicating success
+        EmailBatch queued for delivery, or None if nothing was queued
     """
     try:
         if not capa.responsible_person:
-            return False
+            return None
         
         recipients = [capa.responsible_person.email]
         
@@ -441,61 +444,55 @@ Access CAPA: {settings.FRONTEND_URL}/audit/capas
 This is an automated reminder from SafeSphere Audit Management System.
 """
         
-        send_mail(
+        batch = queue_email(
+            'capa_deadline',
             subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            fail_silently=False,
+            body=message,
+            to=recipients,
         )
         
-        logger.info(f"Deadline reminder sent for {capa.action_code} ({days_remaining} days remaining)")
-        return True
+        logger.info(f"Deadline reminder queued for {capa.action_code} ({days_remaining} days remaining)")
+        return batch
         
     except Exception as e:
-        logger.error(f"Failed to send deadline reminder: {str(e)}")
-        return False
+        logger.error(f"Failed to queue deadline reminder: {str(e)}")
+        return None
 
 
-def send_weekly_capa_summary(user):
-    """
-    Send weekly summary of assigned CAPAs to user.
-    
-    Args:
-        user: User instance
+def _capa_digest_entry(capa):
+    """One CAPA as listed in reminder digests and weekly summaries."""
+    status_icon = "🚨" if capa.is_overdue else "⏰" if capa.days_remaining <= 7 else "📋"
+    return f"""
+{status_icon} {capa.action_code} - {capa.title}
+   Priority: {capa.priority}
+   Status: {capa.status}
+   Target Date: {capa.target_completion_date}
+   Progress: {capa.progress_percentage}%
+   {"   ⚠️  OVERDUE by " + str(capa.days_overdue) + " days!" if capa.is_overdue else "   Days remaining: " + str(capa.days_remaining)}
+   Related Finding: {capa.finding.finding_code}
+
+"""
+
+
+def _weekly_summary_message(user, capas):
+    """Render the weekly summary of ``capas`` (the user's active CAPAs) for queue_emails."""
+    overdue_count = sum(1 for c in capas if c.is_overdue)
+    due_soon_count = sum(1 for c in capas if c.days_remaining <= 7 and not c.is_overdue)
+    in_progress_count = sum(1 for c in capas if c.status == 'IN_PROGRESS')
     
-    Returns:
-        Boolean indicating success
-    """
-    from audits.models import CAPA
-    from datetime import date
+    subject = f"Weekly CAPA Summary - {overdue_count} Overdue, {due_soon_count} Due Soon"
     
-    try:
-        # Get user's CAPAs
-        capas = CAPA.objects.filter(
-            responsible_person=user,
-            status__in=['ASSIGNED', 'ACKNOWLEDGED', 'IN_PROGRESS']
-        ).select_related('finding')
-        
-        if not capas.exists():
-            return False
-        
-        overdue_count = sum(1 for c in capas if c.is_overdue)
-        due_soon_count = sum(1 for c in capas if c.days_remaining <= 7 and not c.is_overdue)
-        
-        subject = f"Weekly CAPA Summary - {overdue_count} Overdue, {due_soon_count} Due Soon"
-        
-        message = f"""
+    message = f"""
 WEEKLY CAPA SUMMARY
 
 Hello {user.get_full_name},
 
 Here is your CAPA summary for the week:
 
-Total Active CAPAs: {capas.count()}
+Total Active CAPAs: {len(capas)}
 Overdue: {overdue_count}
 Due within 7 days: {due_soon_count}
-In Progress: {capas.filter(status='IN_PROGRESS').count()}
+In Progress: {in_progress_count}
 
 {"🚨 URGENT: You have overdue CAPAs requiring immediate attention!" if overdue_count > 0 else ""}
 
@@ -504,22 +501,10 @@ In Progress: {capas.filter(status='IN_PROGRESS').count()}
 CAPA Details:
 
 """
-        
-        for capa in capas:
-            status_icon = "🚨" if capa.is_overdue else "⏰" if capa.days_remaining <= 7 else "📋"
-            
-            message += f"""
-{status_icon} {capa.action_code} - {capa.title}
-   Priority: {capa.priority}
-   Status: {capa.status}
-   Target Date: {capa.target_completion_date}
-   Progress: {capa.progress_percentage}%
-   {"   ⚠️  OVERDUE by " + str(capa.days_overdue) + " days!" if capa.is_overdue else "   Days remaining: " + str(capa.days_remaining)}
-   Related Finding: {capa.finding.finding_code}
-
-"""
-        
-        message += f"""
+    
+    message += ''.join(_capa_digest_entry(capa) for capa in capas)
+    
+    message += f"""
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 Access your CAPAs: {settings.FRONTEND_URL}/audit/capas
@@ -529,21 +514,154 @@ Please update your CAPA progress regularly.
 ---
 This is your weekly summary from SafeSphere Audit Management System.
 """
-        
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
+    return {'subject': subject, 'body': message, 'to': [user.email]}
+
+
+def send_weekly_capa_summary(user):
+    """
+    Send weekly summary of assigned CAPAs to user.
+    
+    Args:
+        user: User instance
+    
+    Returns:
+        EmailBatch queued for delivery, or None if nothing was queued
+    """
+    try:
+        capas = list(
+            CAPA.objects.filter(
+                responsible_person=user,
+                status__in=CAPAQuerySet.REMINDER_STATUSES
+            ).select_related('finding')
         )
         
-        logger.info(f"Weekly CAPA summary sent to {user.email}")
-        return True
+        if not capas:
+            return None
+        
+        batch = queue_emails('capa_weekly_summary', [_weekly_summary_message(user, capas)])
+        
+        logger.info(f"Weekly CAPA summary queued to {user.email}")
+        return batch
         
     except Exception as e:
-        logger.error(f"Failed to send weekly summary: {str(e)}")
-        return False
+        logger.error(f"Failed to queue weekly summary: {str(e)}")
+        return None
+
+
+def send_weekly_capa_summaries():
+    """
+    Queue the weekly summary for every user with active CAPAs.
+    
+    All CAPAs are loaded in one query and the summaries go out as one batch.
+    
+    Returns:
+        EmailBatch queued for delivery, or None if nothing was queued
+    """
+    capas = CAPA.objects.filter(
+        status__in=CAPAQuerySet.REMINDER_STATUSES,
+        responsible_person__isnull=False,
+    ).select_related('responsible_person', 'finding').order_by('responsible_person', 'target_completion_date')
+    
+    messages = [
+        _weekly_summary_message(user, list(user_capas))
+        for user, user_capas in groupby(capas, key=attrgetter('responsible_person'))
+    ]
+    batch = queue_emails('capa_weekly_summary', messages)
+    logger.info(f"Weekly CAPA summaries queued for {len(messages)} users")
+    return batch
+
+
+def _reminder_digest_message(recipient, capas, due_within, escalation=False):
+    """Render one reminder digest covering ``capas``, due within ``due_within`` days, for queue_emails."""
+    overdue = [capa for capa in capas if capa.is_overdue]
+    due_soon = [capa for capa in capas if not capa.is_overdue]
+    
+    if escalation:
+        subject = f"CAPA Escalation - {len(overdue)} Overdue, {len(due_soon)} Due Soon"
+        intro = "The following CAPAs you assigned need attention:"
+    else:
+        subject = f"{'⚠️ ' if overdue else ''}CAPA Reminder - {len(overdue)} Overdue, {len(due_soon)} Due Soon"
+        intro = "The following CAPAs assigned to you need attention:"
+    
+    message = f"""
+CAPA DEADLINE REMINDER
+
+Hello {recipient.get_full_name},
+
+{intro}
+"""
+    if overdue:
+        message += f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+🚨 OVERDUE ({len(overdue)}) - take immediate action:
+"""
+        message += ''.join(_capa_digest_entry(capa) for capa in overdue)
+    if due_soon:
+        message += f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+⏰ DUE WITHIN {due_within} DAY{'' if due_within == 1 else 'S'} ({len(due_soon)}):
+"""
+        message += ''.join(_capa_digest_entry(capa) for capa in due_soon)
+    
+    message += f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Action Required:
+1. Complete remaining CAPA activities and upload evidence, OR
+2. Update progress with an explanation of any delay, OR
+3. Request a deadline extension with justification
+
+Access CAPAs: {settings.FRONTEND_URL}/audit/capas
+
+---
+This is an automated reminder from SafeSphere Audit Management System.
+"""
+    return {'subject': subject, 'body': message, 'to': [recipient.email]}
+
+
+def send_capa_reminder_digests(due_within=7):
+    """
+    Queue one reminder digest per responsible person for overdue and due-soon CAPAs.
+    
+    CAPAs are selected in one query and skipped if already reminded today,
+    so reruns are cheap. Assigners also get a digest of the overdue CAPAs
+    they assigned, and of critical or high priority ones nearly due. Every
+    digest goes out in one batch over a single connection.
+    
+    Returns:
+        Summary dict with the batch and overdue, due soon and digest counts
+    """
+    capas = list(CAPA.objects.needing_reminder(due_within))
+    
+    messages = [
+        _reminder_digest_message(person, list(person_capas), due_within)
+        for person, person_capas in groupby(capas, key=attrgetter('responsible_person'))
+    ]
+    
+    escalations = defaultdict(list)
+    for capa in capas:
+        if not capa.assigned_by or capa.assigned_by_id == capa.responsible_person_id:
+            continue
+        if capa.is_overdue or capa.priority in ('CRITICAL', 'HIGH'):
+            escalations[capa.assigned_by].append(capa)
+    messages.extend(
+        _reminder_digest_message(assigner, assigned, due_within, escalation=True)
+        for assigner, assigned in escalations.items()
+    )
+    
+    batch = queue_emails('capa_reminder_digest', messages)
+    CAPA.objects.filter(pk__in=[capa.pk for capa in capas]).update(last_reminded_at=timezone.now())
+    
+    overdue_count = sum(1 for capa in capas if capa.is_overdue)
+    logger.info(f"CAPA reminder digests queued: {len(messages)} digests covering {len(capas)} CAPAs")
+    return {
+        'batch': batch,
+        'digests': len(messages),
+        'overdue': overdue_count,
+        'due_soon': len(capas) - overdue_count,
+    }
 
 
 def send_finding_notification(finding):
@@ -554,7 +672,7 @@ def send_finding_notification(finding):
         finding: AuditFinding instance
     
     Returns:
-        Boolean indicating success
+        EmailBatch queued for delivery, or None if nothing was queued
     """
     try:
         recipients = []
@@ -573,7 +691,7 @@ def send_finding_notification(finding):
                 recipients.append(manager.email)
         
         if not recipients:
-            return False
+            return None
         
         subject = f"🔍 New Finding: {finding.finding_code} - {finding.title}"
         
@@ -623,20 +741,19 @@ Access Finding: {settings.FRONTEND_URL}/audit/findings
 This is an automated notification from SafeSphere Audit Management System.
 """
         
-        send_mail(
+        batch = queue_email(
+            'audit_finding',
             subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            fail_silently=False,
+            body=message,
+            to=recipients,
         )
         
-        logger.info(f"Finding notification sent for {finding.finding_code}")
-        return True
+        logger.info(f"Finding notification queued for {finding.finding_code}")
+        return batch
         
     except Exception as e:
-        logger.error(f"Failed to send finding notification: {str(e)}")
-        return False
+        logger.error(f"Failed to queue finding notification: {str(e)}")
+        return None
 
 
 def send_audit_completion_notification(audit_plan):
@@ -647,7 +764,7 @@ def send_audit_completion_notification(audit_plan):
         audit_plan: AuditPlan instance
     
     Returns:
-        Number of emails sent
+        EmailBatch queued for delivery, or None if nothing was queued
     """
     try:
         recipients = []
@@ -669,7 +786,7 @@ def send_audit_completion_notification(audit_plan):
             recipients.extend([user.email for user in dept_heads if user.email not in recipients])
         
         if not recipients:
-            return 0
+            return None
         
         # Get findings summary
         findings = audit_plan.findings.all()
@@ -707,18 +824,17 @@ Access Audit Results: {settings.FRONTEND_URL}/audit/dashboard
 This is an automated notification from SafeSphere Audit Management System.
 """
         
-        send_mail(
+        batch = queue_email(
+            'audit_completion',
             subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            fail_silently=False,
+            body=message,
+            to=recipients,
         )
         
-        logger.info(f"Audit completion notification sent for {audit_plan.audit_code}")
-        return len(recipients)
+        logger.info(f"Audit completion notification queued for {audit_plan.audit_code}")
+        return batch
         
     except Exception as e:
-        logger.error(f"Failed to send completion notification: {str(e)}")
-        return 0
+        logger.error(f"Failed to queue completion notification: {str(e)}")
+        return None
 
@@ -0,0 +1,79 @@
+"""
+Keep audit score snapshots and cached reference data in sync with their sources.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.on_commit import on_commit_batch
+
+from . import clause_tree, template_cache
+from .models import (
+    AuditChecklistCategory, AuditChecklistQuestion, AuditChecklistTemplate, AuditFinding,
+    AuditQuestionResponse, AuditType, ISOClause45001
+)
+from .scoring import refresh_checklist_scores, refresh_score_snapshots
+
+
+@receiver(post_save, sender=AuditQuestionResponse)
+@receiver(post_delete, sender=AuditQuestionResponse)
+def refresh_finding_score(sender, instance, **kwargs):
+    """Rescore the response's finding once the change is committed."""
+    if isinstance(kwargs.get('origin'), AuditFinding):
+        # The finding itself is being deleted; its snapshot cascades with it
+        return
+    # A checklist submit saves many responses; each finding is rescored once per transaction
+    on_commit_batch(refresh_score_snapshots, [instance.finding_id])
+
+
+@receiver(pre_save, sender=AuditFinding)
+def remember_finding_plan(sender, instance, **kwargs):
+    """Capture the audit plan an existing finding belonged to before it is changed."""
+    instance._score_plan_previous = None
+    if instance.pk and not kwargs.get('raw'):
+        instance._score_plan_previous = sender.objects.filter(pk=instance.pk).values_list(
+            'audit_plan_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=AuditFinding)
+def refresh_moved_finding_score(sender, instance, **kwargs):
+    """Rescore a finding moved to another plan, which may use another checklist."""
+    previous = getattr(instance, '_score_plan_previous', None)
+    if previous is not None and previous != instance.audit_plan_id:
+        on_commit_batch(refresh_score_snapshots, [instance.pk])
+
+
+@receiver(post_save, sender=ISOClause45001)
+@receiver(post_delete, sender=ISOClause45001)
+def invalidate_clause_tree(sender, instance, **kwargs):
+    """Rebuild clause trees now in this process and everywhere once committed."""
+    # Other processes may rebuild from the old rows before this transaction commits
+    clause_tree.invalidate()
+    transaction.on_commit(clause_tree.invalidate)
+
+
+
+@receiver(post_save, sender=AuditType)
+@receiver(post_delete, sender=AuditType)
+@receiver(post_save, sender=AuditChecklistTemplate)
+@receiver(post_delete, sender=AuditChecklistTemplate)
+@receiver(post_save, sender=AuditChecklistCategory)
+@receiver(post_delete, sender=AuditChecklistCategory)
+@receiver(post_save, sender=AuditChecklistQuestion)
+@receiver(post_delete, sender=AuditChecklistQuestion)
+def invalidate_template_cache(sender, instance, **kwargs):
+    """Drop rendered checklist templates now and again once committed, and rescore their findings."""
+    template_cache.invalidate()
+    transaction.on_commit(template_cache.invalidate)
+
+    # Weights and the active template decide scores; audit types themselves do not
+    if isinstance(instance, AuditChecklistTemplate):
+        change = ('audit_type', instance.audit_type_id)
+    elif isinstance(instance, AuditChecklistCategory):
+        change = ('template', instance.template_id)
+    elif isinstance(instance, AuditChecklistQuestion):
+        change = ('category', instance.category_id)
+    else:
+        return
+    on_commit_batch(refresh_checklist_scores, [change])
@@ -0,0 +1,24 @@
+"""
+Celery tasks for audit reminders.
+"""
+from celery import shared_task
+
+from . import services
+
+
+@shared_task
+def send_capa_reminders():
+    """
+    Queue the daily CAPA deadline reminder digests
+    """
+    summary = services.send_capa_reminder_digests()
+    return f"Queued {summary['digests']} CAPA reminder digests"
+
+
+@shared_task
+def send_weekly_capa_summaries():
+    """
+    Queue the weekly CAPA summary for every user with active CAPAs
+    """
+    batch = services.send_weekly_capa_summaries()
+    return f"Queued weekly CAPA summaries in batch {batch.pk if batch else None}"
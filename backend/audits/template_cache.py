@@ -0,0 +1,50 @@
+"""
+Shared cache for rendered checklist templates.
+
+Templates are reference data that rarely change, so the detail payload
+(categories, questions and weight totals) is rendered once and stored in the
+Django cache under the template id, its version and a generation number.
+Saving or deleting an audit type, template, category or question bumps the
+generation, invalidating every cached template without key scans.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache_generation import GenerationKey
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'audits:checklist_template'
+GENERATION = GenerationKey(f'{KEY_PREFIX}:generation')
+
+
+def _timeout():
+    return getattr(settings, 'AUDIT_TEMPLATE_CACHE_TIMEOUT', 86400)
+
+
+def get_or_render(template, render):
+    """
+    Return ``(payload, hit)`` for a template, rendering and storing it on a miss.
+
+    Cache errors never break the checklist; the payload is rendered instead.
+    """
+    try:
+        key = f'{KEY_PREFIX}:{GENERATION.get()}:{template.pk}:{template.version}'
+        payload = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Checklist template cache unavailable for {template.pk}: {e}")
+        return render(template), False
+
+    if payload is not None:
+        return payload, True
+
+    payload = render(template)
+    cache.set(key, payload, timeout=_timeout())
+    return payload, False
+
+
+def invalidate():
+    """Drop every cached template, now and again once the change commits."""
+    GENERATION.bump_on_commit()
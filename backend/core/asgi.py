@@ -2,6 +2,8 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django; WebSocket connections under /ws/ are the push channel
+for notifications and dashboard invalidations (see the ``push`` app).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +15,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_asgi_application()
+# Initialise Django before importing anything that touches models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import OriginValidator  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from push.middleware import JWTAuthMiddleware  # noqa: E402
+from push.routing import websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    # The frontend is served from its own origin, so accept the CORS origins as well as our hosts
+    "websocket": OriginValidator(
+        JWTAuthMiddleware(URLRouter(websocket_urlpatterns)),
+        [*settings.ALLOWED_HOSTS, *settings.CORS_ALLOWED_ORIGINS],
+    ),
+})
@@ -0,0 +1,76 @@
+"""
+Generation numbers for invalidating groups of cache keys at once.
+
+Cached entries embed the current generation in their key; bumping the
+generation orphans every entry built under the old one, without key scans.
+Entries then expire through their own timeouts.
+"""
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationKey:
+    """A generation number stored in the Django cache under ``key``."""
+
+    def __init__(self, key):
+        self.key = key
+
+    def __repr__(self):
+        return f'GenerationKey({self.key!r})'
+
+    def get(self):
+        """
+        The current generation, seeded on first use.
+
+        Seeds come from the clock, so a counter that was evicted never comes
+        back at a value whose entries may still be cached. Cache errors are
+        raised for the caller to fall back on.
+        """
+        generation = cache.get(self.key)
+        if generation is None:
+            cache.add(self.key, time.time_ns(), timeout=None)
+            generation = cache.get(self.key)
+        return generation
+
+    def bump(self):
+        """
+        Move to a new generation, orphaning entries built under the old one.
+
+        A cache outage is logged rather than raised, so it never fails the
+        write that triggered the invalidation.
+        """
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.set(self.key, time.time_ns(), timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to bump cache generation {self.key}: {e}")
+
+    def bump_on_commit(self):
+        """
+        Bump now, and again once the current transaction commits.
+
+        The first bump stops readers using entries the write makes stale; the
+        second orphans any entry a concurrent reader rebuilt from rows the
+        transaction had not committed yet.
+        """
+        self.bump()
+        transaction.on_commit(self.bump)
+
+    @classmethod
+    def bump_many(cls, generations):
+        """Bump several generations with a single cache write."""
+        generations = list(generations)
+        if not generations:
+            return
+        # A fresh clock reading is as good as an increment for changing each one
+        now = time.time_ns()
+        try:
+            cache.set_many({generation.key: now for generation in generations}, timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to bump {len(generations)} cache generations: {e}")
@@ -44,6 +44,22 @@ app.conf.update(
             'task': 'core.tasks.backup_database',
             'schedule': 86400.0,  # Daily
         },
+        'cleanup-expired-exports': {
+            'task': 'exports.tasks.cleanup_expired_exports',
+            'schedule': 3600.0,  # Every hour
+        },
+        'send-capa-reminders': {
+            'task': 'audits.tasks.send_capa_reminders',
+            'schedule': 86400.0,  # Daily; CAPAs already reminded today are skipped
+        },
+        'send-weekly-capa-summaries': {
+            'task': 'audits.tasks.send_weekly_capa_summaries',
+            'schedule': 604800.0,  # Weekly
+        },
+        'requeue-stale-email-batches': {
+            'task': 'mailer.tasks.requeue_stale_email_batches',
+            'schedule': 600.0,  # Every 10 minutes
+        },
     },
     
     # Task routing
@@ -52,6 +68,10 @@ app.conf.update(
         'documents.tasks.*': {'queue': 'documents'},
         'ppes.tasks.*': {'queue': 'ppes'},
         'core.tasks.*': {'queue': 'core'},
+        # Report generation runs on its own workers so long exports never block other tasks
+        'exports.tasks.*': {'queue': 'exports'},
+        'mailer.tasks.*': {'queue': 'mail'},
+        'push.tasks.*': {'queue': 'push'},
     },
     
     # Queue definitions
@@ -62,6 +82,9 @@ app.conf.update(
         'documents': {},
         'ppes': {},
         'core': {},
+        'exports': {},
+        'mail': {},
+        'push': {},
     },
     
     # Error handling
@@ -0,0 +1,32 @@
+"""
+Worker claims on queued rows, recoverable when the claiming worker dies.
+
+A worker claims a row by moving it from its ready status to a running
+status with a conditional UPDATE, so only one worker wins. The claim is
+stamped with the time it was taken. If the worker dies mid-task, the row
+stays in the running status. Once the claim is older than the task's time
+limit, no live worker can still hold it. A redelivered task may then take
+it over, or a reaper may settle it.
+"""
+from django.db.models import Q
+from django.utils import timezone
+
+
+def stale_claims(queryset, running, stale_after, claimed_at='started_at', now=None):
+    """Rows in ``running`` status whose claim is older than ``stale_after``."""
+    cutoff = (now or timezone.now()) - stale_after
+    return queryset.filter(**{'status': running, f'{claimed_at}__lt': cutoff})
+
+
+def claim(queryset, ready, running, stale_after, claimed_at='started_at', **updates):
+    """
+    Move ready rows, or rows with a stale claim, to ``running``.
+
+    Returns the number of rows claimed; 0 means another live worker holds
+    them or they are finished. ``updates`` are written in the same UPDATE.
+    """
+    now = timezone.now()
+    stale = Q(status=running, **{f'{claimed_at}__lt': now - stale_after})
+    return queryset.filter(Q(status=ready) | stale).update(
+        status=running, **{claimed_at: now}, **updates
+    )
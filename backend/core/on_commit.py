@@ -0,0 +1,43 @@
+"""
+On-commit work coalesced per transaction.
+
+Signal receivers that react to every saved row would otherwise register
+one ``transaction.on_commit`` callback per row. ``on_commit_batch`` collects
+the rows' keys into a single callback instead, which calls the handler once
+with all of them.
+"""
+from django.db import transaction
+
+
+class _Batch:
+    """An on-commit callback that hands its collected items to ``func`` once."""
+
+    def __init__(self, func):
+        self.func = func
+        self.items = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.func(self.items)
+
+
+def on_commit_batch(func, items, using=None):
+    """
+    Call ``func(collected)`` once the current transaction commits.
+
+    ``collected`` is the set of every item queued for ``func`` since the
+    batch was registered. Outside a transaction ``func`` runs immediately.
+    A rolled-back transaction or savepoint discards its batch along with
+    its other on-commit callbacks.
+    """
+    connection = transaction.get_connection(using)
+    # Django keeps pending callbacks as (savepoint ids, callback, robust)
+    for _, callback, _ in connection.run_on_commit:
+        if isinstance(callback, _Batch) and callback.func is func and not callback.done:
+            callback.items.update(items)
+            return
+
+    batch = _Batch(func)
+    batch.items.update(items)
+    transaction.on_commit(batch, using=using)
@@ -124,6 +124,11 @@ INSTALLED_APPS = [
     "quickreports",
     "trainings",
     "performance",
+    "exports",
+    "mailer",
+    "push",
+    "sequences",
+    "search",
     "corsheaders",
     "rest_framework",
     "drf_yasg",
@@ -132,8 +137,10 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
 }
 
 def _cors_post_csrf_available() -> bool:
@@ -153,6 +160,7 @@ def _cors_post_csrf_available() -> bool:
 _HAS_CORS_POST_CSRF = _cors_post_csrf_available()
 
 MIDDLEWARE = [
+    "api.profiling.RequestProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -353,6 +361,42 @@ SESSION_COOKIE_AGE = 3600  # 1 hour
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_SAVE_EVERY_REQUEST = True
 
+# Dashboard cache: seconds a cached dashboard payload may live before recomputing
+DASHBOARD_CACHE_TIMEOUT = env.int('DASHBOARD_CACHE_TIMEOUT', default=300)
+# Seconds a rendered checklist template may live; edits invalidate it sooner
+AUDIT_TEMPLATE_CACHE_TIMEOUT = env.int('AUDIT_TEMPLATE_CACHE_TIMEOUT', default=86400)
+# Seconds an authenticated user's profile may be served from cache; user saves and logout invalidate it sooner
+JWT_USER_CACHE_TIMEOUT = env.int('JWT_USER_CACHE_TIMEOUT', default=60)
+# Seconds a user's unread notification counter may live before it is recounted
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = env.int('NOTIFICATION_UNREAD_CACHE_TIMEOUT', default=300)
+
+# Push channel (WebSockets served by core.asgi): in-process layer for development and tests
+ASGI_APPLICATION = "core.asgi.application"
+CHANNEL_LAYERS = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
+}
+# Push notification fan-outs in-process when no Celery worker is available (production disables this)
+PUSH_FAN_OUT_EAGER = env.bool('PUSH_FAN_OUT_EAGER', default=True)
+
+# Export jobs: run in-process when no Celery worker is available (production disables this)
+EXPORT_JOBS_EAGER = env.bool('EXPORT_JOBS_EAGER', default=True)
+# Hours a generated export stays downloadable
+EXPORT_JOB_TTL_HOURS = env.int('EXPORT_JOB_TTL_HOURS', default=24)
+# Seconds an export may run; a RUNNING job claimed longer ago than this has lost its worker
+EXPORT_JOB_TIME_LIMIT = env.int('EXPORT_JOB_TIME_LIMIT', default=1800)
+
+# Outbound mail: deliver in-process when no Celery worker is available (production disables this)
+EMAIL_QUEUE_EAGER = env.bool('EMAIL_QUEUE_EAGER', default=True)
+# Delivery attempts per message before it is marked failed
+EMAIL_MAX_ATTEMPTS = env.int('EMAIL_MAX_ATTEMPTS', default=5)
+# Seconds before the first retry; doubles on each further retry, capped at an hour
+EMAIL_RETRY_BACKOFF = env.int('EMAIL_RETRY_BACKOFF', default=60)
+# Seconds a delivery attempt may run; a SENDING batch claimed longer ago than this has lost its worker
+EMAIL_BATCH_TIME_LIMIT = env.int('EMAIL_BATCH_TIME_LIMIT', default=600)
+
+# Request profiling: query count and db/serializer/python time in a Server-Timing header
+API_PROFILING = env.bool('API_PROFILING', default=DEBUG)
+
 # Account Lockout Settings
 ACCOUNT_LOCKOUT_ATTEMPTS = 5
 ACCOUNT_LOCKOUT_DURATION = 30  # minutes
@@ -69,6 +69,16 @@ CACHES = {
     }
 }
 
+# Push channel layer (Redis) shared by the web processes that publish and the ASGI server that streams
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {
+            'hosts': [os.environ.get('CHANNEL_LAYER_REDIS_URL', os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))],
+        },
+    }
+}
+
 # Session configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -81,6 +91,16 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# Export jobs are generated by the celery-exports worker, never in the web process
+EXPORT_JOBS_EAGER = os.environ.get('EXPORT_JOBS_EAGER', 'False').lower() == 'true'
+# Notification mail is delivered by workers on the mail queue so requests never wait on SMTP
+EMAIL_QUEUE_EAGER = os.environ.get('EMAIL_QUEUE_EAGER', 'False').lower() == 'true'
+# Notification fan-outs are pushed by workers so a broadcast request never sends per recipient
+PUSH_FAN_OUT_EAGER = os.environ.get('PUSH_FAN_OUT_EAGER', 'False').lower() == 'true'
+
+# Server-Timing headers expose internals; enable only while investigating
+API_PROFILING = os.environ.get('API_PROFILING', 'False').lower() == 'true'
+
 # Email configuration
 EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
@@ -178,7 +198,7 @@ SIMPLE_JWT = {
 # REST Framework settings for production
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -186,7 +206,7 @@ REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
@@ -1,8 +1,12 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from accounts.models import User
 import uuid
 import re
 from django.utils import timezone
+from sequences.services import next_code
 
 ### ISO Clause Reference Model
 
@@ -24,6 +28,21 @@ class Tag(models.Model):
 
 
 ### Document Folder Model
+class DocumentFolderQuerySet(models.QuerySet):
+    """Document folder querysets with document counts for listings."""
+    
+    def with_document_counts(self):
+        """Load the creator and annotate document_count with one grouped subquery."""
+        counts = (
+            Document.objects.filter(document_type=models.OuterRef('value'), is_active=True)
+            .order_by().values('document_type')
+            .annotate(count=models.Count('pk')).values('count')
+        )
+        return self.select_related('created_by').annotate(
+            document_count=Coalesce(models.Subquery(counts), 0)
+        )
+
+
 class DocumentFolder(models.Model):
     """
     Dynamic folder system for organizing documents.
@@ -46,6 +65,8 @@ class DocumentFolder(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    objects = DocumentFolderQuerySet.as_manager()
+    
     class Meta:
         ordering = ['name']
         verbose_name = "Document Folder"
@@ -56,6 +77,8 @@ class DocumentFolder(models.Model):
     
     def get_document_count(self):
         """Get the number of documents in this folder."""
+        if hasattr(self, 'document_count'):
+            return self.document_count
         return Document.objects.filter(document_type=self.value, is_active=True).count()
     
     def is_empty(self):
@@ -84,6 +107,16 @@ class DocumentFolder(models.Model):
     
  
 ### Document Model
+class DocumentQuerySet(models.QuerySet):
+    """Document querysets prepared for list serializers."""
+    
+    def for_list(self):
+        """Load the users, tags, ISO clauses and distribution list the serializer renders."""
+        return self.select_related(
+            'created_by', 'verified_by', 'approved_by', 'obsoleted_by'
+        ).prefetch_related('tags', 'iso_clauses', 'distribution_list')
+
+
 class Document(models.Model):
     DOC_TYPES = [
         ("POLICY", "Policy"),
@@ -225,6 +258,17 @@ class Document(models.Model):
         help_text="New document version that replaces this one"
     )
 
+    # Full-text search (maintained by the search app)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = DocumentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='document_search_idx'),
+            models.Index(fields=['document_type', 'is_active'], name='document_type_active_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -510,6 +554,21 @@ class ChangeRequest(models.Model):
 # =============================
 # Document Template
 # =============================
+class DocumentTemplateQuerySet(models.QuerySet):
+    """Document template querysets with document counts for listings."""
+    
+    def with_document_counts(self):
+        """Load creator and approver and annotate document_count with one grouped subquery."""
+        counts = (
+            Document.objects.filter(template=models.OuterRef('pk'))
+            .order_by().values('template')
+            .annotate(count=models.Count('pk')).values('count')
+        )
+        return self.select_related('created_by', 'approved_by').annotate(
+            document_count=Coalesce(models.Subquery(counts), 0)
+        )
+
+
 class DocumentTemplate(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -530,6 +589,8 @@ class DocumentTemplate(models.Model):
     approved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='templates_approved')
     approved_at = models.DateTimeField(null=True, blank=True)
     
+    objects = DocumentTemplateQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.name} (v{self.version})"
     
@@ -747,11 +808,17 @@ class Record(models.Model):
     notification_sent = models.BooleanField(default=False)
     email_sent = models.BooleanField(default=False)
 
+    # Full-text search (maintained by the search app)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['year', 'status']),
             models.Index(fields=['submitted_by', 'year']),
+            models.Index(fields=['-created_at'], name='record_created_idx'),
+            models.Index(fields=['submitted_by', '-created_at'], name='record_submitter_created_idx'),
+            GinIndex(fields=['search_vector'], name='record_search_idx'),
         ]
 
     def __str__(self):
@@ -804,25 +871,7 @@ class Record(models.Model):
         if is_new:
             # Generate record number: REC-YYYY-NNN
             if not self.record_number:
-                year = self.year
-                # Get count of records for this year (including this one)
-                # Use a more reliable method to avoid race conditions
-                existing_count = Record.objects.filter(year=year).count()
-                # Check for any records with the same number pattern to avoid duplicates
-                max_num = 0
-                for existing_record in Record.objects.filter(year=year).exclude(record_number__isnull=True):
-                    if existing_record.record_number and existing_record.record_number.startswith(f"REC-{year}-"):
-                        try:
-                            num_part = existing_record.record_number.split('-')[-1]
-                            num = int(num_part)
-                            if num > max_num:
-                                max_num = num
-                        except (ValueError, IndexError):
-                            pass
-                
-                # Use max found + 1, or existing count + 1 if no numbers found
-                next_num = max(max_num + 1, existing_count + 1)
-                self.record_number = f"REC-{year}-{next_num:03d}"
+                self.record_number = next_code(Record, 'record_number', 'REC', year=self.year, width=3)
             
             # Auto-approve for Admin and HSSE Manager
             if self.submitted_by and (self.submitted_by.is_superuser or self.submitted_by.position == 'HSSE MANAGER'):
@@ -896,19 +945,17 @@ class Record(models.Model):
     def _create_submission_notification(self):
         """Create in-app notification for HSSE Managers when record is submitted."""
         try:
-            from accounts.models import Notification
+            from accounts.services import notify
             
             # Notify all HSSE Managers
-            hsse_managers = User.objects.filter(position='HSSE MANAGER')
-            for manager in hsse_managers:
-                Notification.objects.create(
-                    user=manager,
-                    notification_type='RECORD_SUBMITTED',
-                    title=f'New Record Submitted: {self.record_number}',
-                    message=f'{self.submitted_by.get_full_name if self.submitted_by else "Unknown"} submitted a record for "{self.form_document.title}".',
-                    related_object_id=str(self.id),
-                    related_object_type='record',
-                )
+            notify(
+                User.objects.filter(position='HSSE MANAGER'),
+                notification_type='RECORD_SUBMITTED',
+                title=f'New Record Submitted: {self.record_number}',
+                message=f'{self.submitted_by.get_full_name if self.submitted_by else "Unknown"} submitted a record for "{self.form_document.title}".',
+                related_object_id=str(self.id),
+                related_object_type='record',
+            )
             self.notification_sent = True
             Record.objects.filter(pk=self.pk).update(notification_sent=True)
         except Exception as e:
@@ -922,21 +969,10 @@ class Record(models.Model):
             return
         
         try:
-            from accounts.models import Notification
-            from django.core.mail import send_mail
+            from accounts.services import notify
             from django.conf import settings
             
-            # Create in-app notification
-            Notification.objects.create(
-                user=self.submitted_by,
-                notification_type='RECORD_APPROVED',
-                title=f'Record Approved: {self.record_number}',
-                message=f'Your record submission for "{self.form_document.title}" has been approved by {self.reviewed_by.get_full_name if self.reviewed_by else "HSSE Manager"}.',
-                related_object_id=str(self.id),
-                related_object_type='record',
-            )
-            
-            # Send email
+            # Compose email
             subject = f'✅ Record Approved: {self.record_number}'
             message = f"""
 Hello {self.submitted_by.get_full_name},
@@ -957,14 +993,19 @@ Access your records: {settings.FRONTEND_URL}/document-management/records
 This is an automated notification from SafeSphere Document Management System.
 """
             
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[self.submitted_by.email],
-                fail_silently=False,
+            # Create the in-app notification and queue the email
+            notify(
+                [self.submitted_by],
+                notification_type='RECORD_APPROVED',
+                title=f'Record Approved: {self.record_number}',
+                message=f'Your record submission for "{self.form_document.title}" has been approved by {self.reviewed_by.get_full_name if self.reviewed_by else "HSSE Manager"}.',
+                related_object_id=str(self.id),
+                related_object_type='record',
+                email_subject=subject,
+                email_body=message,
             )
             
+            # Queued for delivery; the email batch tracks whether it went out
             self.email_sent = True
             Record.objects.filter(pk=self.pk).update(email_sent=True)
             
@@ -979,21 +1020,10 @@ This is an automated notification from SafeSphere Document Management System.
             return
         
         try:
-            from accounts.models import Notification
-            from django.core.mail import send_mail
+            from accounts.services import notify
             from django.conf import settings
             
-            # Create in-app notification
-            Notification.objects.create(
-                user=self.submitted_by,
-                notification_type='RECORD_REJECTED',
-                title=f'Record Rejected: {self.record_number}',
-                message=f'Your record submission for "{self.form_document.title}" was rejected. Reason: {self.rejection_reason}',
-                related_object_id=str(self.id),
-                related_object_type='record',
-            )
-            
-            # Send email
+            # Compose email
             subject = f'❌ Record Rejected: {self.record_number}'
             message = f"""
 Hello {self.submitted_by.get_full_name},
@@ -1019,14 +1049,19 @@ If you have questions, please contact the HSSE Manager.
 This is an automated notification from SafeSphere Document Management System.
 """
             
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[self.submitted_by.email],
-                fail_silently=False,
+            # Create the in-app notification and queue the email
+            notify(
+                [self.submitted_by],
+                notification_type='RECORD_REJECTED',
+                title=f'Record Rejected: {self.record_number}',
+                message=f'Your record submission for "{self.form_document.title}" was rejected. Reason: {self.rejection_reason}',
+                related_object_id=str(self.id),
+                related_object_type='record',
+                email_subject=subject,
+                email_body=message,
             )
             
+            # Queued for delivery; the email batch tracks whether it went out
             self.email_sent = True
             Record.objects.filter(pk=self.pk).update(email_sent=True)
             
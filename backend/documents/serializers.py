@@ -136,6 +136,24 @@ class DocumentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class DocumentSummarySerializer(serializers.ModelSerializer):
+    """Compact document representation for nesting in other payloads."""
+    file_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Document
+        fields = ['id', 'title', 'document_type', 'version', 'status', 'file_url']
+        read_only_fields = fields
+
+    def get_file_url(self, obj):
+        if obj.file:
+            request = self.context.get('request')
+            if request is not None:
+                return request.build_absolute_uri(obj.file.url)
+            return obj.file.url
+        return None
+
+
 class ApprovalWorkflowSerializer(serializers.ModelSerializer):
     performed_by_name = serializers.SerializerMethodField()
 
@@ -193,6 +211,8 @@ class DocumentTemplateSerializer(serializers.ModelSerializer):
         return obj.approved_by.get_full_name if obj.approved_by else None
 
     def get_document_count(self, obj):
+        if hasattr(obj, 'document_count'):
+            return obj.document_count
         return obj.documents.count()
 
 
@@ -218,12 +238,24 @@ class CreateDocumentFromTemplateSerializer(serializers.Serializer):
 # =============================
 
 class RecordSerializer(serializers.ModelSerializer):
+    """
+    Record with compact nested documents.
+
+    Fields named in ``EXPANDABLE_FIELDS`` and listed in the ``expand``
+    serializer context (set from ``?expand=`` by RecordViewSet) are rendered
+    with their full serializer instead.
+    """
+    EXPANDABLE_FIELDS = {
+        'form_document': DocumentSerializer,
+        'source_document': DocumentSerializer,
+    }
+
     submitted_by = UserMeSerializer(read_only=True)
     reviewed_by = UserMeSerializer(read_only=True)
     locked_by = UserMeSerializer(read_only=True)
-    form_document = DocumentSerializer(read_only=True)
+    form_document = DocumentSummarySerializer(read_only=True)
     form_document_id = serializers.UUIDField(write_only=True, required=False, allow_null=True)
-    source_document = DocumentSerializer(read_only=True)
+    source_document = DocumentSummarySerializer(read_only=True)
     source_document_id = serializers.UUIDField(write_only=True, required=False, allow_null=True)
     parent_record = serializers.SerializerMethodField()
     submitted_file = serializers.FileField(validators=[validate_file_type])
@@ -269,6 +301,13 @@ class RecordSerializer(serializers.ModelSerializer):
             'notification_sent', 'email_sent'
         ]
     
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.context.get('expand', ()):
+            if name in self.EXPANDABLE_FIELDS:
+                fields[name] = self.EXPANDABLE_FIELDS[name](read_only=True)
+        return fields
+    
     def validate_title(self, value):
         """Ensure title is provided and not empty."""
         if not value or not value.strip():
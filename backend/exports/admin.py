@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['export_type', 'status', 'progress', 'requested_by', 'created_at', 'completed_at', 'expires_at']
+    list_filter = ['export_type', 'status', 'created_at']
+    search_fields = ['requested_by__email']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'id', 'export_type', 'parameters', 'status', 'progress', 'result_file', 'error_message',
+        'requested_by', 'created_at', 'started_at', 'completed_at', 'expires_at',
+    ]
@@ -0,0 +1,62 @@
+"""
+Background export jobs: reports and registers generated outside the request cycle.
+"""
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+import uuid
+
+User = get_user_model()
+
+
+class ExportJob(models.Model):
+    """A queued report/export, its progress and the generated file."""
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    EXPORT_TYPE_CHOICES = [
+        ('RISK_REGISTER_XLSX', 'Risk Register (Excel)'),
+        ('RISK_REGISTER_CSV', 'Risk Register (CSV)'),
+        ('AUDIT_FINDING_PDF', 'Audit Finding Report (PDF)'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    export_type = models.CharField(max_length=50, choices=EXPORT_TYPE_CHOICES)
+    parameters = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    result_file = models.FileField(upload_to='exports/%Y/%m/', null=True, blank=True)
+    error_message = models.TextField(blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, help_text="Result file is deleted after this time")
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['requested_by', 'created_at']),
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_export_type_display()} - {self.status}"
+
+    @property
+    def is_expired(self):
+        return self.expires_at is not None and self.expires_at <= timezone.now()
+
+    @property
+    def is_downloadable(self):
+        return self.status == 'COMPLETED' and bool(self.result_file) and not self.is_expired
+
+    def set_progress(self, progress):
+        """Persist progress without touching the rest of the row."""
+        self.progress = max(0, min(int(progress), 100))
+        ExportJob.objects.filter(pk=self.pk).update(progress=self.progress)
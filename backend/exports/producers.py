@@ -0,0 +1,110 @@
+"""
+Export producers.
+
+A producer turns an export job's parameters into a file. It is called with
+the job parameters and a ``progress(percent)`` callback and returns
+``(filename, fileobj)``; the caller stores the file and closes ``fileobj``.
+Parameters are checked when the job is created, see ``validate_parameters``.
+"""
+import tempfile
+from datetime import datetime
+from io import BytesIO
+
+from rest_framework import serializers
+
+
+class RiskRegisterParametersSerializer(serializers.Serializer):
+    """Filters accepted by the risk register exports."""
+    status = serializers.CharField(required=False, allow_blank=True)
+    category = serializers.CharField(required=False, allow_blank=True)
+    risk_level = serializers.ChoiceField(choices=['LOW', 'MEDIUM', 'HIGH'], required=False)
+
+
+class AuditFindingParametersSerializer(serializers.Serializer):
+    """Parameters for an audit finding PDF report."""
+    finding_id = serializers.UUIDField()
+
+    def validate_finding_id(self, value):
+        from audits.models import AuditFinding
+
+        if not AuditFinding.objects.filter(pk=value).exists():
+            raise serializers.ValidationError('Finding not found')
+        # Stored in the job's JSON parameters
+        return str(value)
+
+
+def _timestamp():
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+def _risk_register_queryset(parameters):
+    from risks.register_export import risk_register_queryset
+
+    return risk_register_queryset(
+        status=parameters.get('status'),
+        category=parameters.get('category'),
+        risk_level=parameters.get('risk_level'),
+    )
+
+
+def _row_progress(queryset, progress):
+    """Map rows written to a percentage, leaving headroom for saving the file."""
+    total = queryset.count() or 1
+    return lambda done: progress(90 * done // total)
+
+
+def risk_register_xlsx(parameters, progress):
+    """Risk register workbook, written in write-only mode to a temporary file."""
+    from risks import register_export
+
+    queryset = _risk_register_queryset(parameters)
+    fileobj = tempfile.TemporaryFile()
+    register_export.write_xlsx(queryset, fileobj, progress=_row_progress(queryset, progress))
+    fileobj.seek(0)
+    return f'Risk_Register_{_timestamp()}.xlsx', fileobj
+
+
+def risk_register_csv(parameters, progress):
+    """Risk register as CSV, written line by line to a temporary file."""
+    from risks import register_export
+
+    queryset = _risk_register_queryset(parameters)
+    fileobj = tempfile.TemporaryFile()
+    for line in register_export.iter_csv(queryset, progress=_row_progress(queryset, progress)):
+        fileobj.write(line.encode('utf-8'))
+    fileobj.seek(0)
+    return f'Risk_Register_{_timestamp()}.csv', fileobj
+
+
+def audit_finding_pdf(parameters, progress):
+    """ReportLab report for a single audit finding."""
+    from audits.models import AuditFinding
+    from audits.pdf_report import generate_finding_pdf
+
+    finding = AuditFinding.objects.select_related(
+        'audit_plan', 'audit_plan__audit_type', 'audit_plan__lead_auditor',
+        'iso_clause', 'identified_by'
+    ).prefetch_related(
+        'question_responses__question__category',
+        'capas__responsible_person'
+    ).get(pk=parameters['finding_id'])
+    progress(10)
+    pdf_content = generate_finding_pdf(finding)
+    filename = f"Audit_Finding_{finding.finding_code}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    return filename, BytesIO(pdf_content)
+
+
+# export_type -> (producer, parameters serializer)
+PRODUCERS = {
+    'RISK_REGISTER_XLSX': (risk_register_xlsx, RiskRegisterParametersSerializer),
+    'RISK_REGISTER_CSV': (risk_register_csv, RiskRegisterParametersSerializer),
+    'AUDIT_FINDING_PDF': (audit_finding_pdf, AuditFindingParametersSerializer),
+}
+
+
+def validate_parameters(export_type, parameters):
+    """Return cleaned parameters for ``export_type`` or raise ``serializers.ValidationError``."""
+    _, parameters_serializer = PRODUCERS[export_type]
+    serializer = parameters_serializer(data=parameters or {})
+    serializer.is_valid(raise_exception=True)
+    return dict(serializer.validated_data)
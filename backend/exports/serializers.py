@@ -0,0 +1,29 @@
+from rest_framework import serializers
+from django.urls import reverse
+from .models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    requested_by_name = serializers.CharField(source='requested_by.get_full_name', read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'export_type', 'parameters', 'status', 'progress', 'error_message',
+            'requested_by', 'requested_by_name', 'created_at', 'started_at',
+            'completed_at', 'expires_at', 'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if not obj.is_downloadable:
+            return None
+        url = reverse('export-job-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class ExportJobCreateSerializer(serializers.Serializer):
+    export_type = serializers.ChoiceField(choices=ExportJob.EXPORT_TYPE_CHOICES)
+    parameters = serializers.DictField(required=False, default=dict)
@@ -0,0 +1,119 @@
+"""
+Export job lifecycle: create, enqueue, run and expire.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from core.claims import claim, stale_claims
+
+from .models import ExportJob
+from .producers import PRODUCERS, validate_parameters
+
+logger = logging.getLogger(__name__)
+
+
+def _ttl():
+    return timedelta(hours=getattr(settings, 'EXPORT_JOB_TTL_HOURS', 24))
+
+
+def time_limit():
+    """Seconds an export may run before its worker is presumed dead."""
+    return getattr(settings, 'EXPORT_JOB_TIME_LIMIT', 1800)
+
+
+def create_export_job(user, export_type, parameters=None):
+    """Validate parameters, save a PENDING job and hand it to the worker queue."""
+    job = ExportJob.objects.create(
+        export_type=export_type,
+        parameters=validate_parameters(export_type, parameters),
+        requested_by=user,
+    )
+    enqueue_export_job(job)
+    return job
+
+
+def enqueue_export_job(job):
+    """
+    Queue ``job`` on the exports Celery queue once the current transaction commits.
+
+    With EXPORT_JOBS_EAGER (development and tests, where no worker runs) the
+    job is executed in-process instead.
+    """
+    if getattr(settings, 'EXPORT_JOBS_EAGER', False):
+        run_export_job(job.pk)
+        job.refresh_from_db()
+        return
+
+    from .tasks import generate_export
+
+    transaction.on_commit(lambda: generate_export.delay(str(job.pk)))
+
+
+def run_export_job(job_id):
+    """
+    Run a job's producer and store its file; failures are recorded on the job.
+
+    A redelivered task takes over a RUNNING job whose worker died, once the
+    claim is older than EXPORT_JOB_TIME_LIMIT.
+    """
+    updated = claim(
+        ExportJob.objects.filter(pk=job_id), 'PENDING', 'RUNNING',
+        timedelta(seconds=time_limit()), progress=0,
+    )
+    if not updated:
+        # Running on a live worker, finished, or deleted
+        logger.info(f"Export job {job_id} is not pending; skipping")
+        return
+
+    job = ExportJob.objects.get(pk=job_id)
+    producer, _ = PRODUCERS[job.export_type]
+    try:
+        filename, fileobj = producer(job.parameters, job.set_progress)
+        with fileobj:
+            job.result_file.save(filename, File(fileobj), save=False)
+    except Exception as e:
+        logger.exception(f"Export job {job_id} ({job.export_type}) failed: {e}")
+        job.status = 'FAILED'
+        job.error_message = str(e)
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'completed_at'])
+        return
+
+    job.status = 'COMPLETED'
+    job.progress = 100
+    job.completed_at = timezone.now()
+    job.expires_at = job.completed_at + _ttl()
+    job.save(update_fields=['status', 'progress', 'result_file', 'completed_at', 'expires_at'])
+    logger.info(f"Export job {job_id} ({job.export_type}) completed: {job.result_file.name}")
+
+
+def fail_stale_export_jobs(now=None):
+    """Mark RUNNING jobs whose worker died as FAILED; returns the number of jobs failed."""
+    now = now or timezone.now()
+    failed = stale_claims(
+        ExportJob.objects.all(), 'RUNNING', timedelta(seconds=time_limit()), now=now
+    ).update(
+        status='FAILED',
+        error_message='The export stopped before finishing. Please request it again.',
+        completed_at=now,
+    )
+    if failed:
+        logger.warning(f"Marked {failed} stalled export jobs as failed")
+    return failed
+
+
+def delete_expired_exports(now=None):
+    """Delete expired jobs and their files; returns the number of jobs removed."""
+    expired = ExportJob.objects.filter(expires_at__lte=now or timezone.now())
+    count = 0
+    for job in expired.iterator():
+        if job.result_file:
+            job.result_file.delete(save=False)
+        job.delete()
+        count += 1
+    return count
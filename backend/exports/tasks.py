@@ -0,0 +1,30 @@
+"""
+Celery tasks for export jobs; routed to the dedicated ``exports`` queue.
+"""
+from celery import shared_task
+from django.conf import settings
+
+from .services import delete_expired_exports, fail_stale_export_jobs, run_export_job
+
+
+# The soft limit fails the job cleanly; the hard limit is a backstop for a hung producer
+@shared_task(
+    soft_time_limit=settings.EXPORT_JOB_TIME_LIMIT - 60,
+    time_limit=settings.EXPORT_JOB_TIME_LIMIT,
+)
+def generate_export(job_id):
+    """
+    Generate the file for an export job
+    """
+    run_export_job(job_id)
+    return job_id
+
+
+@shared_task
+def cleanup_expired_exports():
+    """
+    Remove export files past their expiry and fail jobs whose worker died
+    """
+    failed = fail_stale_export_jobs()
+    removed = delete_expired_exports()
+    return f"Removed {removed} expired exports, failed {failed} stalled jobs"
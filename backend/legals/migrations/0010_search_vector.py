@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:19
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vectors(apps, schema_editor):
+    LawResource = apps.get_model('legals', 'LawResource')
+    LawResource.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='simple')
+        + SearchVector('act_number', weight='A', config='simple')
+        + SearchVector('summary', weight='B', config='simple')
+        + SearchVector('key_provisions', weight='C', config='simple')
+        + SearchVector('applicability', weight='C', config='simple')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('legals', '0009_alter_lawresource_act_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lawresource',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='lawresource',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='lawresource_search_idx'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django_countries.fields import CountryField
 from django.conf import settings
 
@@ -15,6 +17,15 @@ class LawCategory(models.Model):
         verbose_name = "Law Category"
         verbose_name_plural = "Law Categories"
 
+class LawResourceQuerySet(models.QuerySet):
+    """Law resource querysets prepared for list serializers."""
+
+    def for_list(self):
+        """Load the category and annotate related_obligations_count."""
+        return self.select_related('category').annotate(
+            related_obligations_count=models.Count('legal_register_entries')
+        )
+
 class LawResource(models.Model):
     JURISDICTION_CHOICES = [
         ('district', 'District'),
@@ -42,6 +53,15 @@ class LawResource(models.Model):
     penalties = models.TextField(blank=True, help_text='Penalties for non-compliance')
     applicability = models.TextField(blank=True, help_text='Who/what this law applies to')
     official_url = models.URLField(blank=True, help_text='Link to official government source')
+    # Full-text search (maintained by the search app)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = LawResourceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='lawresource_search_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -15,10 +15,12 @@ class LawResourceSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = LawResource
-        fields = '__all__'
+        exclude = ['search_vector']
     
     def get_related_obligations_count(self, obj):
         """Count obligations that reference this law"""
+        if hasattr(obj, 'related_obligations_count'):
+            return obj.related_obligations_count
         return obj.legal_register_entries.count()
 
 class LawResourceChangeSerializer(serializers.ModelSerializer):
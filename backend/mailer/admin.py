@@ -0,0 +1,20 @@
+from django.contrib import admin
+from .models import EmailBatch, OutboundEmail
+
+
+class OutboundEmailInline(admin.TabularInline):
+    model = OutboundEmail
+    extra = 0
+    can_delete = False
+    fields = ['subject', 'to', 'status', 'attempts', 'last_error', 'sent_at']
+    readonly_fields = fields
+
+
+@admin.register(EmailBatch)
+class EmailBatchAdmin(admin.ModelAdmin):
+    list_display = ['purpose', 'status', 'attempts', 'requested_by', 'created_at', 'completed_at']
+    list_filter = ['purpose', 'status', 'created_at']
+    search_fields = ['messages__subject']
+    ordering = ['-created_at']
+    readonly_fields = ['id', 'purpose', 'status', 'attempts', 'requested_by', 'created_at', 'claimed_at', 'completed_at']
+    inlines = [OutboundEmailInline]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-17 05:35
+
+from django.db import migrations, models
+
+
+def stamp_sending_batches(apps, schema_editor):
+    # Batches already stuck in SENDING become recoverable once their age passes the time limit
+    EmailBatch = apps.get_model('mailer', 'EmailBatch')
+    EmailBatch.objects.filter(status='SENDING').update(claimed_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mailer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailbatch',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a worker last started sending', null=True),
+        ),
+        migrations.RunPython(stamp_sending_batches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+from .models import EmailBatch, OutboundEmail
+
+
+class OutboundEmailSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = OutboundEmail
+        fields = ['id', 'subject', 'to', 'status', 'attempts', 'last_error', 'sent_at']
+        read_only_fields = fields
+
+
+class EmailBatchSerializer(serializers.ModelSerializer):
+    messages = OutboundEmailSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = EmailBatch
+        fields = [
+            'id', 'purpose', 'status', 'attempts', 'requested_by',
+            'created_at', 'completed_at', 'messages',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,195 @@
+"""
+Outbound mail lifecycle: queue rendered messages, deliver them in batches, retry.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.claims import claim, stale_claims
+from .models import EmailBatch, OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def _max_attempts():
+    return getattr(settings, 'EMAIL_MAX_ATTEMPTS', 5)
+
+
+def time_limit():
+    """Seconds a delivery attempt may run before its worker is presumed dead."""
+    return getattr(settings, 'EMAIL_BATCH_TIME_LIMIT', 600)
+
+
+def retry_delay(retries):
+    """Seconds to wait before retry number ``retries + 1``: doubling, capped at an hour."""
+    return min(getattr(settings, 'EMAIL_RETRY_BACKOFF', 60) * 2 ** retries, 3600)
+
+
+def queue_emails(purpose, messages, requested_by=None):
+    """
+    Save rendered messages as one batch and hand it to the mail queue.
+
+    Each message is a dict with ``subject``, ``body`` and ``to`` (a list of
+    addresses), and optionally ``html_body`` and ``from_email``. Messages
+    without recipients are dropped. Returns the EmailBatch, or None when
+    nothing is left to send.
+    """
+    rows = [
+        OutboundEmail(
+            subject=message['subject'][:255],
+            body=message['body'],
+            html_body=message.get('html_body', ''),
+            from_email=message.get('from_email') or settings.DEFAULT_FROM_EMAIL,
+            to=[address for address in message['to'] if address],
+        )
+        for message in messages
+    ]
+    rows = [row for row in rows if row.to]
+    if not rows:
+        return None
+
+    with transaction.atomic():
+        batch = EmailBatch.objects.create(purpose=purpose, requested_by=requested_by)
+        for row in rows:
+            row.batch = batch
+        OutboundEmail.objects.bulk_create(rows)
+    enqueue_batch(batch)
+    return batch
+
+
+def queue_email(purpose, subject, body, to, html_body='', requested_by=None):
+    """Queue a single message; see queue_emails."""
+    return queue_emails(
+        purpose, [{'subject': subject, 'body': body, 'to': to, 'html_body': html_body}], requested_by
+    )
+
+
+def enqueue_batch(batch):
+    """
+    Queue ``batch`` on the mail Celery queue once the current transaction commits.
+
+    With EMAIL_QUEUE_EAGER (development and tests, where no worker runs) the
+    batch is delivered in-process in a single attempt instead.
+    """
+    if getattr(settings, 'EMAIL_QUEUE_EAGER', False):
+        deliver_batch(batch.pk, final=True)
+        batch.refresh_from_db()
+        return
+
+    transaction.on_commit(lambda: _dispatch_batch(batch.pk))
+
+
+def _dispatch_batch(batch_id):
+    # Runs after commit; a broker outage must not fail the request that queued the mail
+    from .tasks import deliver_email_batch
+
+    try:
+        deliver_email_batch.delay(str(batch_id))
+    except Exception as e:
+        logger.error(f"Failed to hand email batch {batch_id} to the mail queue: {e}")
+
+
+def _build_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def deliver_batch(batch_id, final=False):
+    """
+    Send a batch's queued messages over one connection; returns how many are still queued.
+
+    A failed message stays QUEUED for the next attempt until it has been
+    tried EMAIL_MAX_ATTEMPTS times, or ``final`` is set, and is then FAILED.
+
+    A SENDING batch whose worker died is taken over once the claim is older
+    than EMAIL_BATCH_TIME_LIMIT. Message statuses are saved at the end of an
+    attempt, so messages the dead worker had already sent go out again.
+    """
+    updated = claim(
+        EmailBatch.objects.filter(pk=batch_id), 'QUEUED', 'SENDING',
+        timedelta(seconds=time_limit()), claimed_at='claimed_at', attempts=F('attempts') + 1,
+    )
+    if not updated:
+        # Being delivered by a live worker, finished, or deleted
+        logger.info(f"Email batch {batch_id} is not queued; skipping")
+        return 0
+
+    pending = list(OutboundEmail.objects.filter(batch_id=batch_id, status='QUEUED'))
+    sent = set()
+    errors = {}
+    try:
+        with get_connection(fail_silently=False) as connection:
+            for email in pending:
+                try:
+                    connection.send_messages([_build_message(email, connection)])
+                    sent.add(email.pk)
+                except Exception as e:
+                    errors[email.pk] = e
+    except Exception as e:
+        # The connection failed to open or dropped; nothing unsent went out
+        for email in pending:
+            if email.pk not in sent:
+                errors.setdefault(email.pk, e)
+
+    now = timezone.now()
+    for email in pending:
+        email.attempts += 1
+        error = errors.get(email.pk)
+        if error is None:
+            email.status = 'SENT'
+            email.sent_at = now
+            email.last_error = ''
+        else:
+            email.last_error = str(error)
+            if final or email.attempts >= _max_attempts():
+                email.status = 'FAILED'
+    OutboundEmail.objects.bulk_update(pending, ['status', 'attempts', 'last_error', 'sent_at'])
+
+    remaining = sum(email.status == 'QUEUED' for email in pending)
+    statuses = set(OutboundEmail.objects.filter(batch_id=batch_id).values_list('status', flat=True))
+    if remaining:
+        batch_status = 'QUEUED'
+    elif statuses == {'SENT'}:
+        batch_status = 'SENT'
+    elif 'SENT' in statuses:
+        batch_status = 'PARTIAL'
+    else:
+        batch_status = 'FAILED'
+    EmailBatch.objects.filter(pk=batch_id).update(
+        status=batch_status, completed_at=None if remaining else now
+    )
+
+    if errors:
+        logger.warning(
+            f"Email batch {batch_id}: {len(pending) - len(errors)} sent, {len(errors)} failed "
+            f"({remaining} to retry): {next(iter(errors.values()))}"
+        )
+    else:
+        logger.info(f"Email batch {batch_id}: {len(pending)} sent")
+    return remaining
+
+
+def requeue_stale_batches(now=None):
+    """Queue SENDING batches whose worker died for another attempt; returns how many."""
+    stale = list(stale_claims(
+        EmailBatch.objects.all(), 'SENDING', timedelta(seconds=time_limit()),
+        claimed_at='claimed_at', now=now,
+    ))
+    for batch in stale:
+        enqueue_batch(batch)
+    if stale:
+        logger.warning(f"Requeued {len(stale)} stalled email batches")
+    return len(stale)
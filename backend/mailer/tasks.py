@@ -0,0 +1,27 @@
+"""
+Celery tasks for outbound mail; routed to the ``mail`` queue.
+"""
+from celery import shared_task
+from django.conf import settings
+
+from .services import deliver_batch, requeue_stale_batches, retry_delay
+
+
+# Retries are bounded per message by EMAIL_MAX_ATTEMPTS, after which it is FAILED.
+# The time limit ends a hung attempt before its claim on the batch goes stale.
+@shared_task(bind=True, max_retries=None, time_limit=settings.EMAIL_BATCH_TIME_LIMIT)
+def deliver_email_batch(self, batch_id):
+    """
+    Deliver a batch, retrying its failed messages with exponential backoff
+    """
+    if deliver_batch(batch_id):
+        raise self.retry(countdown=retry_delay(self.request.retries))
+    return batch_id
+
+
+@shared_task
+def requeue_stale_email_batches():
+    """
+    Queue another attempt for batches whose worker died mid-send
+    """
+    return f"Requeued {requeue_stale_batches()} stalled email batches"
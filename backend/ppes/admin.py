@@ -1,8 +1,10 @@
+from django import forms
 from django.contrib import admin
 from .models import (
     PPECategory, Vendor, PPEPurchase, PPEInventory, PPEIssue, 
-    PPERequest, PPEDamageReport, PPETransfer, PPEReturn
+    PPERequest, PPEDamageReport, PPETransfer, PPEReturn, PPEStockMovement
 )
+from .services import set_stock_level
 
 
 @admin.register(PPECategory)
@@ -52,14 +54,64 @@ class PPEPurchaseAdmin(admin.ModelAdmin):
     date_hierarchy = 'purchase_date'
 
 
+class PPEInventoryAdminForm(forms.ModelForm):
+    """Inventory form whose stock corrections are recorded in the ledger."""
+    corrected_stock = forms.IntegerField(
+        required=False,
+        help_text="Counted stock; the difference is recorded as an adjustment movement"
+    )
+    adjustment_notes = forms.CharField(required=False, widget=forms.Textarea(attrs={'rows': 2}))
+
+    class Meta:
+        model = PPEInventory
+        fields = ['ppe_category']
+
+
 @admin.register(PPEInventory)
 class PPEInventoryAdmin(admin.ModelAdmin):
+    form = PPEInventoryAdminForm
     list_display = ['ppe_category', 'current_stock', 'total_received', 'total_issued', 'total_damaged', 'total_expired', 'is_low_stock', 'last_updated']
     list_filter = ['last_updated', 'ppe_category']
     search_fields = ['ppe_category__name']
     ordering = ['ppe_category__name']
-    readonly_fields = ['last_updated']
-    list_editable = ['current_stock']
+    readonly_fields = [
+        'current_stock', 'total_received', 'total_issued', 'total_damaged', 'total_expired', 'last_updated'
+    ]
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj:
+            return ['ppe_category'] + self.readonly_fields
+        return self.readonly_fields
+
+    def save_model(self, request, obj, form, change):
+        # Counters only move through the ledger; saving the loaded row would
+        # overwrite movements applied since the form was opened
+        if not change:
+            super().save_model(request, obj, form, change)
+        corrected_stock = form.cleaned_data.get('corrected_stock')
+        if corrected_stock is not None:
+            set_stock_level(
+                obj.ppe_category_id,
+                corrected_stock,
+                notes=form.cleaned_data.get('adjustment_notes', ''),
+                created_by=request.user,
+            )
+            obj.refresh_from_db()
+
+
+@admin.register(PPEStockMovement)
+class PPEStockMovementAdmin(admin.ModelAdmin):
+    list_display = ['ppe_category', 'movement_type', 'quantity', 'source_type', 'source_id', 'created_by', 'created_at']
+    list_filter = ['movement_type', 'source_type', 'ppe_category', 'created_at']
+    search_fields = ['ppe_category__name', 'notes']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'ppe_category', 'movement_type', 'quantity', 'source_type', 'source_id',
+        'notes', 'created_by', 'created_at'
+    ]
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(PPEIssue)
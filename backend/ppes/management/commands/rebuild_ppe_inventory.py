@@ -0,0 +1,50 @@
+"""
+Management command to rebuild and verify PPE inventory from the stock movement ledger.
+"""
+from django.core.management.base import BaseCommand
+from ppes.models import PPECategory
+from ppes.services import backfill_stock_ledger, reconcile_inventory
+
+
+class Command(BaseCommand):
+    help = 'Rebuild PPEInventory totals from the PPEStockMovement ledger (use --verify to only report drift)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Report inventory rows that disagree with the ledger without changing them',
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='First seed ledger entries for receipts and active issues recorded before the ledger existed',
+        )
+
+    def handle(self, *args, **options):
+        verify_only = options['verify']
+
+        if options['backfill']:
+            if verify_only:
+                self.stdout.write(self.style.WARNING('--backfill is ignored with --verify'))
+            else:
+                created = backfill_stock_ledger()
+                self.stdout.write(self.style.NOTICE(f'Backfilled {created} ledger movements'))
+
+        drift = reconcile_inventory(commit=not verify_only)
+        names = dict(PPECategory.objects.filter(
+            id__in=[category_id for category_id, _ in drift]
+        ).values_list('id', 'name'))
+
+        for category_id, changes in drift:
+            details = ', '.join(
+                f'{field}: {actual} -> {expected}' for field, (actual, expected) in changes.items()
+            )
+            self.stdout.write(f'{names.get(category_id, category_id)}: {details}')
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Inventory matches the stock ledger.'))
+        elif verify_only:
+            self.stdout.write(self.style.ERROR(f'{len(drift)} inventory records disagree with the ledger.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(drift)} inventory records from the ledger.'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ppes', '0003_ppepurchase_actual_delivery_date_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ppeinventory',
+            name='current_stock',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='PPEStockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movement_type', models.CharField(choices=[('RECEIPT', 'Receipt'), ('ISSUE', 'Issue'), ('DAMAGE', 'Damage'), ('EXPIRY', 'Expiry'), ('ADJUSTMENT', 'Adjustment')], max_length=20)),
+                ('quantity', models.IntegerField(help_text='Signed quantity; negative values reverse an earlier movement')),
+                ('source_type', models.CharField(choices=[('RECEIPT', 'Purchase Receipt'), ('ISSUE', 'PPE Issue'), ('MANUAL', 'Manual')], default='MANUAL', max_length=20)),
+                ('source_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ppe_stock_movements', to=settings.AUTH_USER_MODEL)),
+                ('ppe_category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='ppes.ppecategory')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['source_type', 'source_id'], name='ppes_ppesto_source__a22289_idx'), models.Index(fields=['ppe_category', 'movement_type'], name='ppes_ppesto_ppe_cat_743196_idx')],
+            },
+        ),
+    ]
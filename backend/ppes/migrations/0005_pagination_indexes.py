@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ppes', '0004_stock_movement_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ppeissue',
+            index=models.Index(fields=['-issue_date'], name='ppeissue_issue_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ppeissue',
+            index=models.Index(fields=['employee', '-issue_date'], name='ppeissue_employee_date_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-17 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ppes', '0005_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ppeinventory',
+            name='total_damaged',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='ppeinventory',
+            name='total_expired',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='ppeinventory',
+            name='total_issued',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='ppeinventory',
+            name='total_received',
+            field=models.IntegerField(default=0),
+        ),
+    ]
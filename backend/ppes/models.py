@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Sum
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django_countries.fields import CountryField
 from datetime import timedelta
+from sequences.services import next_code
 
 User = get_user_model()
 
@@ -96,25 +98,7 @@ class PPEPurchase(models.Model):
         """Generate a unique PO number with format: PO-YYYY-XXXX"""
         from datetime import datetime
         
-        current_year = datetime.now().year
-        
-        # Get the last PO number for this year
-        last_po = PPEPurchase.objects.filter(
-            purchase_order_number__startswith=f'PO-{current_year}-'
-        ).order_by('-purchase_order_number').first()
-        
-        if last_po:
-            # Extract the number part and increment
-            try:
-                last_number = int(last_po.purchase_order_number.split('-')[-1])
-                new_number = last_number + 1
-            except (ValueError, IndexError):
-                new_number = 1
-        else:
-            new_number = 1
-        
-        # Format: PO-YYYY-XXXX (4-digit number)
-        return f'PO-{current_year}-{new_number:04d}'
+        return next_code(PPEPurchase, 'purchase_order_number', 'PO', year=datetime.now().year)
 
     @property
     def is_received(self):
@@ -133,11 +117,13 @@ class PPEPurchase(models.Model):
 class PPEInventory(models.Model):
     """Model for tracking current PPE inventory levels."""
     ppe_category = models.OneToOneField(PPECategory, on_delete=models.CASCADE, related_name='inventory')
-    total_received = models.PositiveIntegerField(default=0)
-    total_issued = models.PositiveIntegerField(default=0)
-    total_damaged = models.PositiveIntegerField(default=0)
-    total_expired = models.PositiveIntegerField(default=0)
-    current_stock = models.PositiveIntegerField(default=0)
+    # Signed like current_stock: ledger reversals can briefly take a total
+    # below zero before the backfill has recorded what they reverse
+    total_received = models.IntegerField(default=0)
+    total_issued = models.IntegerField(default=0)
+    total_damaged = models.IntegerField(default=0)
+    total_expired = models.IntegerField(default=0)
+    current_stock = models.IntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
@@ -153,6 +139,21 @@ class PPEInventory(models.Model):
         self.current_stock = self.total_received - self.total_issued - self.total_damaged - self.total_expired
         self.save()
 
+    @classmethod
+    def apply_movement(cls, ppe_category_id, movement_type, quantity):
+        """Atomically apply a stock movement delta with F expressions."""
+        field, sign = PPEStockMovement.INVENTORY_EFFECTS[movement_type]
+        updates = {
+            'current_stock': F('current_stock') + sign * quantity,
+            'last_updated': timezone.now(),
+        }
+        if field:
+            updates[field] = F(field) + quantity
+
+        if not cls.objects.filter(ppe_category_id=ppe_category_id).update(**updates):
+            cls.objects.get_or_create(ppe_category_id=ppe_category_id)
+            cls.objects.filter(ppe_category_id=ppe_category_id).update(**updates)
+
     class Meta:
         verbose_name_plural = "PPE Inventories"
 
@@ -199,6 +200,10 @@ class PPEIssue(models.Model):
 
     class Meta:
         ordering = ['-issue_date']
+        indexes = [
+            models.Index(fields=['-issue_date'], name='ppeissue_issue_date_idx'),
+            models.Index(fields=['employee', '-issue_date'], name='ppeissue_employee_date_idx'),
+        ]
 
 
 class PPERequest(models.Model):
@@ -327,22 +332,87 @@ class PPEPurchaseReceipt(models.Model):
             self.purchase.received_by = self.received_by
             self.purchase.save()
         
-        # Update inventory with received quantity (minus damaged)
-        net_quantity = self.received_quantity - self.damaged_quantity
-        if net_quantity > 0:
-            inventory, created = PPEInventory.objects.get_or_create(
-                ppe_category=self.purchase.ppe_category,
-                defaults={
-                    'total_received': net_quantity,
-                    'current_stock': net_quantity
-                }
-            )
-            if not created:
-                inventory.total_received += net_quantity
-                inventory.current_stock += net_quantity
-                inventory.save()
-        
+        # Inventory is updated from the stock movement ledger (see ppes.signals)
         super().save(*args, **kwargs)
 
+    @property
+    def net_quantity(self):
+        """Quantity added to stock: received minus damaged on arrival."""
+        return max(self.received_quantity - self.damaged_quantity, 0)
+
     class Meta:
         ordering = ['-received_date']
+
+
+class PPEStockMovement(models.Model):
+    """Append-only ledger of stock movements; PPEInventory holds the running totals."""
+    MOVEMENT_TYPES = (
+        ('RECEIPT', 'Receipt'),
+        ('ISSUE', 'Issue'),
+        ('DAMAGE', 'Damage'),
+        ('EXPIRY', 'Expiry'),
+        ('ADJUSTMENT', 'Adjustment'),
+    )
+
+    SOURCE_TYPES = (
+        ('RECEIPT', 'Purchase Receipt'),
+        ('ISSUE', 'PPE Issue'),
+        ('MANUAL', 'Manual'),
+    )
+
+    # Inventory counter touched by each movement type, and its sign on current stock
+    INVENTORY_EFFECTS = {
+        'RECEIPT': ('total_received', 1),
+        'ISSUE': ('total_issued', -1),
+        'DAMAGE': ('total_damaged', -1),
+        'EXPIRY': ('total_expired', -1),
+        'ADJUSTMENT': (None, 1),
+    }
+
+    ppe_category = models.ForeignKey(PPECategory, on_delete=models.CASCADE, related_name='stock_movements')
+    movement_type = models.CharField(max_length=20, choices=MOVEMENT_TYPES)
+    quantity = models.IntegerField(help_text="Signed quantity; negative values reverse an earlier movement")
+    source_type = models.CharField(max_length=20, choices=SOURCE_TYPES, default='MANUAL')
+    source_id = models.PositiveBigIntegerField(null=True, blank=True)
+    notes = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='ppe_stock_movements')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.ppe_category.name} - {self.movement_type} {self.quantity:+d}"
+
+    @classmethod
+    def record(cls, ppe_category_id, movement_type, quantity, source_type='MANUAL',
+               source_id=None, notes='', created_by=None):
+        """Append a movement and apply it to the category inventory in one transaction."""
+        if not quantity:
+            return None
+
+        with transaction.atomic():
+            movement = cls.objects.create(
+                ppe_category_id=ppe_category_id,
+                movement_type=movement_type,
+                quantity=quantity,
+                source_type=source_type,
+                source_id=source_id,
+                notes=notes,
+                created_by=created_by,
+            )
+            PPEInventory.apply_movement(ppe_category_id, movement_type, quantity)
+        return movement
+
+    @classmethod
+    def ledger_totals(cls):
+        """Per-category net quantity for each movement type, in one grouped query."""
+        totals = {}
+        rows = cls.objects.order_by().values('ppe_category_id', 'movement_type').annotate(total=Sum('quantity'))
+        for row in rows:
+            totals.setdefault(row['ppe_category_id'], {})[row['movement_type']] = row['total']
+        return totals
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['source_type', 'source_id']),
+            models.Index(fields=['ppe_category', 'movement_type']),
+        ]
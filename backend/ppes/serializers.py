@@ -3,6 +3,7 @@ from .models import (
     PPECategory, Vendor, PPEPurchase, PPEInventory, PPEIssue, 
     PPERequest, PPEDamageReport, PPETransfer, PPEReturn, PPEPurchaseReceipt
 )
+from .services import BULK_ISSUE_MAX_EMPLOYEES
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -152,6 +153,8 @@ class PPEInventorySerializer(serializers.ModelSerializer):
             'total_issued', 'total_damaged', 'total_expired', 'current_stock', 
             'last_updated', 'is_low_stock'
         ]
+        # Totals only change through stock movements
+        read_only_fields = ['total_received', 'total_issued', 'total_damaged', 'total_expired']
     
     def get_is_low_stock(self, obj):
         """Get the is_low_stock property value."""
@@ -390,10 +393,12 @@ class BulkPPEIssueSerializer(serializers.Serializer):
     """Serializer for bulk PPE issuance."""
     employee_ids = serializers.ListField(
         child=serializers.IntegerField(),
+        min_length=1,
+        max_length=BULK_ISSUE_MAX_EMPLOYEES,
         help_text="List of employee IDs"
     )
     ppe_category_id = serializers.IntegerField()
-    quantity_per_employee = serializers.IntegerField(default=1)
+    quantity_per_employee = serializers.IntegerField(default=1, min_value=1)
     issue_date = serializers.DateField()
     notes = serializers.CharField(required=False, allow_blank=True)
 
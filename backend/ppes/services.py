@@ -0,0 +1,262 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import (
+    PPECategory, PPEDamageReport, PPEInventory, PPEIssue, PPEPurchase,
+    PPEPurchaseReceipt, PPEStockMovement
+)
+
+User = get_user_model()
+
+BULK_ISSUE_MAX_EMPLOYEES = 5000
+
+INVENTORY_TOTAL_FIELDS = ['total_received', 'total_issued', 'total_damaged', 'total_expired', 'current_stock']
+
+
+def _category_subquery(queryset, aggregate, category_field='ppe_category'):
+    """Correlated per-category aggregate over ``queryset``, defaulting to 0."""
+    subquery = queryset.filter(
+        **{category_field: OuterRef('pk')}
+    ).order_by().values(category_field).annotate(
+        total=aggregate
+    ).values('total')
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def stock_position_queryset(today=None):
+    """
+    Categories annotated with received, issued, damaged and expired totals.
+
+    Every figure is computed by the database in a single statement; only
+    categories that have an inventory record are returned, matching the
+    stock position report.
+    """
+    if today is None:
+        today = timezone.now().date()
+
+    return PPECategory.objects.filter(
+        inventory__isnull=False
+    ).select_related('inventory').annotate(
+        stock_received=_category_subquery(PPEPurchase.objects.all(), Sum('quantity')),
+        stock_issued=_category_subquery(PPEIssue.objects.all(), Sum('quantity')),
+        stock_damaged=_category_subquery(
+            PPEDamageReport.objects.filter(is_approved=True),
+            Count('id'),
+            category_field='ppe_issue__ppe_category',
+        ),
+        stock_expired=_category_subquery(
+            PPEIssue.objects.filter(expiry_date__lt=today),
+            Count('id'),
+        ),
+    )
+
+
+def get_stock_positions(today=None):
+    """Return stock position rows for every PPE category with inventory."""
+    positions = []
+    for category in stock_position_queryset(today=today):
+        inventory = category.inventory
+        positions.append({
+            'ppe_category': category,
+            'total_received': category.stock_received,
+            'total_issued': category.stock_issued,
+            'total_damaged': category.stock_damaged,
+            'total_expired': category.stock_expired,
+            'current_stock': inventory.current_stock,
+            'is_low_stock': inventory.current_stock <= category.low_stock_threshold,
+        })
+    return positions
+
+
+def backfill_stock_ledger(batch_size=1000):
+    """
+    Seed ledger entries for receipts and active issues that predate the ledger.
+
+    Movements are written without touching PPEInventory; run
+    ``reconcile_inventory`` afterwards to bring totals in line.
+    """
+    recorded = set(
+        PPEStockMovement.objects.filter(
+            source_type__in=['RECEIPT', 'ISSUE']
+        ).values_list('source_type', 'source_id').distinct()
+    )
+    movements = []
+
+    receipts = PPEPurchaseReceipt.objects.values_list(
+        'id', 'purchase__ppe_category_id', 'received_quantity', 'damaged_quantity'
+    )
+    for receipt_id, category_id, received, damaged in receipts.iterator(chunk_size=batch_size):
+        net_quantity = max(received - damaged, 0)
+        if net_quantity and ('RECEIPT', receipt_id) not in recorded:
+            movements.append(PPEStockMovement(
+                ppe_category_id=category_id, movement_type='RECEIPT', quantity=net_quantity,
+                source_type='RECEIPT', source_id=receipt_id, notes='Ledger backfill',
+            ))
+
+    issues = PPEIssue.objects.filter(status='ACTIVE').values_list('id', 'ppe_category_id', 'quantity')
+    for issue_id, category_id, quantity in issues.iterator(chunk_size=batch_size):
+        if quantity and ('ISSUE', issue_id) not in recorded:
+            movements.append(PPEStockMovement(
+                ppe_category_id=category_id, movement_type='ISSUE', quantity=quantity,
+                source_type='ISSUE', source_id=issue_id, notes='Ledger backfill',
+            ))
+
+    PPEStockMovement.objects.bulk_create(movements, batch_size=batch_size)
+    return len(movements)
+
+
+def expected_inventory_from_ledger():
+    """Inventory totals implied by the ledger, keyed by category id."""
+    expected = {}
+    for category_id, totals in PPEStockMovement.ledger_totals().items():
+        row = dict.fromkeys(INVENTORY_TOTAL_FIELDS, 0)
+        for movement_type, quantity in totals.items():
+            field, sign = PPEStockMovement.INVENTORY_EFFECTS[movement_type]
+            if field:
+                row[field] += quantity
+            row['current_stock'] += sign * quantity
+        expected[category_id] = row
+    return expected
+
+
+def reconcile_inventory(commit=True):
+    """
+    Compare every PPEInventory row with the ledger.
+
+    Returns a list of ``(category_id, {field: (actual, expected)})`` for rows
+    that drifted. When ``commit`` is true those rows are rewritten, and
+    inventory is created for categories that only exist in the ledger.
+    The inventory rows are locked before the ledger is totalled, so a
+    movement applied concurrently is either counted in both or in neither.
+    """
+    with transaction.atomic():
+        inventories = PPEInventory.objects.all()
+        if commit:
+            inventories = inventories.select_for_update().order_by('pk')
+        inventories = {inv.ppe_category_id: inv for inv in inventories}
+        expected = expected_inventory_from_ledger()
+        empty = dict.fromkeys(INVENTORY_TOTAL_FIELDS, 0)
+
+        drift = []
+        to_update = []
+        to_create = []
+        for category_id in set(expected) | set(inventories):
+            target = expected.get(category_id, empty)
+            inventory = inventories.get(category_id)
+            if inventory is None:
+                inventory = PPEInventory(ppe_category_id=category_id)
+                to_create.append(inventory)
+
+            changes = {
+                field: (getattr(inventory, field), target[field])
+                for field in INVENTORY_TOTAL_FIELDS
+                if getattr(inventory, field) != target[field]
+            }
+            if not changes:
+                continue
+
+            drift.append((category_id, changes))
+            for field, (_, value) in changes.items():
+                setattr(inventory, field, value)
+            if inventory.pk:
+                to_update.append(inventory)
+
+        if commit:
+            PPEInventory.objects.bulk_create(to_create)
+            PPEInventory.objects.bulk_update(to_update, INVENTORY_TOTAL_FIELDS)
+    return drift
+
+
+def set_stock_level(ppe_category_id, current_stock, notes='', created_by=None):
+    """
+    Correct a category's stock to ``current_stock`` through the ledger.
+
+    The difference from the locked inventory row is recorded as an
+    ADJUSTMENT movement, so ``rebuild_ppe_inventory`` keeps the correction.
+    Returns the movement, or None when the stock already matches.
+    """
+    with transaction.atomic():
+        inventory, _ = PPEInventory.objects.get_or_create(ppe_category_id=ppe_category_id)
+        previous_stock = PPEInventory.objects.select_for_update().values_list(
+            'current_stock', flat=True
+        ).get(pk=inventory.pk)
+        return PPEStockMovement.record(
+            ppe_category_id,
+            'ADJUSTMENT',
+            current_stock - previous_stock,
+            notes=notes or 'Manual stock adjustment',
+            created_by=created_by,
+        )
+
+
+def bulk_issue_ppe(ppe_category, employee_ids, quantity_per_employee, issue_date,
+                   issued_by=None, notes='', batch_size=500):
+    """
+    Issue PPE to many employees with a constant number of queries.
+
+    Employees are resolved in one query, issues and their ledger entries are
+    written with ``bulk_create`` and inventory is decremented once, all inside
+    a single transaction holding the inventory row lock. Returns one result
+    dict per requested employee id, in request order; repeated ids are
+    issued once and reported as duplicates.
+
+    Raises ``ValidationError`` when stock cannot cover every resolved employee.
+    """
+    requested = list(dict.fromkeys(employee_ids))
+    existing = set(User.objects.filter(id__in=requested).values_list('id', flat=True))
+    expiry_date = ppe_category.calculate_expiry_date(issue_date)
+
+    issues = [
+        PPEIssue(
+            employee_id=employee_id,
+            ppe_category=ppe_category,
+            quantity=quantity_per_employee,
+            issue_date=issue_date,
+            expiry_date=expiry_date,
+            issued_by=issued_by,
+            notes=notes,
+        )
+        for employee_id in requested if employee_id in existing
+    ]
+    total_quantity = len(issues) * quantity_per_employee
+
+    with transaction.atomic():
+        inventory = PPEInventory.objects.select_for_update().filter(ppe_category=ppe_category).first()
+        available = inventory.current_stock if inventory else 0
+        if total_quantity > available:
+            raise ValidationError(
+                f'Insufficient stock. Available: {available}, Needed: {total_quantity}'
+            )
+
+        PPEIssue.objects.bulk_create(issues, batch_size=batch_size)
+        PPEStockMovement.objects.bulk_create([
+            PPEStockMovement(
+                ppe_category=ppe_category,
+                movement_type='ISSUE',
+                quantity=issue.quantity,
+                source_type='ISSUE',
+                source_id=issue.pk,
+                notes='Bulk issue',
+                created_by=issued_by,
+            )
+            for issue in issues
+        ], batch_size=batch_size)
+        if total_quantity:
+            PPEInventory.apply_movement(ppe_category.pk, 'ISSUE', total_quantity)
+
+    issued = {issue.employee_id: issue.pk for issue in issues}
+    results = []
+    seen = set()
+    for employee_id in employee_ids:
+        if employee_id in seen:
+            results.append({'employee_id': employee_id, 'success': False, 'error': 'Duplicate employee ID'})
+        elif employee_id in issued:
+            results.append({'employee_id': employee_id, 'success': True, 'issue_id': issued[employee_id]})
+        else:
+            results.append({'employee_id': employee_id, 'success': False, 'error': 'Employee not found'})
+        seen.add(employee_id)
+    return results
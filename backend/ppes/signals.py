@@ -1,95 +1,107 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import PPEPurchase, PPEInventory, PPEIssue
-from django.db import models
+from .models import PPECategory, PPEIssue, PPEPurchaseReceipt, PPEStockMovement
 
 
-@receiver(post_save, sender=PPEPurchase)
-def update_inventory_on_purchase(sender, instance, created, **kwargs):
-    """Update inventory when a purchase is created or updated."""
-    try:
-        # Get or create inventory for this PPE category
-        inventory, created_inventory = PPEInventory.objects.get_or_create(
-            ppe_category=instance.ppe_category,
-            defaults={
-                'total_received': 0,
-                'total_issued': 0,
-                'total_damaged': 0,
-                'total_expired': 0,
-                'current_stock': 0
-            }
-        )
-        
-        # Calculate total received from all purchases for this category
-        total_received = PPEPurchase.objects.filter(
-            ppe_category=instance.ppe_category
-        ).aggregate(total=models.Sum('quantity'))['total'] or 0
-        
-        # Update inventory
-        inventory.total_received = total_received
-        inventory.update_stock_levels()
-        
-    except Exception as e:
-        print(f"Error updating inventory for purchase {instance.id}: {e}")
-
-
-@receiver(post_delete, sender=PPEPurchase)
-def update_inventory_on_purchase_delete(sender, instance, **kwargs):
-    """Update inventory when a purchase is deleted."""
-    try:
-        inventory = PPEInventory.objects.get(ppe_category=instance.ppe_category)
-        
-        # Recalculate total received
-        total_received = PPEPurchase.objects.filter(
-            ppe_category=instance.ppe_category
-        ).aggregate(total=models.Sum('quantity'))['total'] or 0
-        
-        inventory.total_received = total_received
-        inventory.update_stock_levels()
-        
-    except PPEInventory.DoesNotExist:
-        pass
-    except Exception as e:
-        print(f"Error updating inventory after purchase deletion: {e}")
+# Stock levels are maintained incrementally: every handler appends a delta to
+# the PPEStockMovement ledger, which applies it to PPEInventory with F()
+# expressions. Nothing here re-aggregates a category's history.
+
+
+def _issued_quantity(status, quantity):
+    """Quantity an issue holds out of stock; only active issues count."""
+    return quantity if status == 'ACTIVE' else 0
+
+
+def _cascades_from_category(origin):
+    """True when a deletion cascades from a PPE category; its stock goes with it."""
+    if isinstance(origin, QuerySet):
+        return origin.model is PPECategory
+    return isinstance(origin, PPECategory)
+
+
+def _move(ppe_category_id, movement_type, quantity, source_type, source_id, notes=''):
+    PPEStockMovement.record(
+        ppe_category_id,
+        movement_type,
+        quantity,
+        source_type=source_type,
+        source_id=source_id,
+        notes=notes,
+    )
+
+
+@receiver(pre_save, sender=PPEIssue)
+def remember_issue_stock(sender, instance, **kwargs):
+    """Capture the stock an existing issue held before it is changed."""
+    instance._stock_previous = None
+    if instance.pk and not kwargs.get('raw'):
+        instance._stock_previous = sender.objects.filter(pk=instance.pk).values(
+            'ppe_category_id', 'quantity', 'status'
+        ).first()
 
 
 @receiver(post_save, sender=PPEIssue)
 def update_inventory_on_issue(sender, instance, created, **kwargs):
-    """Update inventory when PPE is issued."""
-    try:
-        inventory = PPEInventory.objects.get(ppe_category=instance.ppe_category)
-        
-        # Calculate total issued from all active issues for this category
-        total_issued = PPEIssue.objects.filter(
-            ppe_category=instance.ppe_category,
-            status='ACTIVE'
-        ).aggregate(total=models.Sum('quantity'))['total'] or 0
-        
-        inventory.total_issued = total_issued
-        inventory.update_stock_levels()
-        
-    except PPEInventory.DoesNotExist:
-        pass
-    except Exception as e:
-        print(f"Error updating inventory for issue {instance.id}: {e}")
+    """Record the change in issued stock for a created or updated issue."""
+    if kwargs.get('raw'):
+        return
+
+    current = _issued_quantity(instance.status, instance.quantity)
+    previous = getattr(instance, '_stock_previous', None)
+
+    if previous and previous['ppe_category_id'] != instance.ppe_category_id:
+        _move(previous['ppe_category_id'], 'ISSUE',
+              -_issued_quantity(previous['status'], previous['quantity']),
+              'ISSUE', instance.pk, notes='Issue moved to another category')
+        previous = None
+
+    delta = current - (_issued_quantity(previous['status'], previous['quantity']) if previous else 0)
+    _move(instance.ppe_category_id, 'ISSUE', delta, 'ISSUE', instance.pk)
 
 
 @receiver(post_delete, sender=PPEIssue)
 def update_inventory_on_issue_delete(sender, instance, **kwargs):
-    """Update inventory when PPE issue is deleted."""
+    """Return the stock held by a deleted issue."""
+    if _cascades_from_category(kwargs.get('origin')):
+        return
+    _move(instance.ppe_category_id, 'ISSUE',
+          -_issued_quantity(instance.status, instance.quantity),
+          'ISSUE', instance.pk, notes='Issue deleted')
+
+
+@receiver(pre_save, sender=PPEPurchaseReceipt)
+def remember_receipt_stock(sender, instance, **kwargs):
+    """Capture the net quantity an existing receipt added before it is changed."""
+    instance._stock_previous = 0
+    if instance.pk and not kwargs.get('raw'):
+        previous = sender.objects.filter(pk=instance.pk).values(
+            'received_quantity', 'damaged_quantity'
+        ).first()
+        if previous:
+            instance._stock_previous = max(previous['received_quantity'] - previous['damaged_quantity'], 0)
+
+
+@receiver(post_save, sender=PPEPurchaseReceipt)
+def update_inventory_on_receipt(sender, instance, created, **kwargs):
+    """Add received stock (minus items damaged on arrival) to inventory."""
+    if kwargs.get('raw'):
+        return
+
+    delta = instance.net_quantity - getattr(instance, '_stock_previous', 0)
+    _move(instance.purchase.ppe_category_id, 'RECEIPT', delta, 'RECEIPT', instance.pk)
+
+
+@receiver(post_delete, sender=PPEPurchaseReceipt)
+def update_inventory_on_receipt_delete(sender, instance, **kwargs):
+    """Remove the stock added by a deleted receipt."""
+    if _cascades_from_category(kwargs.get('origin')):
+        return
     try:
-        inventory = PPEInventory.objects.get(ppe_category=instance.ppe_category)
-        
-        # Recalculate total issued
-        total_issued = PPEIssue.objects.filter(
-            ppe_category=instance.ppe_category,
-            status='ACTIVE'
-        ).aggregate(total=models.Sum('quantity'))['total'] or 0
-        
-        inventory.total_issued = total_issued
-        inventory.update_stock_levels()
-        
-    except PPEInventory.DoesNotExist:
-        pass
-    except Exception as e:
-        print(f"Error updating inventory after issue deletion: {e}") 
\ No newline at end of file
+        ppe_category_id = instance.purchase.ppe_category_id
+    except PPEPurchaseReceipt.purchase.RelatedObjectDoesNotExist:
+        # Purchase row is already gone; nothing left to reconcile against
+        return
+    _move(ppe_category_id, 'RECEIPT', -instance.net_quantity,
+          'RECEIPT', instance.pk, notes='Receipt deleted')
@@ -6,11 +6,18 @@ import pytest
 from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db import transaction
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from ppes.models import (
     PPECategory, Vendor, PPEPurchase, PPEInventory, PPEIssue,
-    PPERequest, PPEDamageReport, PPETransfer, PPEReturn, PPEPurchaseReceipt
+    PPERequest, PPEDamageReport, PPETransfer, PPEReturn, PPEPurchaseReceipt,
+    PPEStockMovement
 )
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from accounts.factories import HSSEManagerFactory, SuperUserFactory
+from io import StringIO
 from datetime import date, timedelta
 from decimal import Decimal
 from freezegun import freeze_time
@@ -699,3 +706,149 @@ class PPEEdgeCasesTests(TestCase):
         # Should be considered expired (>) not (>=)
         assert issue.is_expired is False
 
+
+
+class PPEStockLedgerTests(TestCase):
+    """Tests for the stock movement ledger and incremental inventory updates."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email='issuer@example.com',
+            first_name='Store',
+            last_name='Issuer',
+            phone_number='1234567890',
+            password='testpass123'
+        )
+        self.category = PPECategory.objects.create(name='Ear Plugs', lifespan_months=3)
+        vendor = Vendor.objects.create(name='Safety Co', phone_number='123')
+        purchase = PPEPurchase.objects.create(
+            vendor=vendor,
+            ppe_category=self.category,
+            quantity=50,
+            cost_per_unit=Decimal('2.00'),
+            purchase_date=date.today(),
+            status='CONFIRMED'
+        )
+        PPEPurchaseReceipt.objects.create(
+            purchase=purchase,
+            received_quantity=50,
+            received_date=date.today(),
+            received_by=self.user
+        )
+
+    def _issue(self, quantity=1):
+        return PPEIssue.objects.create(
+            employee=self.user,
+            ppe_category=self.category,
+            quantity=quantity,
+            issue_date=date.today(),
+            issued_by=self.user
+        )
+
+    def _inventory(self):
+        return PPEInventory.objects.get(ppe_category=self.category)
+
+    def test_issue_records_movement_and_decrements_stock(self):
+        """Test issuing appends a ledger entry and decrements stock."""
+        issue = self._issue(quantity=4)
+
+        inventory = self._inventory()
+        assert inventory.total_issued == 4
+        assert inventory.current_stock == 46
+        assert PPEStockMovement.objects.filter(
+            source_type='ISSUE', source_id=issue.pk, movement_type='ISSUE'
+        ).get().quantity == 4
+
+    def test_issue_status_change_returns_stock(self):
+        """Test an issue leaving ACTIVE status returns its quantity."""
+        issue = self._issue(quantity=4)
+        issue.status = 'RETURNED'
+        issue.save()
+
+        inventory = self._inventory()
+        assert inventory.total_issued == 0
+        assert inventory.current_stock == 50
+
+    def test_issue_delete_reverses_movement(self):
+        """Test deleting an issue reverses its movement in the ledger."""
+        issue = self._issue(quantity=3)
+        issue.delete()
+
+        assert self._inventory().current_stock == 50
+        assert PPEStockMovement.objects.filter(source_type='ISSUE').count() == 2
+
+    def test_issue_write_cost_is_independent_of_history(self):
+        """Test the queries per issue do not grow with issue history."""
+        for _ in range(10):
+            self._issue()
+
+        # Issue insert, ledger insert, inventory update and the ledger savepoint pair
+        with self.assertNumQueries(5):
+            self._issue()
+
+    def test_rebuild_command_repairs_drift(self):
+        """Test the rebuild command restores inventory from the ledger."""
+        self._issue(quantity=5)
+        PPEInventory.objects.filter(ppe_category=self.category).update(
+            current_stock=999, total_issued=0
+        )
+
+        call_command('rebuild_ppe_inventory', '--verify', stdout=StringIO())
+        assert self._inventory().current_stock == 999
+
+        call_command('rebuild_ppe_inventory', stdout=StringIO())
+        inventory = self._inventory()
+        assert inventory.current_stock == 45
+        assert inventory.total_issued == 5
+
+    def test_rebuild_totals_ledger_under_inventory_lock(self):
+        """Test the ledger is totalled only after the inventory rows are locked."""
+        self._issue(quantity=5)
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command('rebuild_ppe_inventory', stdout=StringIO())
+
+        sql = [query['sql'] for query in queries.captured_queries]
+        lock = next(i for i, q in enumerate(sql) if 'FROM "ppes_ppeinventory"' in q and 'FOR UPDATE' in q)
+        ledger = next(i for i, q in enumerate(sql) if 'FROM "ppes_ppestockmovement"' in q)
+        assert lock < ledger
+
+    def test_reversal_before_backfill_keeps_totals_signed(self):
+        """Test reversing an issue the ledger never recorded does not fail on the totals."""
+        PPEStockMovement.record(self.category.pk, 'ISSUE', -3, source_type='ISSUE')
+
+        inventory = self._inventory()
+        assert inventory.total_issued == -3
+        assert inventory.current_stock == 53
+
+    def test_inventory_api_corrects_stock_through_ledger(self):
+        """Test API edits ignore totals and record stock corrections as adjustments."""
+        client = APIClient()
+        client.force_authenticate(user=HSSEManagerFactory())
+        response = client.patch(
+            reverse('ppeinventory-detail', kwargs={'pk': self._inventory().pk}),
+            {'current_stock': 40, 'total_issued': 999},
+            format='json'
+        )
+
+        assert response.status_code == 200
+        assert (response.data['current_stock'], response.data['total_issued']) == (40, 0)
+        assert PPEStockMovement.objects.get(movement_type='ADJUSTMENT').quantity == -10
+        call_command('rebuild_ppe_inventory', stdout=StringIO())
+        assert self._inventory().current_stock == 40
+
+    def test_admin_corrects_stock_through_ledger(self):
+        """Test the admin records a counted stock as an adjustment movement."""
+        self.client.force_login(SuperUserFactory())
+        inventory = self._inventory()
+        response = self.client.post(
+            reverse('admin:ppes_ppeinventory_change', args=[inventory.pk]),
+            {'corrected_stock': 47, 'adjustment_notes': 'Stock count'}
+        )
+
+        assert response.status_code == 302
+        movement = PPEStockMovement.objects.get(movement_type='ADJUSTMENT')
+        assert (movement.quantity, movement.notes) == (-3, 'Stock count')
+        inventory = self._inventory()
+        assert (inventory.current_stock, inventory.total_received) == (47, 50)
@@ -0,0 +1,173 @@
+"""
+Tests for PPE stock reporting and bulk issuance services.
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from ppes.models import (
+    PPECategory, Vendor, PPEPurchase, PPEInventory, PPEIssue, PPEDamageReport,
+    PPEStockMovement
+)
+from ppes.services import bulk_issue_ppe, get_stock_positions
+from datetime import date, timedelta
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class StockPositionServiceTests(TestCase):
+    """Tests for the single-query stock position report."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email='storekeeper@example.com',
+            first_name='Store',
+            last_name='Keeper',
+            phone_number='1234567890',
+            password='testpass123'
+        )
+        self.vendor = Vendor.objects.create(name='Safety Co', phone_number='123')
+        self.helmets = PPECategory.objects.create(
+            name='Helmet', lifespan_months=12, low_stock_threshold=5
+        )
+        self.gloves = PPECategory.objects.create(
+            name='Gloves', lifespan_months=6, low_stock_threshold=5
+        )
+
+        for quantity in (40, 60):
+            PPEPurchase.objects.create(
+                vendor=self.vendor,
+                ppe_category=self.helmets,
+                quantity=quantity,
+                cost_per_unit=Decimal('10.00'),
+                purchase_date=date.today()
+            )
+
+        today = date.today()
+        self.expired_issue = PPEIssue.objects.create(
+            employee=self.user,
+            ppe_category=self.helmets,
+            quantity=2,
+            issue_date=today - timedelta(days=400),
+            expiry_date=today - timedelta(days=35),
+            issued_by=self.user
+        )
+        PPEIssue.objects.create(
+            employee=self.user,
+            ppe_category=self.helmets,
+            quantity=3,
+            issue_date=today,
+            expiry_date=today + timedelta(days=360),
+            issued_by=self.user
+        )
+        PPEDamageReport.objects.create(
+            employee=self.user,
+            ppe_issue=self.expired_issue,
+            damage_description='Cracked shell',
+            damage_date=today,
+            is_approved=True
+        )
+        PPEDamageReport.objects.create(
+            employee=self.user,
+            ppe_issue=self.expired_issue,
+            damage_description='Pending review',
+            damage_date=today
+        )
+
+    def test_stock_position_totals(self):
+        """Test totals are aggregated per category."""
+        positions = {row['ppe_category'].name: row for row in get_stock_positions()}
+
+        helmets = positions['Helmet']
+        assert helmets['total_received'] == 100
+        assert helmets['total_issued'] == 5
+        assert helmets['total_damaged'] == 1
+        assert helmets['total_expired'] == 1
+        assert helmets['current_stock'] == PPEInventory.objects.get(
+            ppe_category=self.helmets
+        ).current_stock
+
+    def test_categories_without_inventory_are_skipped(self):
+        """Test categories without an inventory record are omitted."""
+        names = [row['ppe_category'].name for row in get_stock_positions()]
+
+        assert 'Gloves' not in names
+
+    def test_stock_position_uses_single_query(self):
+        """Test query count does not grow with the number of categories."""
+        for index in range(5):
+            category = PPECategory.objects.create(name=f'Extra {index}', lifespan_months=6)
+            PPEInventory.objects.create(ppe_category=category, current_stock=index)
+
+        with self.assertNumQueries(1):
+            positions = get_stock_positions()
+
+        assert len(positions) == 6
+
+
+class BulkIssueServiceTests(TestCase):
+    """Tests for batched PPE issuance."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.manager = User.objects.create_user(
+            email='manager@example.com',
+            first_name='HSSE',
+            last_name='Manager',
+            phone_number='1234567890',
+            password='testpass123'
+        )
+        self.employees = [
+            User.objects.create_user(
+                email=f'worker{index}@example.com',
+                first_name='Crew',
+                last_name=f'Member {index}',
+                phone_number=f'55500{index:02d}',
+                password='testpass123'
+            )
+            for index in range(20)
+        ]
+        self.category = PPECategory.objects.create(name='Coverall', lifespan_months=12)
+        PPEStockMovement.record(self.category.pk, 'RECEIPT', 100)
+
+    def test_bulk_issue_creates_issues_and_decrements_once(self):
+        """Test every employee gets an issue and stock drops by the total."""
+        ids = [employee.id for employee in self.employees]
+
+        results = bulk_issue_ppe(self.category, ids, 2, date.today(), issued_by=self.manager)
+
+        assert all(result['success'] for result in results)
+        assert PPEIssue.objects.filter(ppe_category=self.category).count() == 20
+        inventory = PPEInventory.objects.get(ppe_category=self.category)
+        assert inventory.total_issued == 40
+        assert inventory.current_stock == 60
+
+    def test_bulk_issue_query_count_is_constant(self):
+        """Test the query count does not depend on the batch size."""
+        ids = [employee.id for employee in self.employees]
+
+        # User lookup, inventory lock, two bulk inserts, one inventory update, savepoint pair
+        with self.assertNumQueries(7):
+            bulk_issue_ppe(self.category, ids, 1, date.today(), issued_by=self.manager)
+
+    def test_bulk_issue_reports_unknown_and_duplicate_employees(self):
+        """Test per-employee failures are reported without aborting the batch."""
+        employee_id = self.employees[0].id
+
+        results = bulk_issue_ppe(self.category, [employee_id, 999999, employee_id], 1, date.today())
+
+        assert [result['success'] for result in results] == [True, False, False]
+        assert results[1]['error'] == 'Employee not found'
+        assert results[2]['error'] == 'Duplicate employee ID'
+        assert PPEIssue.objects.filter(ppe_category=self.category).count() == 1
+
+    def test_bulk_issue_rejects_insufficient_stock(self):
+        """Test nothing is issued when stock cannot cover the batch."""
+        ids = [employee.id for employee in self.employees]
+
+        with self.assertRaises(ValidationError):
+            bulk_issue_ppe(self.category, ids, 10, date.today())
+
+        assert not PPEIssue.objects.filter(ppe_category=self.category).exists()
+        assert PPEInventory.objects.get(ppe_category=self.category).current_stock == 100
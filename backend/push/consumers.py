@@ -0,0 +1,54 @@
+"""
+WebSocket consumers streaming notifications and dashboard invalidations.
+"""
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from accounts import notification_feed
+
+from .events import DASHBOARDS_GROUP, user_group
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Push channel for one signed-in browser tab.
+
+    On connect the client receives its unread count, then one message per
+    new notification and per invalidated dashboard:
+
+        {"type": "unread_count", "unread_count": 3}
+        {"type": "notification", "notification": {...}, "unread_count": 4}
+        {"type": "dashboard_invalidated", "dashboard": "audits"}
+    """
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+
+        self.push_groups = [user_group(user.pk), DASHBOARDS_GROUP]
+        for group in self.push_groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+
+        unread = await database_sync_to_async(notification_feed.unread_count)(user.pk)
+        await self.send_json({'type': 'unread_count', 'unread_count': unread})
+
+    async def disconnect(self, code):
+        for group in getattr(self, 'push_groups', []):
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # The channel is server-to-client only
+        pass
+
+    async def notification_created(self, event):
+        await self.send_json({
+            'type': 'notification',
+            'notification': event['notification'],
+            'unread_count': event['unread_count'],
+        })
+
+    async def dashboard_invalidated(self, event):
+        await self.send_json({'type': 'dashboard_invalidated', 'dashboard': event['dashboard']})
@@ -0,0 +1,111 @@
+"""
+Publish events to connected push clients through the channel layer.
+
+Every signed-in connection joins its user's group and the shared
+dashboards group. Events are sent once the triggering transaction commits,
+so a client reacting to one never fetches state it cannot see yet.
+Bulk notification fan-outs are pushed from a Celery worker, so a request
+notifying thousands of users does not serialize and send to each of them.
+Dashboard invalidations are coalesced to one event per dashboard per
+transaction, however many rows it changed. A failing channel layer is
+logged and otherwise ignored: clients fall back to polling.
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+
+from core.on_commit import on_commit_batch
+
+logger = logging.getLogger(__name__)
+
+DASHBOARDS_GROUP = 'dashboards'
+
+
+def user_group(user_id):
+    """Group every connection of one user joins."""
+    return f'user.{user_id}'
+
+
+def _send(group, message):
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    try:
+        async_to_sync(layer.group_send)(group, message)
+    except Exception as e:
+        logger.warning(f"Failed to push {message['type']} to {group}: {e}")
+
+
+def _push_notifications(notifications, unread_counts):
+    """Send each notification to its recipient; ``unread_counts`` is keyed by ``str(user_id)``."""
+    from accounts.serializers import NotificationSerializer
+
+    payloads = NotificationSerializer(notifications, many=True).data
+    for notification, payload in zip(notifications, payloads):
+        _send(user_group(notification.user_id), {
+            'type': 'notification.created',
+            'notification': payload,
+            'unread_count': unread_counts[str(notification.user_id)],
+        })
+
+
+def notification_created(notification):
+    """Push one new notification to its recipient, with their unread count."""
+    from accounts import notification_feed
+
+    def send():
+        unread = notification_feed.unread_count(notification.user_id)
+        _push_notifications([notification], {str(notification.user_id): unread})
+
+    transaction.on_commit(send)
+
+
+def notification_fan_out(notifications, unread_counts):
+    """
+    Push bulk-created notifications to their recipients once committed.
+
+    ``unread_counts`` are the counts notify() recorded for each recipient,
+    so no count is read back per recipient. The push runs on a Celery
+    worker; with PUSH_FAN_OUT_EAGER (development and tests) it runs
+    in-process instead.
+    """
+    notification_ids = [notification.pk for notification in notifications]
+    if not notification_ids:
+        return
+    counts = {str(user_id): unread for user_id, unread in unread_counts.items()}
+
+    if getattr(settings, 'PUSH_FAN_OUT_EAGER', False):
+        transaction.on_commit(lambda: push_fan_out(notification_ids, counts))
+    else:
+        transaction.on_commit(lambda: _dispatch_fan_out(notification_ids, counts))
+
+
+def _dispatch_fan_out(notification_ids, unread_counts):
+    # Runs after commit; like a failing channel layer, a failing queue is only logged
+    try:
+        from .tasks import push_notifications
+
+        push_notifications.delay(notification_ids, unread_counts)
+    except Exception as e:
+        logger.warning(f"Failed to queue push for {len(notification_ids)} notifications: {e}")
+
+
+def push_fan_out(notification_ids, unread_counts):
+    """Load a fan-out's notifications in one query and push them."""
+    from accounts.models import Notification
+
+    notifications = list(Notification.objects.filter(pk__in=notification_ids).order_by('pk'))
+    _push_notifications(notifications, unread_counts)
+
+
+def _send_dashboard_invalidations(names):
+    for name in sorted(names):
+        _send(DASHBOARDS_GROUP, {'type': 'dashboard.invalidated', 'dashboard': name})
+
+
+def dashboard_invalidated(name):
+    """Tell every client, once per transaction, that a dashboard's cached payload is stale."""
+    on_commit_batch(_send_dashboard_invalidations, [name])
@@ -0,0 +1,40 @@
+"""
+Authentication for WebSocket connections.
+"""
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import authentication
+
+
+@database_sync_to_async
+def _user_for_token(raw_token):
+    try:
+        token = AccessToken(raw_token)
+    except TokenError:
+        return AnonymousUser()
+    user = authentication.get_user(token.get(api_settings.USER_ID_CLAIM))
+    if user is None or not user.is_active:
+        return AnonymousUser()
+    return user
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Set ``scope['user']`` from an access token passed as ``?token=``.
+
+    Browsers cannot send an Authorization header with a WebSocket
+    handshake, so the token travels in the query string instead. The user
+    is resolved through the same cache as CachedJWTAuthentication.
+    """
+
+    async def __call__(self, scope, receive, send):
+        raw_token = parse_qs(scope.get('query_string', b'').decode()).get('token', [None])[0]
+        user = await _user_for_token(raw_token) if raw_token else AnonymousUser()
+        return await super().__call__(dict(scope, user=user), receive, send)
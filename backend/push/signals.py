@@ -0,0 +1,30 @@
+"""
+Turn model changes into push events.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accounts.models import Notification
+from accounts.services import notifications_created
+from api.dashboard_cache import dashboard_invalidated
+
+from . import events
+
+
+@receiver(post_save, sender=Notification)
+def push_new_notification(sender, instance, created, **kwargs):
+    """Stream a new notification to its recipient."""
+    if created:
+        events.notification_created(instance)
+
+
+@receiver(notifications_created)
+def push_notification_fan_out(sender, notifications, unread_counts, **kwargs):
+    """Stream bulk-created notifications, which send no post_save, to their recipients."""
+    events.notification_fan_out(notifications, unread_counts)
+
+
+@receiver(dashboard_invalidated)
+def push_dashboard_invalidation(sender, name, **kwargs):
+    """Tell clients to refetch a dashboard whose cache was dropped."""
+    events.dashboard_invalidated(name)
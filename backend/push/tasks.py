@@ -0,0 +1,15 @@
+"""
+Celery tasks for push events; routed to the ``push`` queue.
+"""
+from celery import shared_task
+
+from .events import push_fan_out
+
+
+@shared_task
+def push_notifications(notification_ids, unread_counts):
+    """
+    Push bulk-created notifications to their recipients
+    """
+    push_fan_out(notification_ids, unread_counts)
+    return len(notification_ids)
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:19
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vectors(apps, schema_editor):
+    QuickReport = apps.get_model('quickreports', 'QuickReport')
+    QuickReport.objects.update(search_vector=(
+        SearchVector('report_number', weight='A', config='simple')
+        + SearchVector('title', weight='A', config='simple')
+        + SearchVector('description', weight='B', config='simple')
+        + SearchVector('location', weight='C', config='simple')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0016_search_vector'),
+        ('quickreports', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quickreport',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='quickreport',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='quickreport_search_idx'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from accounts.models import User
 from documents.models import Record
 import uuid
 from django.utils import timezone
+from sequences.services import next_code
 
 
 class QuickReport(models.Model):
@@ -73,12 +76,16 @@ class QuickReport(models.Model):
     # Link to created Record (after approval)
     created_record = models.ForeignKey(Record, on_delete=models.SET_NULL, null=True, blank=True, related_name='source_quick_report')
     
+    # Full-text search (maintained by the search app)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['report_type', 'status']),
             models.Index(fields=['reported_by', 'created_at']),
             models.Index(fields=['incident_date']),
+            GinIndex(fields=['search_vector'], name='quickreport_search_idx'),
         ]
     
     def __str__(self):
@@ -93,14 +100,7 @@ class QuickReport(models.Model):
             year = timezone.now().year
             type_prefix = self.report_type[:2]  # AC, NE, PO, NO
             
-            # Get count of reports of this type for this year
-            from django.db.models import Q
-            year_count = QuickReport.objects.filter(
-                report_type=self.report_type,
-                created_at__year=year
-            ).count() + 1
-            
-            self.report_number = f"QR-{type_prefix}-{year}-{year_count:03d}"
+            self.report_number = next_code(QuickReport, 'report_number', f'QR-{type_prefix}', year=year, width=3)
         
         super().save(*args, **kwargs)
     
@@ -271,21 +271,10 @@ class QuickReport(models.Model):
             return
         
         try:
-            from accounts.models import Notification
-            from django.core.mail import send_mail
+            from accounts.services import notify
             from django.conf import settings
             
-            # Create in-app notification
-            Notification.objects.create(
-                user=self.reported_by,
-                notification_type='REPORT_APPROVED',
-                title=f'Quick Report Approved: {self.report_number}',
-                message=f'Your {self.get_report_type_display()} report "{self.title}" has been approved and filed as a record.',
-                related_object_id=str(self.id),
-                related_object_type='quickreport',
-            )
-            
-            # Send email
+            # Compose email
             subject = f'✅ Quick Report Approved: {self.report_number}'
             message = f"""
 Hello {self.reported_by.get_full_name},
@@ -312,12 +301,16 @@ Access your records: {settings.FRONTEND_URL}/document-management/records
 This is an automated notification from SafeSphere Quick Reporting System.
 """
             
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[self.reported_by.email],
-                fail_silently=False,
+            # Create the in-app notification and queue the email
+            notify(
+                [self.reported_by],
+                notification_type='REPORT_APPROVED',
+                title=f'Quick Report Approved: {self.report_number}',
+                message=f'Your {self.get_report_type_display()} report "{self.title}" has been approved and filed as a record.',
+                related_object_id=str(self.id),
+                related_object_type='quickreport',
+                email_subject=subject,
+                email_body=message,
             )
             
         except Exception as e:
@@ -331,21 +324,10 @@ This is an automated notification from SafeSphere Quick Reporting System.
             return
         
         try:
-            from accounts.models import Notification
-            from django.core.mail import send_mail
+            from accounts.services import notify
             from django.conf import settings
             
-            # Create in-app notification
-            Notification.objects.create(
-                user=self.reported_by,
-                notification_type='REPORT_REJECTED',
-                title=f'Quick Report Rejected: {self.report_number}',
-                message=f'Your {self.get_report_type_display()} report "{self.title}" was rejected. Reason: {self.rejection_reason}',
-                related_object_id=str(self.id),
-                related_object_type='quickreport',
-            )
-            
-            # Send email
+            # Compose email
             subject = f'❌ Quick Report Rejected: {self.report_number}'
             message = f"""
 Hello {self.reported_by.get_full_name},
@@ -372,12 +354,16 @@ If you have questions, please contact the HSSE Manager.
 This is an automated notification from SafeSphere Quick Reporting System.
 """
             
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[self.reported_by.email],
-                fail_silently=False,
+            # Create the in-app notification and queue the email
+            notify(
+                [self.reported_by],
+                notification_type='REPORT_REJECTED',
+                title=f'Quick Report Rejected: {self.report_number}',
+                message=f'Your {self.get_report_type_display()} report "{self.title}" was rejected. Reason: {self.rejection_reason}',
+                related_object_id=str(self.id),
+                related_object_type='quickreport',
+                email_subject=subject,
+                email_body=message,
             )
             
         except Exception as e:
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-17 02:54
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('risks', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='riskassessment',
+            index=models.Index(django.db.models.expressions.CombinedExpression(models.F('residual_probability'), '*', models.F('residual_severity')), name='risk_residual_level_idx'),
+        ),
+    ]
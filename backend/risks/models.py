@@ -7,11 +7,74 @@ from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from datetime import timedelta, date
+from sequences.services import next_code
 import uuid
 
 User = get_user_model()
 
 
+# Risk levels (P × S) as database expressions
+INITIAL_RISK_LEVEL = models.ExpressionWrapper(
+    models.F('initial_probability') * models.F('initial_severity'),
+    output_field=models.IntegerField()
+)
+RESIDUAL_RISK_LEVEL = models.ExpressionWrapper(
+    models.F('residual_probability') * models.F('residual_severity'),
+    output_field=models.IntegerField()
+)
+
+
+class RiskAssessmentQuerySet(models.QuerySet):
+    """Risk level filtering and aggregation computed by the database."""
+    
+    RATINGS = ('LOW', 'MEDIUM', 'HIGH')
+    
+    def with_risk_levels(self):
+        """Annotate initial_risk_score and residual_risk_score (P × S)."""
+        return self.annotate(
+            initial_risk_score=INITIAL_RISK_LEVEL,
+            residual_risk_score=RESIDUAL_RISK_LEVEL,
+        )
+    
+    @staticmethod
+    def rating_filter(rating, config=None, field='residual'):
+        """Q object matching a LOW/MEDIUM/HIGH rating under the risk matrix thresholds."""
+        if rating not in RiskAssessmentQuerySet.RATINGS:
+            raise ValueError(f"Unknown risk rating: {rating}")
+        config = config or RiskMatrixConfig.get_config()
+        score = f'{field}_risk_score'
+        if rating == 'LOW':
+            return models.Q(**{f'{score}__lte': config.low_threshold})
+        if rating == 'MEDIUM':
+            return models.Q(**{
+                f'{score}__gt': config.low_threshold,
+                f'{score}__lte': config.medium_threshold,
+            })
+        return models.Q(**{f'{score}__gt': config.medium_threshold})
+    
+    def _with_score_aliases(self):
+        return self.alias(
+            initial_risk_score=INITIAL_RISK_LEVEL,
+            residual_risk_score=RESIDUAL_RISK_LEVEL,
+        )
+    
+    def by_rating(self, rating, config=None, field='residual'):
+        """Filter by LOW/MEDIUM/HIGH rating of the residual (or initial) risk level."""
+        return self._with_score_aliases().filter(self.rating_filter(rating, config, field))
+    
+    def rating_distribution(self, config=None, field='residual'):
+        """Count assessments per rating in a single query."""
+        config = config or RiskMatrixConfig.get_config()
+        return self._with_score_aliases().aggregate(**{
+            rating.lower(): models.Count('id', filter=self.rating_filter(rating, config, field))
+            for rating in self.RATINGS
+        })
+    
+    def overdue_for_review(self, today=None):
+        """Active assessments whose next review date has passed."""
+        return self.filter(status='ACTIVE', next_review_date__lt=today or date.today())
+
+
 # =============================
 # Risk Assessment Master
 # =============================
@@ -144,6 +207,8 @@ class RiskAssessment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = RiskAssessmentQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         permissions = [
@@ -154,6 +219,10 @@ class RiskAssessment(models.Model):
             models.Index(fields=['status', 'risk_category']),
             models.Index(fields=['location', 'process_area']),
             models.Index(fields=['next_review_date']),
+            models.Index(
+                models.F('residual_probability') * models.F('residual_severity'),
+                name='risk_residual_level_idx',
+            ),
         ]
     
     def __str__(self):
@@ -162,18 +231,7 @@ class RiskAssessment(models.Model):
     def save(self, *args, **kwargs):
         if not self.event_number:
             # Generate event number: RA-2025-0001
-            year = date.today().year
-            last_ra = RiskAssessment.objects.filter(
-                event_number__startswith=f'RA-{year}-'
-            ).order_by('-event_number').first()
-            
-            if last_ra:
-                last_num = int(last_ra.event_number.split('-')[-1])
-                new_num = last_num + 1
-            else:
-                new_num = 1
-            
-            self.event_number = f'RA-{year}-{new_num:04d}'
+            self.event_number = next_code(RiskAssessment, 'event_number', 'RA', year=date.today().year)
         
         super().save(*args, **kwargs)
     
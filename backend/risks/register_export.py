@@ -0,0 +1,211 @@
+"""
+Risk Register export to Excel and CSV.
+
+Both formats share one row pipeline: the queryset is read with
+``iterator(chunk_size=...)`` so prefetched hazards, barriers and actions are
+loaded per chunk, and every row is built from prefetched data only. Excel
+output uses openpyxl write-only mode with named styles and is spooled to a
+temporary file; CSV output is streamed row by row.
+"""
+import csv
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from risks.models import RiskAssessment
+
+CHUNK_SIZE = 500
+
+HEADERS = [
+    'Event Number', 'Status', 'Location', 'Process Area', 'Activity Type',
+    'Risk Category', 'Hazard Type', 'Hazard Description', 'Event Description',
+    'Causes', 'Consequences', 'Initial Prob', 'Initial Sev', 'Initial Risk',
+    'Initial Rating', 'Preventive Barriers', 'Protective Barriers',
+    'Residual Prob', 'Residual Sev', 'Residual Risk', 'Residual Rating',
+    'Risk Acceptable', 'ALARP Required', 'Additional Actions',
+    'Person Responsible', 'Target Date', 'Assessed By', 'Assessment Date',
+    'Next Review', 'Comments'
+]
+
+# Zero-based columns holding the initial and residual risk levels
+INITIAL_RISK_COLUMN = HEADERS.index('Initial Risk')
+RESIDUAL_RISK_COLUMN = HEADERS.index('Residual Risk')
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+_THIN = Side(style='thin')
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+HEADER_STYLE = 'risk_register_header'
+CELL_STYLE = 'risk_register_cell'
+
+# Risk level colors (see RiskAssessment.get_risk_color) -> named style
+RISK_LEVEL_STYLES = {
+    '#388E3C': 'risk_register_level_low',
+    '#F57C00': 'risk_register_level_medium',
+    '#D32F2F': 'risk_register_level_high',
+}
+
+
+def risk_register_queryset(status=None, category=None, risk_level=None):
+    """Risk assessments for the register, with everything a row needs preloaded."""
+    queryset = RiskAssessment.objects.select_related(
+        'assessed_by', 'risk_owner'
+    ).prefetch_related('hazards', 'barriers', 'treatment_actions')
+
+    if status:
+        queryset = queryset.filter(status=status)
+    if category:
+        queryset = queryset.filter(risk_category=category)
+    if risk_level:
+        queryset = queryset.by_rating(risk_level)
+    return queryset
+
+
+def _full_name(user):
+    return user.get_full_name if user else ''
+
+
+def build_row(ra):
+    """Register row for one assessment, using only prefetched relations."""
+    hazards = ra.hazards.all()
+    hazard = hazards[0] if hazards else None
+
+    preventive_barriers = []
+    protective_barriers = []
+    for barrier in ra.barriers.all():
+        if barrier.barrier_type == 'PREVENTIVE':
+            preventive_barriers.append(barrier.description)
+        elif barrier.barrier_type == 'PROTECTIVE':
+            protective_barriers.append(barrier.description)
+
+    additional_actions = "; ".join(a.action_description for a in ra.treatment_actions.all())
+
+    return [
+        ra.event_number,
+        ra.status,
+        ra.location,
+        ra.process_area,
+        ra.get_activity_type_display(),
+        ra.get_risk_category_display(),
+        hazard.get_hazard_type_display() if hazard else '',
+        hazard.hazard_description if hazard else '',
+        hazard.event_description if hazard else '',
+        hazard.causes if hazard else '',
+        hazard.consequences if hazard else '',
+        ra.initial_probability,
+        ra.initial_severity,
+        ra.initial_risk_level,
+        ra.initial_risk_rating,
+        "; ".join(preventive_barriers),
+        "; ".join(protective_barriers),
+        ra.residual_probability,
+        ra.residual_severity,
+        ra.residual_risk_level,
+        ra.residual_risk_rating,
+        'Yes' if ra.risk_acceptable else 'No',
+        'Yes' if ra.alarp_required else 'No',
+        additional_actions,
+        _full_name(ra.risk_owner),
+        ra.next_review_date,
+        _full_name(ra.assessed_by),
+        ra.assessment_date,
+        ra.next_review_date,
+        ra.comments,
+    ]
+
+
+def iter_rows(queryset, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Yield ``(assessment, row)`` pairs, fetching the queryset in chunks.
+
+    ``progress``, if given, is called with the number of rows produced so far
+    after every chunk.
+    """
+    for count, ra in enumerate(queryset.iterator(chunk_size=chunk_size), 1):
+        yield ra, build_row(ra)
+        if progress and count % chunk_size == 0:
+            progress(count)
+
+
+def _add_named_styles(workbook):
+    workbook.add_named_style(NamedStyle(
+        name=HEADER_STYLE,
+        font=Font(color="FFFFFF", bold=True, size=11),
+        fill=PatternFill(start_color="0052D4", end_color="0052D4", fill_type="solid"),
+        alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+        border=_BORDER,
+    ))
+    workbook.add_named_style(NamedStyle(
+        name=CELL_STYLE,
+        alignment=Alignment(vertical='top', wrap_text=True),
+        border=_BORDER,
+    ))
+    for color, name in RISK_LEVEL_STYLES.items():
+        workbook.add_named_style(NamedStyle(
+            name=name,
+            font=Font(color="FFFFFF", bold=True),
+            fill=PatternFill(start_color=color[1:], end_color=color[1:], fill_type="solid"),
+            alignment=Alignment(vertical='top', wrap_text=True),
+            border=_BORDER,
+        ))
+
+
+def _styled_row(worksheet, values, styles):
+    cells = []
+    for value, style in zip(values, styles):
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.style = style
+        cells.append(cell)
+    return cells
+
+
+def write_xlsx(queryset, fileobj, chunk_size=CHUNK_SIZE, progress=None):
+    """Write the register as an .xlsx workbook to ``fileobj`` in constant memory."""
+    workbook = Workbook(write_only=True)
+    _add_named_styles(workbook)
+    worksheet = workbook.create_sheet(title="Risk Register")
+
+    for col in range(1, len(HEADERS) + 1):
+        worksheet.column_dimensions[get_column_letter(col)].width = 20
+    worksheet.freeze_panes = 'A2'
+
+    worksheet.append(_styled_row(worksheet, HEADERS, [HEADER_STYLE] * len(HEADERS)))
+
+    styles = [CELL_STYLE] * len(HEADERS)
+    for ra, row in iter_rows(queryset, chunk_size=chunk_size, progress=progress):
+        styles[INITIAL_RISK_COLUMN] = RISK_LEVEL_STYLES[ra.initial_risk_color]
+        styles[RESIDUAL_RISK_COLUMN] = RISK_LEVEL_STYLES[ra.residual_risk_color]
+        worksheet.append(_styled_row(worksheet, row, styles))
+
+    workbook.save(fileobj)
+
+
+def xlsx_tempfile(queryset, chunk_size=CHUNK_SIZE):
+    """Spool the workbook to a temporary file, rewound and ready to stream."""
+    spool = tempfile.TemporaryFile()
+    try:
+        write_xlsx(queryset, spool, chunk_size=chunk_size)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+class _Echo:
+    """File-like object whose write returns the value, for csv.writer streaming."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset, chunk_size=CHUNK_SIZE, progress=None):
+    """Yield the register as CSV lines, header first."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(HEADERS)
+    for _, row in iter_rows(queryset, chunk_size=chunk_size, progress=progress):
+        yield writer.writerow(row)
@@ -0,0 +1,20 @@
+"""
+Management command to recompute stored full-text search vectors.
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from search.services import SEARCH_MODULES, update_search_vector
+
+
+class Command(BaseCommand):
+    help = 'Recompute search vectors for all searchable models (run after changing indexed fields or weights)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('modules', nargs='*', choices=list(SEARCH_MODULES), help='Modules to rebuild (default: all)')
+
+    def handle(self, *args, **options):
+        for key in options['modules'] or SEARCH_MODULES:
+            count = update_search_vector(apps.get_model(SEARCH_MODULES[key].model))
+            self.stdout.write(f'{key}: {count}')
+
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
@@ -0,0 +1,197 @@
+"""
+Full-text search across documents, records, laws and quick reports.
+
+Each searchable model stores a weighted ``search_vector`` (a Postgres
+tsvector with a GIN index) that is refreshed whenever the model is saved,
+so queries never scan the underlying text. Vectors use the ``simple``
+configuration: words are lowercased but not stemmed, which keeps prefix
+matching predictable for search-as-you-type and works for any language.
+"""
+import re
+from collections import namedtuple
+
+from django.apps import apps
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import CharField, F, Q, Value
+from django.db.models.functions import Cast, Concat
+
+SEARCH_CONFIG = 'simple'
+
+# fields: [(field, weight)] folded into the vector; snippet_fields are
+# joined for highlighted snippets; visible(user) limits what a user may find
+SearchModule = namedtuple('SearchModule', ['model', 'fields', 'title_field', 'snippet_fields', 'visible'])
+
+
+# Each rule mirrors the queryset of the module's list view, so search never
+# finds a row the user could not open from that list
+
+
+def _visible_records(user):
+    # RecordViewSet.get_queryset
+    return Q() if (user.position == 'HSSE MANAGER' or user.is_staff) else Q(submitted_by=user)
+
+
+def _visible_quick_reports(user):
+    # QuickReportViewSet.get_queryset
+    return Q() if (user.position == 'HSSE MANAGER' or user.is_superuser) else Q(reported_by=user)
+
+
+SEARCH_MODULES = {
+    'documents': SearchModule(
+        model='documents.Document',
+        fields=[('title', 'A'), ('description', 'B'), ('content', 'C')],
+        title_field='title',
+        snippet_fields=['description', 'content'],
+        visible=lambda user: Q(),
+    ),
+    'records': SearchModule(
+        model='documents.Record',
+        fields=[('record_number', 'A'), ('title', 'A'), ('notes', 'B')],
+        title_field='title',
+        snippet_fields=['title', 'notes'],
+        visible=_visible_records,
+    ),
+    'laws': SearchModule(
+        model='legals.LawResource',
+        fields=[('title', 'A'), ('act_number', 'A'), ('summary', 'B'), ('key_provisions', 'C'), ('applicability', 'C')],
+        title_field='title',
+        snippet_fields=['summary', 'key_provisions'],
+        visible=lambda user: Q(),
+    ),
+    'quick_reports': SearchModule(
+        model='quickreports.QuickReport',
+        fields=[('report_number', 'A'), ('title', 'A'), ('description', 'B'), ('location', 'C')],
+        title_field='title',
+        snippet_fields=['description', 'location'],
+        visible=_visible_quick_reports,
+    ),
+}
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def search_vector(module):
+    """Weighted tsvector expression for a module's fields."""
+    vector = None
+    for field, weight in module.fields:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(model, pk=None):
+    """Recompute stored vectors for one row, or for every row when ``pk`` is None."""
+    module = module_for_model(model)
+    queryset = model._default_manager.all()
+    if pk is not None:
+        queryset = queryset.filter(pk=pk)
+    return queryset.update(search_vector=search_vector(module))
+
+
+def module_for_model(model):
+    """The SearchModule registered for ``model``, or None."""
+    for module in SEARCH_MODULES.values():
+        if apps.get_model(module.model) is model:
+            return module
+    return None
+
+
+def parse_query(text):
+    """
+    Prefix query matching every word of ``text``, or None if it has no words.
+
+    'fire ext' matches documents containing words starting with 'fire' and 'ext'.
+    """
+    tokens = TOKEN_PATTERN.findall(text or '')
+    if not tokens:
+        return None
+    raw = ' & '.join(f'{token}:*' for token in tokens)
+    return SearchQuery(raw, search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_queryset(queryset, query):
+    """Filter ``queryset`` to rows matching ``query``, annotated with ``rank`` and best first."""
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query)
+    ).order_by('-rank')
+
+
+def _hits(key, module, query, user):
+    model = apps.get_model(module.model)
+    queryset = model._default_manager.filter(module.visible(user), search_vector=query)
+    # Same column order for every module so the querysets can be combined
+    return queryset.annotate(
+        hit_module=Value(key, output_field=CharField()),
+        hit_id=Cast('pk', output_field=CharField()),
+        hit_title=Cast(module.title_field, output_field=CharField()),
+        rank=SearchRank(F('search_vector'), query),
+    ).values('hit_module', 'hit_id', 'hit_title', 'rank')
+
+
+def search_all(text, user, modules=None):
+    """
+    Ranked hits for ``text`` across ``modules`` (default: all) visible to ``user``.
+
+    Returns an unevaluated queryset of ``{'hit_module', 'hit_id', 'hit_title',
+    'rank'}`` dicts, so callers can paginate it in the database. Pass a page
+    of it to ``with_snippets`` for highlighted excerpts. Returns None when
+    ``text`` has no searchable words.
+    """
+    query = parse_query(text)
+    if query is None:
+        return None
+
+    keys = [key for key in SEARCH_MODULES if modules is None or key in modules]
+    querysets = [_hits(key, SEARCH_MODULES[key], query, user) for key in keys]
+    if not querysets:
+        return None
+    combined = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+    return combined.order_by('-rank', 'hit_module', 'hit_id')
+
+
+def with_snippets(hits, text):
+    """
+    Add a highlighted ``snippet`` to each hit.
+
+    Headlines are expensive, so they are only built for the hits passed in
+    (one query per module present) rather than for every match.
+    """
+    query = parse_query(text)
+    ids_by_module = {}
+    for hit in hits:
+        ids_by_module.setdefault(hit['hit_module'], []).append(hit['hit_id'])
+
+    snippets = {}
+    for key, ids in ids_by_module.items():
+        module = SEARCH_MODULES[key]
+        model = apps.get_model(module.model)
+        text_fields = [F(field) for field in module.snippet_fields]
+        if len(text_fields) > 1:
+            parts = [text_fields[0]]
+            for field in text_fields[1:]:
+                parts.extend([Value(' '), field])
+            text_fields = [Concat(*parts, output_field=CharField())]
+        rows = model._default_manager.filter(pk__in=ids).annotate(
+            snippet=SearchHeadline(
+                text_fields[0],
+                query,
+                config=SEARCH_CONFIG,
+                start_sel='<mark>',
+                stop_sel='</mark>',
+                max_words=30,
+                min_words=10,
+            )
+        ).values_list('pk', 'snippet')
+        for pk, snippet in rows:
+            snippets[(key, str(pk))] = snippet
+
+    return [
+        {
+            'module': hit['hit_module'],
+            'id': hit['hit_id'],
+            'title': hit['hit_title'],
+            'rank': hit['rank'],
+            'snippet': snippets.get((hit['hit_module'], hit['hit_id']), ''),
+        }
+        for hit in hits
+    ]
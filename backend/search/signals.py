@@ -0,0 +1,18 @@
+"""
+Refresh stored search vectors when searchable models are saved.
+"""
+from django.db.models.signals import post_save
+
+from .services import SEARCH_MODULES, module_for_model, update_search_vector
+
+
+def refresh_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Recompute the saved row's vector unless none of its indexed fields were written."""
+    indexed_fields = {field for field, _ in module_for_model(sender).fields}
+    if update_fields is not None and not indexed_fields.intersection(update_fields):
+        return
+    update_search_vector(sender, instance.pk)
+
+
+for module in SEARCH_MODULES.values():
+    post_save.connect(refresh_search_vector, sender=module.model, dispatch_uid=f'search_vector_{module.model}')
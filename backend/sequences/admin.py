@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import SequenceCounter
+
+
+@admin.register(SequenceCounter)
+class SequenceCounterAdmin(admin.ModelAdmin):
+    list_display = ['prefix', 'year', 'last_value', 'updated_at']
+    list_filter = ['year']
+    search_fields = ['prefix']
+    ordering = ['prefix', '-year']
+    readonly_fields = ['updated_at']
@@ -0,0 +1,17 @@
+"""
+Management command to seed code sequence counters from existing records.
+"""
+from django.core.management.base import BaseCommand
+from sequences.services import seed_counters_from_existing
+
+
+class Command(BaseCommand):
+    help = 'Seed SequenceCounter rows from the highest codes already stored (safe to re-run)'
+
+    def handle(self, *args, **options):
+        changed = seed_counters_from_existing()
+
+        for prefix, year, value in changed:
+            self.stdout.write(f'{prefix}-{year}: {value}')
+
+        self.stdout.write(self.style.SUCCESS(f'Seeded {len(changed)} sequence counters.'))
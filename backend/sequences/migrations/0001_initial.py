@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenceCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(help_text="Code prefix, e.g. 'RA', 'CAPA', 'QR-AC'", max_length=30)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('last_value', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['prefix', '-year'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='sequencecounter',
+            constraint=models.UniqueConstraint(fields=('prefix', 'year'), name='unique_sequence_prefix_year'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+"""
+Per-(prefix, year) counters backing business codes such as RA-2025-0001.
+"""
+from django.db import IntegrityError, models, transaction
+
+
+class SequenceCounter(models.Model):
+    """Last number handed out for a code prefix in a given year."""
+
+    prefix = models.CharField(max_length=30, help_text="Code prefix, e.g. 'RA', 'CAPA', 'QR-AC'")
+    year = models.PositiveSmallIntegerField()
+    last_value = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['prefix', '-year']
+        constraints = [
+            models.UniqueConstraint(fields=['prefix', 'year'], name='unique_sequence_prefix_year'),
+        ]
+
+    def __str__(self):
+        return f"{self.prefix}-{self.year}: {self.last_value}"
+
+    @classmethod
+    def allocate(cls, prefix, year, seed=None):
+        """
+        Reserve and return the next number for ``prefix``/``year``.
+
+        The counter row is locked until the outermost transaction ends, so
+        concurrent callers get distinct numbers. Only when the caller wraps
+        the allocation and its save in one transaction does a rollback give
+        the number back; under autocommit the allocation commits on its own
+        and a failed save leaves a gap. ``seed`` is called once, when the
+        counter does not exist yet, and returns the highest number already
+        in use.
+        """
+        with transaction.atomic():
+            counter = cls.objects.select_for_update().filter(prefix=prefix, year=year).first()
+            if counter is None:
+                try:
+                    with transaction.atomic():
+                        counter = cls.objects.create(
+                            prefix=prefix, year=year, last_value=seed() if seed else 0
+                        )
+                except IntegrityError:
+                    # Another transaction created it first; wait for its lock
+                    counter = cls.objects.select_for_update().get(prefix=prefix, year=year)
+
+            counter.last_value += 1
+            counter.save(update_fields=['last_value', 'updated_at'])
+        return counter.last_value
@@ -0,0 +1,79 @@
+"""
+Business code allocation on top of SequenceCounter.
+"""
+import re
+
+from django.apps import apps
+from django.utils import timezone
+
+from .models import SequenceCounter
+
+# Models whose code fields are allocated here, as (app_label.ModelName, field)
+CODE_FIELDS = [
+    ('risks.RiskAssessment', 'event_number'),
+    ('ppes.PPEPurchase', 'purchase_order_number'),
+    ('audits.AuditPlan', 'audit_code'),
+    ('audits.AuditFinding', 'finding_code'),
+    ('audits.CAPA', 'action_code'),
+    ('audits.AuditReport', 'report_code'),
+    ('documents.Record', 'record_number'),
+    ('quickreports.QuickReport', 'report_number'),
+]
+
+CODE_PATTERN = re.compile(r'^(?P<prefix>.+)-(?P<year>\d{4})-(?P<number>\d+)$')
+
+
+def parse_code(code):
+    """Split 'PREFIX-YYYY-NNNN' into ``(prefix, year, number)``, or None if it does not match."""
+    match = CODE_PATTERN.match(code or '')
+    if not match:
+        return None
+    return match.group('prefix'), int(match.group('year')), int(match.group('number'))
+
+
+def highest_number(model, field, prefix, year):
+    """Highest number already used in ``model.field`` for ``prefix``/``year``."""
+    codes = model._default_manager.filter(
+        **{f'{field}__startswith': f'{prefix}-{year}-'}
+    ).values_list(field, flat=True)
+    numbers = [parsed[2] for parsed in map(parse_code, codes) if parsed and parsed[0] == prefix]
+    return max(numbers, default=0)
+
+
+def next_code(model, field, prefix, year=None, width=4):
+    """
+    Allocate the next ``PREFIX-YYYY-NNNN`` code for ``model.field``.
+
+    The first allocation for a prefix and year seeds the counter from the
+    codes already stored, so existing data never collides.
+    """
+    year = year or timezone.now().year
+    number = SequenceCounter.allocate(
+        prefix, year, seed=lambda: highest_number(model, field, prefix, year)
+    )
+    return f'{prefix}-{year}-{number:0{width}d}'
+
+
+def seed_counters_from_existing():
+    """
+    Raise every counter to the highest code stored in CODE_FIELDS.
+
+    Returns a list of ``(prefix, year, value)`` for counters that changed.
+    """
+    highest = {}
+    for label, field in CODE_FIELDS:
+        model = apps.get_model(label)
+        for code in model._default_manager.exclude(**{f'{field}__isnull': True}).values_list(field, flat=True).iterator():
+            parsed = parse_code(code)
+            if parsed:
+                prefix, year, number = parsed
+                highest[(prefix, year)] = max(highest.get((prefix, year), 0), number)
+
+    changed = []
+    for (prefix, year), value in sorted(highest.items()):
+        counter, _ = SequenceCounter.objects.get_or_create(prefix=prefix, year=year)
+        if counter.last_value < value:
+            counter.last_value = value
+            counter.save(update_fields=['last_value', 'updated_at'])
+            changed.append((prefix, year, value))
+    return changed
@@ -14,6 +14,9 @@ import random
 import json
 from datetime import datetime
 
+# Stats name for logins made by ShiftChangeLoginLoadTest
+SHIFT_CHANGE_LOGIN = "/api/v1/login/ [shift change]"
+
 
 class SafeSphereUser(HttpUser):
     """Simulates a user interacting with SafeSphere."""
@@ -110,6 +113,55 @@ class AuthenticationLoadTest(HttpUser):
         })
 
 
+class ShiftChangeLoginLoadTest(HttpUser):
+    """
+    Login burst at a shift change: the incoming shift signs in within minutes.
+
+    Every user logs in as soon as it spawns, so the spawn rate sets the peak.
+    A few users mistype their password first. Run on its own and read
+    the login p95 from the summary printed at the end:
+
+        locust -f tests/load/locustfile.py ShiftChangeLoginLoadTest --host=http://localhost:8000 \
+               --users 300 --spawn-rate 50 --run-time 3m --headless
+    """
+    
+    wait_time = between(5, 15)  # After signing in, people settle into normal use
+    
+    def on_start(self):
+        """Sign in, sometimes after a mistyped password."""
+        self.email = f"test{random.randint(1, 100)}@example.com"
+        if random.random() < 0.05:
+            self.shift_login("wrongpassword")
+        self.shift_login("testpass123")
+    
+    def shift_login(self, password):
+        """Login under a dedicated stats name so its percentiles are reported separately."""
+        with self.client.post("/api/v1/login/", json={
+            "email": self.email,
+            "password": password
+        }, name=SHIFT_CHANGE_LOGIN, catch_response=True) as response:
+            if response.status_code == 200:
+                self.headers = {'Authorization': f"Bearer {response.json().get('access')}"}
+                response.success()
+            elif password != "testpass123" and response.status_code == 401:
+                # A rejected mistyped password is the expected outcome
+                response.success()
+            else:
+                response.failure(f"Login failed with {response.status_code}")
+    
+    @task(3)
+    def view_notifications(self):
+        """Check notifications on arrival."""
+        if hasattr(self, 'headers'):
+            self.client.get("/api/v1/notifications/", headers=self.headers)
+    
+    @task(1)
+    def view_user_profile(self):
+        """View user profile."""
+        if hasattr(self, 'headers'):
+            self.client.get("/api/v1/user/me/", headers=self.headers)
+
+
 class DocumentWorkflowLoadTest(HttpUser):
     """Load test for document workflow operations."""
     
@@ -271,6 +323,12 @@ def on_test_stop(environment, **kwargs):
     print(f"Max response time: {stats.total.max_response_time:.2f}ms")
     print(f"Requests per second: {stats.total.total_rps:.2f}")
     
+    shift_logins = stats.get(SHIFT_CHANGE_LOGIN, "POST")
+    if shift_logins.num_requests:
+        print(f"\nShift-change logins: {shift_logins.num_requests}")
+        print(f"Login p50: {shift_logins.get_response_time_percentile(0.5):.2f}ms")
+        print(f"Login p95: {shift_logins.get_response_time_percentile(0.95):.2f}ms")
+    
     if stats.total.num_failures > 0:
         print(f"\n⚠️  WARNING: {stats.total.num_failures} failures detected!")
         print("Review the detailed report for more information.")